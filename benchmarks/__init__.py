@@ -0,0 +1,3 @@
+"""
+benchmarks of oneEngine, run with: python -m benchmarks --help
+"""
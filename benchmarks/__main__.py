@@ -0,0 +1,34 @@
+import argparse
+import json
+import platform
+import sys
+from pathlib import Path
+
+from benchmarks.suite import WORKLOADS, Config, compare, run
+
+parser = argparse.ArgumentParser(prog='python -m benchmarks', description='runs the seeded benchmark workloads.')
+parser.add_argument('workloads', nargs='*', choices=[[], *WORKLOADS], help='workloads to run, all by default')
+parser.add_argument('--seed', type=int, default=Config.seed)
+parser.add_argument('--game-count', type=int, default=Config.game_count, help='games per player count')
+parser.add_argument('--repeat', type=int, default=Config.repeat, help='timings are the best of repeat runs')
+parser.add_argument('--save', type=Path, help='stores the results as baseline json')
+parser.add_argument('--compare', type=Path, help='baseline json, exits with 1 if a metric regressed')
+parser.add_argument('--tolerance', type=float, default=0.1, help='accepted relative regression')
+arguments = parser.parse_args()
+
+results = run(Config(arguments.seed, arguments.game_count, repeat=arguments.repeat), arguments.workloads)
+
+for workload, metrics in results.items():
+    for metric, value in metrics.items():
+        print(f'{f"{workload}.{metric}":<56} {value:>14.1f}')
+
+if arguments.save:
+    arguments.save.write_text(json.dumps({'python': platform.python_version(), 'machine': platform.machine(),
+                                          'config': vars(arguments) | {'save': None, 'compare': None},
+                                          'results': results}, indent=2, default=str))
+
+if arguments.compare:
+    regressions = compare(results, json.loads(arguments.compare.read_text())['results'], arguments.tolerance)
+    for regression in regressions:
+        print(f'regression: {regression}', file=sys.stderr)
+    sys.exit(1 if regressions else 0)
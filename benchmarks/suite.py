@@ -0,0 +1,225 @@
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import oneEngine
+from oneEngine.card import Card, get_playability_table, get_standard_card_deck
+from oneEngine.game import Action, Game, GameStop
+from oneEngine.rules import Rules
+from oneEngine.tournament import play_game
+
+PLAYER_COUNTS = (2, 4, 6, 8, 10)
+
+
+@dataclass
+class Config:
+    seed: int = 0
+    game_count: int = 200  # games per player count
+    max_steps: int = 2_000
+    repeat: int = 3  # timings are the best of repeat runs
+
+
+def _best_time(function: Callable[[], object], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _random_agent(rng: random.Random) -> Callable[[Game], Action]:
+    """
+    :return: agent playing random legal actions, it does not use the generator of the game.
+    """
+    return lambda game: rng.choice(game.legal_actions())
+
+
+def _record_games(player_count: int, config: Config) -> list[tuple[int, list[Action]]]:
+    """
+    :return: seed and actions of every game played by random agents.
+    """
+    records = []
+    agent_rng = random.Random(config.seed)
+    for game_seed in range(config.seed, config.seed + config.game_count):
+        actions: list[Action] = []
+        agent = _random_agent(agent_rng)
+
+        def recording_agent(game: Game) -> Action:
+            actions.append(agent(game))
+            return actions[-1]
+
+        play_game(Game(player_count, Rules(), rng=game_seed), [recording_agent] * player_count, config.max_steps)
+        records.append((game_seed, actions))
+    return records
+
+
+def _replay(player_count: int, game_seed: int, actions: list[Action], on_step: Callable[[], object] | None = None):
+    game = Game(player_count, Rules(), rng=game_seed)
+    for action in actions:
+        if on_step is not None:
+            on_step()
+        try:
+            game.step(*action)
+        except GameStop:  # the last recorded action ended the game, see play_game
+            return
+
+
+def full_games(config: Config) -> dict[str, float]:
+    """
+    random legal play from setup until the first player runs out of cards, including the agents' decisions.
+    """
+    metrics = {}
+    for player_count in PLAYER_COUNTS:
+        step_count = 0
+
+        def run():
+            nonlocal step_count
+            step_count = 0
+            agent = _random_agent(random.Random(config.seed))
+            for game_seed in range(config.seed, config.seed + config.game_count):
+                step_count += play_game(Game(player_count, Rules(), rng=game_seed), [agent] * player_count,
+                                        config.max_steps)[1]
+
+        seconds = _best_time(run, config.repeat)
+        metrics[f'{player_count}_players.games_per_second'] = config.game_count / seconds
+        metrics[f'{player_count}_players.steps_per_second'] = step_count / seconds
+    return metrics
+
+
+def steps(config: Config) -> dict[str, float]:
+    """
+    replays recorded games, so only Game construction and Game.step are measured.
+    allocated_bytes_per_step is the mean peak of memory allocated during one step, traced by tracemalloc.
+    """
+    metrics = {}
+    for player_count in PLAYER_COUNTS:
+        records = _record_games(player_count, config)
+        step_count = sum(len(actions) for _, actions in records)
+
+        seconds = _best_time(lambda: [_replay(player_count, *record) for record in records], config.repeat)
+        metrics[f'{player_count}_players.steps_per_second'] = step_count / seconds
+
+        allocated = 0
+        tracemalloc.start()
+        try:
+            for record in records:
+                current = 0
+
+                def on_step():
+                    nonlocal allocated, current
+                    traced, peak = tracemalloc.get_traced_memory()
+                    allocated += peak - current
+                    current = traced
+                    tracemalloc.reset_peak()
+
+                _replay(player_count, *record, on_step=on_step)
+                traced, peak = tracemalloc.get_traced_memory()
+                allocated += peak - current
+        finally:
+            tracemalloc.stop()
+        metrics[f'{player_count}_players.allocated_bytes_per_step'] = allocated / max(step_count, 1)
+    return metrics
+
+
+def playability(config: Config) -> dict[str, float]:
+    """
+    Card.other_is_playable for all pairs of distinct cards and Card.filter_playable_cards on random hands.
+    """
+    rules = Rules()
+    cards = [Card.from_id(card_id) for card_id in range(54)]
+    rng = random.Random(config.seed)
+    deck = get_standard_card_deck()
+    hands = [(rng.choice(cards), rng.sample(deck, 7)) for _ in range(config.game_count * 100)]
+    get_playability_table(rules)  # compiled outside of the measurement
+
+    def check_pairs():
+        for _ in range(config.game_count):
+            for card in cards:
+                for other in cards:
+                    card.other_is_playable(other, rules)
+
+    def filter_hands():
+        for card, hand in hands:
+            card.filter_playable_cards(hand, rules)
+
+    return {
+        'other_is_playable.checks_per_second': config.game_count * len(cards) ** 2 / _best_time(check_pairs,
+                                                                                                config.repeat),
+        'filter_playable_cards.hands_per_second': len(hands) / _best_time(filter_hands, config.repeat),
+    }
+
+
+def construction(config: Config) -> dict[str, float]:
+    """
+    get_standard_card_deck and Game.__init__ including shuffling and dealing.
+    """
+    metrics = {'get_standard_card_deck.decks_per_second': config.game_count / _best_time(
+        lambda: [get_standard_card_deck() for _ in range(config.game_count)], config.repeat)}
+
+    for player_count in PLAYER_COUNTS:
+        def construct():
+            for game_seed in range(config.seed, config.seed + config.game_count):
+                Game(player_count, Rules(), rng=game_seed)
+
+        metrics[f'{player_count}_players.games_per_second'] = config.game_count / _best_time(construct, config.repeat)
+    return metrics
+
+
+def startup(config: Config) -> dict[str, float]:
+    """
+    wall time of fresh interpreters running python -c with an empty statement, import oneEngine and an import of Game,
+    as paid by short-lived workers. Every command is run 5 * repeat times.
+    """
+    source_directory = os.path.dirname(os.path.dirname(oneEngine.__file__))
+    python_path = os.pathsep.join(filter(None, [source_directory, os.environ.get('PYTHONPATH')]))
+    environment = os.environ | {'PYTHONPATH': python_path}
+    statements = {'python': 'pass', 'import_oneEngine': 'import oneEngine', 'import_game': 'from oneEngine import Game'}
+    metrics = {}
+    for name, statement in statements.items():
+        def run():
+            subprocess.run([sys.executable, '-c', statement], env=environment, check=True)
+
+        metrics[f'{name}.milliseconds'] = 1000 * _best_time(run, 5 * config.repeat)
+    return metrics
+
+
+WORKLOADS: dict[str, Callable[[Config], dict[str, float]]] = {
+    'full_games': full_games,
+    'steps': steps,
+    'playability': playability,
+    'construction': construction,
+    'startup': startup,
+}
+
+
+def run(config: Config, names: list[str] | None = None) -> dict[str, dict[str, float]]:
+    """
+    :param names: names of the workloads in WORKLOADS that shall be run, all if None.
+    :return: metrics of every workload.
+    """
+    return {name: WORKLOADS[name](config) for name in names or WORKLOADS}
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]],
+            tolerance: float) -> list[str]:
+    """
+    :param tolerance: accepted relative change, e.g. 0.1 for 10%.
+    :return: description of every metric that got worse than baseline by more than tolerance.
+        rates (per_second) should not decrease, all other metrics should not increase.
+    """
+    regressions = []
+    for workload, metrics in results.items():
+        for metric, value in metrics.items():
+            expected = baseline.get(workload, {}).get(metric)
+            if expected is None or expected == 0:
+                continue
+            change = value / expected - 1
+            if (-change if metric.endswith('per_second') else change) > tolerance:
+                regressions.append(f'{workload}.{metric}: {value:.6g} (baseline {expected:.6g}, {change:+.1%})')
+    return regressions
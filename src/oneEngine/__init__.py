@@ -1,4 +1,47 @@
-from oneEngine.card import Card, get_standard_card_deck
-from oneEngine.enums import CardType, Color, Directions
-from oneEngine.game import Game, GameStop
-from oneEngine.rules import Rules
+import importlib
+
+TYPE_CHECKING = False  # typing.TYPE_CHECKING without importing typing, which takes longer than the rest of startup
+if TYPE_CHECKING:
+    from typing import Any
+
+    from oneEngine.card import Card as Card, CardArray as CardArray, Hand as Hand
+    from oneEngine.card import get_standard_card_deck as get_standard_card_deck
+    from oneEngine.enums import CardType as CardType, Color as Color, Directions as Directions
+    from oneEngine.game import Action as Action, Game as Game, GameStop as GameStop
+    from oneEngine.rules import Rules as Rules
+
+# submodules are imported on first access, so importing oneEngine stays cheap and numpy is only loaded if
+# e.g. oneEngine.batch is used.
+_ATTRIBUTE_MODULES = {
+    'Card': 'card',
+    'CardArray': 'card',
+    'Hand': 'card',
+    'get_standard_card_deck': 'card',
+    'CardType': 'enums',
+    'Color': 'enums',
+    'Directions': 'enums',
+    'Action': 'game',
+    'Game': 'game',
+    'GameStop': 'game',
+    'Rules': 'rules',
+}
+_SUBMODULES = frozenset({'agents', 'analytics', 'batch', 'card', 'encoding', 'enums', 'events', 'game', 'pile',
+                         'record', 'rules', 'server', 'solver', 'sweep', 'sync', 'tournament'})
+
+__all__ = ['Card', 'CardArray', 'Hand', 'get_standard_card_deck', 'CardType', 'Color', 'Directions', 'Action', 'Game',
+           'GameStop', 'Rules']
+
+
+def __getattr__(name: str) -> 'Any':
+    if name in _ATTRIBUTE_MODULES:
+        value = getattr(importlib.import_module(f'{__name__}.{_ATTRIBUTE_MODULES[name]}'), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f'{__name__}.{name}')
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    globals()[name] = value  # later accesses skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__) | _SUBMODULES)
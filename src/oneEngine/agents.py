@@ -0,0 +1,176 @@
+import random
+from collections.abc import MutableSequence, Sequence
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
+
+from oneEngine.card import CARD_ID_COUNT, COLORED_CARD_COUNT, SELECTABLE_COLORS, Card, Hand
+from oneEngine.enums import CardType, Color
+from oneEngine.game import Action, Game
+
+if TYPE_CHECKING:
+    from oneEngine.batch import BatchGame
+
+_CARDS = [Card.from_id(card_id) for card_id in range(CARD_ID_COUNT)]
+_COLOR_VALUES = [card.color.value for card in _CARDS]
+_SCORE_SCALE = 256  # more than any color count, so priorities always outweigh color counts
+
+
+@runtime_checkable
+class BatchAgent(Protocol):
+    """
+    agent deciding for one game, see tournament.Agent, or for many games in one call.
+    """
+
+    def __call__(self, game: Game) -> Action: ...
+
+    def decide(self, games: Sequence[Game]) -> list[Action]: ...
+
+
+def decide(agent: Any, games: Sequence[Game]) -> list[Action]:
+    """
+    :param agent: BatchAgent or tournament.Agent.
+    :return: action of the current player of every game.
+    """
+    if isinstance(agent, BatchAgent):
+        return agent.decide(games)
+    return [agent(game) for game in games]
+
+
+def hand_statistics(hand: MutableSequence[Card]) -> tuple[int, list[int]]:
+    """
+    :return: bitmask of the card ids in hand and number of cards per Color value. Taken from Hand without scanning.
+    """
+    if isinstance(hand, Hand):
+        return hand.mask, hand.color_counts
+    mask = 0
+    color_counts = [0] * len(Color)
+    for card in hand:
+        card_id = card.id
+        mask |= 1 << card_id
+        color_counts[_COLOR_VALUES[card_id]] += 1
+    return mask, color_counts
+
+
+class RandomAgent:
+    """
+    plays a uniformly chosen legal action, using Game.rng or the module level generator if it is None.
+    """
+
+    def __call__(self, game: Game) -> Action:
+        return (random if game.rng is None else game.rng).choice(game.legal_actions())
+
+    def decide(self, games: Sequence[Game]) -> list[Action]:
+        return [(random if game.rng is None else game.rng).choice(game.legal_actions()) for game in games]
+
+    def decide_batch(self, batch: 'BatchGame') -> tuple[Any, Any, Any, Any]:
+        """
+        :return: arguments of BatchGame.step choosing a legal move uniformly in every game, using batch.rng.
+        """
+        import numpy as np
+
+        legal = batch.legal_actions()
+        keys = np.where(legal, batch.rng.random(legal.shape), -1)
+        choices = keys.argmax(axis=1)
+        played_card_ids = np.where((choices < CARD_ID_COUNT) & (keys.max(axis=1) >= 0), choices, -1)
+        color_selection = batch.rng.integers(0, len(SELECTABLE_COLORS), batch.game_count)
+        swap_player_selection = (batch.current_turn + batch.rng.integers(1, max(batch.player_count, 2),
+                                                                         batch.game_count)) % batch.player_count
+        add_4_challenged = batch.rng.random(batch.game_count) < 0.5
+        return played_card_ids, color_selection, swap_player_selection, add_4_challenged
+
+
+class HeuristicAgent:
+    """
+    plays the playable card with the highest score and only draws if it holds none. The score of a card is its
+    priority, then the number of cards of its color in the hand (black cards count as the most held color, which they
+    select). Ties go to the lowest Card.id. A seven swaps with the other player holding the fewest cards and ADD4 is
+    never challenged.
+    Subclasses set priorities, one entry per Card.id.
+    """
+    priorities: tuple[int, ...] = (0,) * CARD_ID_COUNT
+
+    def __init__(self):
+        self._scores = [priority * _SCORE_SCALE for priority in self.priorities]
+
+    def __call__(self, game: Game) -> Action:
+        hand = game.current_player_deck
+        mask, color_counts = hand_statistics(hand)
+        playable = mask & game.open_card.playable_mask(game.rules, game.color_selection)
+        if not playable:
+            return Action(None)
+
+        color = max(range(len(SELECTABLE_COLORS)), key=color_counts.__getitem__)
+        scores = self._scores
+        best_id = best_score = -1
+        while playable:
+            card_id = (playable & -playable).bit_length() - 1
+            playable &= playable - 1
+            score = scores[card_id] + color_counts[color if card_id >= COLORED_CARD_COUNT else _COLOR_VALUES[card_id]]
+            if score > best_score:
+                best_id, best_score = card_id, score
+
+        card = _CARDS[best_id]
+        played_card_index = hand.index(card)
+        if card.card_type is CardType.COLOR_SELECT:
+            return Action(played_card_index, SELECTABLE_COLORS[color])
+        if card.card_type is CardType.ADD4:
+            return Action(played_card_index, SELECTABLE_COLORS[color], None, False)
+        if card.card_type is CardType.NUMBER_7 and game.rules.seven_swaps:
+            return Action(played_card_index, None, min(
+                (player for player in range(len(game.player_decks)) if player != game.current_turn),
+                key=lambda player: len(game.player_decks[player])))
+        return Action(played_card_index)
+
+    def decide(self, games: Sequence[Game]) -> list[Action]:
+        return [self(game) for game in games]
+
+    def decide_batch(self, batch: 'BatchGame') -> tuple[Any, Any, Any, Any]:
+        """
+        vectorized decisions for every game of batch, the same as for equal Game instances.
+        :return: arguments of BatchGame.step.
+        """
+        import numpy as np
+
+        games = np.arange(batch.game_count)
+        hands = batch.hands[games, batch.current_turn]
+        color_counts = hands[:, :COLORED_CARD_COUNT].reshape(-1, len(SELECTABLE_COLORS), 13).sum(axis=2)
+        color = color_counts.argmax(axis=1)
+
+        card_color_counts = np.empty((batch.game_count, CARD_ID_COUNT), dtype=np.int64)
+        card_color_counts[:, :COLORED_CARD_COUNT] = np.repeat(color_counts, 13, axis=1)
+        card_color_counts[:, COLORED_CARD_COUNT:] = color_counts[games, color][:, None]
+        scores = np.where(batch.legal_actions()[:, :CARD_ID_COUNT],
+                          np.asarray(self._scores) + card_color_counts, -1)
+        played_card_ids = np.where(scores.max(axis=1) >= 0, scores.argmax(axis=1), -1)
+
+        hand_sizes = batch.hand_sizes()
+        hand_sizes[games, batch.current_turn] = np.iinfo(hand_sizes.dtype).max
+        swap_player_selection = hand_sizes.argmin(axis=1)
+        return played_card_ids, color, swap_player_selection, np.zeros(batch.game_count, dtype=np.bool_)
+
+
+def _priorities(*card_types: CardType) -> tuple[int, ...]:
+    """
+    :return: priority 1 for the cards of card_types, 0 for the others.
+    """
+    return tuple(int(card.card_type in card_types) for card in _CARDS)
+
+
+class GreedyColorAgent(HeuristicAgent):
+    """
+    plays the card whose color it holds most often.
+    """
+
+
+class HoldWildAgent(HeuristicAgent):
+    """
+    like GreedyColorAgent, but plays black cards only if it holds no other playable card.
+    """
+    priorities = _priorities(*(card_type for card_type in CardType
+                               if card_type not in (CardType.COLOR_SELECT, CardType.ADD4)))
+
+
+class StackAggressiveAgent(HeuristicAgent):
+    """
+    like GreedyColorAgent, but plays ADD2 and ADD4 whenever possible, stacking penalties if the rules allow it.
+    """
+    priorities = _priorities(CardType.ADD2, CardType.ADD4)
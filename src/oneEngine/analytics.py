@@ -0,0 +1,178 @@
+import random
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import astuple
+from itertools import chain
+from typing import Any
+
+from oneEngine.card import ADD_CARDS_MASK, CARD_ID_COUNT, STANDARD_DECK, Card
+from oneEngine.enums import CardType, Color
+from oneEngine.game import Action, Game
+from oneEngine.tournament import play_game
+
+# the unseen pool of an observer is the deck without the open deck and the deck of the observer. it contains the
+# closed deck, the decks of the other players and cards removed while choosing the first open card, every hidden
+# deck is treated as a uniform sample of it.
+
+
+def unseen_card_counts(game: Game, observer: int, deck: Iterable[Card] | None = None) -> list[int]:
+    """
+    :param deck: deck the game was created with. STANDARD_DECK if None.
+    :raises ValueError: raised when the visible cards are not part of deck.
+    :return: number of unseen cards indexed by Card.id.
+    """
+    counts = [0] * CARD_ID_COUNT
+    for card in STANDARD_DECK if deck is None else deck:
+        counts[card.id] += 1
+    for card in chain(game.open_deck, game.player_decks[observer]):
+        counts[card.id] -= 1
+    if min(counts) < 0:
+        raise ValueError('visible cards are not part of the deck')
+    return counts
+
+
+def probability_at_least_one(pool_size: int, matching_count: int, sample_size: int) -> float:
+    """
+    hypergeometric probability that a sample drawn without replacement contains a matching card.
+    :param pool_size: number of cards sampled from.
+    :param matching_count: number of matching cards in the pool.
+    :param sample_size: number of cards drawn.
+    """
+    probability_none = 1.0
+    for drawn in range(sample_size):
+        if pool_size - drawn <= 0:
+            break
+        probability_none *= max(pool_size - matching_count - drawn, 0) / (pool_size - drawn)
+    return 1 - probability_none
+
+
+def _matching(counts: list[int], mask: int) -> int:
+    return sum(count for card_id, count in enumerate(counts) if mask >> card_id & 1)
+
+
+def probability_holds_any(game: Game, observer: int, player: int, mask: int,
+                          deck: Iterable[Card] | None = None) -> float:
+    """
+    :param player: player whose deck is asked for, exact if it is observer.
+    :param mask: bitmask of card ids, e.g. Card.playable_mask.
+    :param deck: see unseen_card_counts.
+    :return: probability that the deck of player holds a card whose id is set in mask, as seen by observer.
+    """
+    hand = game.player_decks[player]
+    if player == observer:
+        return float(any(mask >> card.id & 1 for card in hand))
+    counts = unseen_card_counts(game, observer, deck)
+    return probability_at_least_one(sum(counts), _matching(counts, mask), len(hand))
+
+
+def probability_draws_any(game: Game, observer: int, mask: int, draw_count: int = 1,
+                          deck: Iterable[Card] | None = None) -> float:
+    """
+    :param draw_count: number of cards drawn from the closed deck.
+    :return: probability that one of the next draw_count cards of the closed deck has its id set in mask.
+    """
+    counts = unseen_card_counts(game, observer, deck)
+    return probability_at_least_one(sum(counts), _matching(counts, mask), min(draw_count, len(game.closed_deck)))
+
+
+def expected_count(game: Game, observer: int, player: int, mask: int, deck: Iterable[Card] | None = None) -> float:
+    """
+    :return: expected number of cards in the deck of player whose ids are set in mask, as seen by observer.
+    """
+    hand = game.player_decks[player]
+    if player == observer:
+        return float(sum(mask >> card.id & 1 for card in hand))
+    counts = unseen_card_counts(game, observer, deck)
+    return len(hand) * _matching(counts, mask) / max(sum(counts), 1)
+
+
+def probability_next_player_can_stack(game: Game, observer: int, deck: Iterable[Card] | None = None) -> float:
+    """
+    :return: probability that the next player holds an ADD2 or ADD4 playable on the open card.
+    """
+    mask = game.open_card.playable_mask(game.rules, game.color_selection) & ADD_CARDS_MASK
+    return probability_holds_any(game, observer, game.step_index(game.current_turn, game.direction.value), mask, deck)
+
+
+def expected_penalty(game: Game, played_card_index: int, color_selection: Color | None = None,
+                     deck: Iterable[Card] | None = None) -> float:
+    """
+    expected number of cards the next player draws if the current player plays an ADD2 or ADD4, assuming the next
+    player stacks whenever possible. Penalties passed further by stacking count as 0.
+    :param played_card_index: index of an ADD2 or ADD4 in the deck of the current player.
+    :param color_selection: color selected with an ADD4.
+    :raises ValueError: raised when the card is not an ADD2 or ADD4.
+    """
+    card = game.current_player_deck[played_card_index]
+    if card.card_type is not CardType.ADD2 and card.card_type is not CardType.ADD4:
+        raise ValueError(f'{card} is no ADD2 or ADD4')
+
+    penalty = game.accumulated_draw_count + (2 if card.card_type is CardType.ADD2 else 4)
+    mask = card.playable_mask(game.rules, color_selection) & ADD_CARDS_MASK
+    next_player = game.step_index(game.current_turn, game.direction.value)
+    return (1 - probability_holds_any(game, game.current_turn, next_player, mask, deck)) * penalty
+
+
+def _random_agent(game: Game) -> Action:
+    return (random if game.rng is None else game.rng).choice(game.legal_actions())
+
+
+class MonteCarloEstimator:
+    """
+    estimates quantities without closed form by averaging them over determinizations, see Game.determinizations.
+    Estimates are cached by what the observer knows about the game, so asking again within a decision loop is cheap.
+    """
+
+    def __init__(self, sample_count: int = 100, seed: int = 0, cache_size: int = 1024, max_steps: int = 1000):
+        """
+        :param sample_count: number of determinizations per estimate.
+        :param seed: seed of the sampling, estimates are reproducible.
+        :param cache_size: number of cached estimates, least recently used ones are dropped first.
+        :param max_steps: number of steps after which rollouts are given up, see win_probability.
+        """
+        self.sample_count = sample_count
+        self.seed = seed
+        self.cache_size = cache_size
+        self.max_steps = max_steps
+        self._cache: OrderedDict[Hashable, float] = OrderedDict()
+
+    @staticmethod
+    def _information(game: Game, observer: int) -> tuple[Any, ...]:
+        return (observer, tuple(card.id for card in game.player_decks[observer]),
+                tuple(card.id for card in game.open_deck), tuple(map(len, game.player_decks)), len(game.closed_deck),
+                game.current_turn, game.direction, game.color_selection, game.accumulated_draw_count,
+                astuple(game.rules))
+
+    def estimate(self, game: Game, observer: int, quantity: Callable[[Game], float],
+                 key: Hashable | None = None) -> float:
+        """
+        :param quantity: evaluated on every determinization, it may modify the game.
+        :param key: identifies quantity in the cache, quantity itself is used if None.
+        :return: mean of quantity.
+        """
+        cache_key = (self._information(game, observer), quantity if key is None else key)
+        if cache_key in self._cache:
+            self._cache.move_to_end(cache_key)
+            return self._cache[cache_key]
+
+        games = game.determinizations(observer, self.sample_count, random.Random(self.seed))
+        value = sum(map(quantity, games)) / self.sample_count
+
+        self._cache[cache_key] = value
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return value
+
+    def win_probability(self, game: Game, observer: int) -> float:
+        """
+        :return: share of random rollouts in which observer runs out of cards first. unfinished rollouts count as lost.
+        """
+        agents = [_random_agent] * len(game.player_decks)
+
+        def won(sample: Game) -> float:
+            return float(play_game(sample, agents, self.max_steps)[0] == observer)
+
+        return self.estimate(game, observer, won, ('win_probability', self.max_steps))
+
+    def clear(self):
+        self._cache.clear()
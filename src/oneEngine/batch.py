@@ -0,0 +1,309 @@
+from collections.abc import Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from oneEngine.card import CARD_ID_COUNT, NO_COLOR_SELECTION, Card, get_playability_table, get_standard_card_deck
+from oneEngine.enums import CardType, Directions
+from oneEngine.game import Game
+from oneEngine.rules import Rules
+
+_CARD_TYPES = np.array([Card.from_id(card_id).card_type.value for card_id in range(CARD_ID_COUNT)], dtype=np.int8)
+_ADD_CARDS = (_CARD_TYPES == CardType.ADD2.value) | (_CARD_TYPES == CardType.ADD4.value)
+
+
+def _playability_array(rules: Rules) -> NDArray[np.bool_]:
+    """
+    :return: array indexed by [open card id, color selection, played card id], True if the card is playable.
+    """
+    playable = np.array([[mask >> card_id & 1 for card_id in range(CARD_ID_COUNT)]
+                         for mask in get_playability_table(rules)], dtype=np.bool_)
+    return playable.reshape(CARD_ID_COUNT, NO_COLOR_SELECTION + 1, CARD_ID_COUNT)
+
+
+class BatchGame:
+    """
+    Runs game_count games of equal player count and rules in lockstep, following the semantics of Game.step.
+
+    State is kept in numpy arrays whose first axis is the game, color_selection is NO_COLOR_SELECTION where
+    Game.color_selection would be None.
+    hands holds per-player card counts indexed by Card.id, closed_deck and open_deck hold card ids
+    with the top card at index closed_count - 1 and open_count - 1 respectively.
+    Like Game, the closed deck is reshuffled when a card is drawn from it while it is empty, keeping the top card
+    of the open deck, but the shuffled order differs from Game.
+    """
+
+    def __init__(self, game_count: int, player_count: int, rules: Rules, deck: list[Card] | None = None,
+                 seed: int | np.random.Generator | None = None):
+        """
+        :param game_count: number of games stepped at once.
+        :param player_count:
+        :param rules: rules applying to all games.
+        :param deck: list of cards that should be used in every game. get_standard_card_deck() used if None.
+        :param seed: seed or generator used for all shuffles.
+        :raises IndexError: raised when a game could not be started, see Game.
+        """
+        if deck is None:
+            deck = get_standard_card_deck()
+        self._setup(game_count, player_count, rules, len(deck), seed)
+
+        deck_ids = np.array([card.id for card in deck], dtype=np.uint8)
+        shuffled = deck_ids[np.argsort(self.rng.random((game_count, len(deck))), axis=1)]
+
+        # the top card is replaced until it is a number card, replaced cards leave the game like in Game.__init__
+        numbers = _CARD_TYPES[shuffled[:, ::-1]] <= CardType.NUMBER_9.value
+        open_position = np.where(numbers.any(axis=1), len(deck) - 1 - np.argmax(numbers, axis=1), -1)
+        dealt_count = rules.player_card_count * player_count
+        if (open_position < dealt_count).any():
+            raise IndexError('deck holds too few cards to start the game')
+        self.open_deck[:, 0] = shuffled[self._games, open_position]
+        self.open_count[:] = 1
+
+        dealt = np.arange(dealt_count)
+        dealt_positions = open_position[:, None] - 1 - dealt
+        np.add.at(self.hands,
+                  (np.repeat(self._games, dealt_count), np.tile(dealt % player_count, game_count),
+                   shuffled[self._games[:, None], dealt_positions].ravel()), 1)
+
+        self.closed_deck[:] = shuffled
+        self.closed_count[:] = open_position - dealt_count
+
+    def _setup(self, game_count: int, player_count: int, rules: Rules, deck_size: int,
+               seed: int | np.random.Generator | None):
+        self.rules = rules
+        self.game_count = game_count
+        self.player_count = player_count
+        self.rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+        self.hands = np.zeros((game_count, player_count, CARD_ID_COUNT), dtype=np.int16)
+        self.closed_deck = np.zeros((game_count, deck_size), dtype=np.uint8)
+        self.closed_count = np.zeros(game_count, dtype=np.int64)
+        self.open_deck = np.zeros((game_count, deck_size), dtype=np.uint8)
+        self.open_count = np.zeros(game_count, dtype=np.int64)
+        self.current_turn = np.zeros(game_count, dtype=np.int64)
+        self.direction = np.full(game_count, Directions.CLOCKWISE.value, dtype=np.int64)
+        self.color_selection = np.full(game_count, NO_COLOR_SELECTION, dtype=np.int64)
+        self.accumulated_draw_count = np.zeros(game_count, dtype=np.int64)
+        self.finished = np.zeros(game_count, dtype=np.bool_)  # set where Game.step would have raised GameStop
+
+        self._games = np.arange(game_count)
+        self._playable = _playability_array(rules)
+
+    @classmethod
+    def from_games(cls, games: Sequence[Game], seed: int | np.random.Generator | None = None) -> 'BatchGame':
+        """
+        :param games: games sharing player count and rules, their current state is copied.
+        :param seed: seed or generator used for reshuffles.
+        :return: batch continuing all given games.
+        """
+        rules = games[0].rules
+        player_count = len(games[0].player_decks)
+        if any(game.rules != rules or len(game.player_decks) != player_count for game in games):
+            raise ValueError('all games must share rules and player count')
+
+        deck_size = max(len(game.closed_deck) + len(game.open_deck) + sum(map(len, game.player_decks))
+                        for game in games)
+        batch = cls.__new__(cls)
+        batch._setup(len(games), player_count, rules, deck_size, seed)
+
+        for index, game in enumerate(games):
+            batch.closed_deck[index, :len(game.closed_deck)] = [card.id for card in game.closed_deck]
+            batch.closed_count[index] = len(game.closed_deck)
+            batch.open_deck[index, :len(game.open_deck)] = [card.id for card in game.open_deck]
+            batch.open_count[index] = len(game.open_deck)
+            for player, player_deck in enumerate(game.player_decks):
+                for card in player_deck:
+                    batch.hands[index, player, card.id] += 1
+            batch.current_turn[index] = game.current_turn
+            batch.direction[index] = game.direction.value
+            batch.color_selection[index] = NO_COLOR_SELECTION if game.color_selection is None \
+                else game.color_selection.value
+            batch.accumulated_draw_count[index] = game.accumulated_draw_count
+
+        return batch
+
+    @property
+    def open_card(self) -> NDArray[np.uint8]:
+        """
+        :return: id of the most upper card of each open deck.
+        """
+        return self.open_deck[self._games, self.open_count - 1]
+
+    def hand_sizes(self) -> NDArray[np.int64]:
+        """
+        :return: card count of every player in every game, shape (game_count, player_count).
+        """
+        hand_sizes: NDArray[np.int64] = self.hands.sum(axis=2, dtype=np.int64)
+        return hand_sizes
+
+    def playable_cards(self) -> NDArray[np.bool_]:
+        """
+        :return: mask of shape (game_count, CARD_ID_COUNT), True where the current player holds a playable card.
+        """
+        playable: NDArray[np.bool_] = self._playable[self.open_card, self.color_selection] & (
+                self.hands[self._games, self.current_turn] > 0)
+        return playable
+
+    def legal_actions(self) -> NDArray[np.bool_]:
+        """
+        :return: mask of shape (game_count, CARD_ID_COUNT + 1), last column is True where drawing is allowed.
+        """
+        playable = self.playable_cards()
+        may_draw = self.accumulated_draw_count == 0
+        if self.rules.mandatory_playing:
+            may_draw &= ~playable.any(axis=1)
+
+        legal = np.concatenate([playable, may_draw[:, None]], axis=1)
+        legal[self.finished] = False
+        return legal
+
+    def _next_player(self, games: NDArray[np.intp]):
+        self.current_turn[games] = (self.current_turn[games] + self.direction[games]) % self.player_count
+
+    def _draw(self, games: NDArray[np.intp], counts: NDArray[np.int64] | int = 1):
+        """
+        lets the current player of every game in games draw counts cards, reshuffling where the closed deck is empty.
+        stops drawing if every other card is held by the players.
+        """
+        players = self.current_turn[games]
+        counts = np.broadcast_to(counts, games.shape)
+        for drawn in range(int(counts.max(initial=0))):
+            self._reshuffle(games[(counts > drawn) & (self.closed_count[games] == 0) & (self.open_count[games] > 1)])
+            drawing = (counts > drawn) & (self.closed_count[games] > 0)
+            drawing_games = games[drawing]
+            self.closed_count[drawing_games] -= 1
+            card_ids = self.closed_deck[drawing_games, self.closed_count[drawing_games]]
+            self.hands[drawing_games, players[drawing], card_ids] += 1
+
+    def _reshuffle(self, games: NDArray[np.intp]):
+        """
+        moves all open cards except the top card into the empty closed deck and shuffles them.
+        """
+        moved_counts = self.open_count[games] - 1
+        keys = self.rng.random((len(games), self.open_deck.shape[1]))
+        keys[np.arange(self.open_deck.shape[1]) >= moved_counts[:, None]] = np.inf
+        self.closed_deck[games] = np.take_along_axis(self.open_deck[games], np.argsort(keys, axis=1), axis=1)
+        self.closed_count[games] = moved_counts
+        self.open_deck[games, 0] = self.open_deck[games, moved_counts]
+        self.open_count[games] = 1
+
+    def step(self, played_card_ids: ArrayLike, color_selection: ArrayLike | None = None,
+             swap_player_selection: ArrayLike | None = None,
+             add_4_challenged: ArrayLike | None = None) -> NDArray[np.bool_]:
+        """
+        steps every game that has not finished yet, see Game.step.
+        Moves that make Game.step raise ValueError are rejected like disallowed moves.
+        :param played_card_ids: id of the card played in each game, negative to draw a card instead.
+        :param color_selection: Color value per game, required where a black card is played.
+        :param swap_player_selection: player index per game, required where a seven is played and seven_swaps applies.
+        :param add_4_challenged: bool per game.
+        :return: mask, True where the move was allowed.
+        """
+        rules = self.rules
+        played_card_ids = np.asarray(played_card_ids, dtype=np.int64)
+        color_selection = np.full(self.game_count, NO_COLOR_SELECTION) if color_selection is None \
+            else np.asarray(color_selection, dtype=np.int64)
+        swap_player_selection = np.full(self.game_count, -1) if swap_player_selection is None \
+            else np.asarray(swap_player_selection, dtype=np.int64)
+        add_4_challenged = np.zeros(self.game_count, dtype=np.bool_) if add_4_challenged is None \
+            else np.asarray(add_4_challenged, dtype=np.bool_)
+
+        active = ~self.finished
+        open_card = self.open_card
+        playable = self.playable_cards()
+
+        drawing = active & (played_card_ids < 0) & (self.accumulated_draw_count == 0)
+        if rules.mandatory_playing:
+            drawing &= ~playable.any(axis=1)
+
+        card_ids = np.where(active & (played_card_ids >= 0) & (played_card_ids < CARD_ID_COUNT), played_card_ids, 0)
+        card_types = _CARD_TYPES[card_ids]
+        playing = active & (played_card_ids >= 0) & (played_card_ids < CARD_ID_COUNT) & playable[
+            self._games, card_ids]
+        playing &= (card_types < CardType.COLOR_SELECT.value) | (
+                (color_selection >= 0) & (color_selection < NO_COLOR_SELECTION))
+        if rules.seven_swaps:
+            playing &= (card_types != CardType.NUMBER_7.value) | (
+                    (swap_player_selection >= 0) & (swap_player_selection < self.player_count) & (
+                        swap_player_selection != self.current_turn))
+
+        drawn = np.flatnonzero(drawing)
+        # like in Game, the turn passes where nothing is left to draw
+        empty = (self.closed_count[drawn] == 0) & (self.open_count[drawn] < 2)
+        self._draw(drawn)
+        self._next_player(drawn if not rules.draw_until_play else drawn[empty])
+
+        self._play(np.flatnonzero(playing), card_ids, card_types, open_card, color_selection,
+                   swap_player_selection, add_4_challenged)
+
+        allowed: NDArray[np.bool_] = drawing | playing
+        return allowed
+
+    def _play(self, games: NDArray[np.intp], card_ids: NDArray[np.int64], card_types: NDArray[np.int8],
+              open_card: NDArray[np.uint8], color_selection: NDArray[np.int64],
+              swap_player_selection: NDArray[np.int64], add_4_challenged: NDArray[np.bool_]):
+        rules = self.rules
+        card_ids = card_ids[games]
+        card_types = card_types[games]
+        self.hands[games, self.current_turn[games], card_ids] -= 1
+
+        if rules.zero_passes_on:
+            zeros = card_types == CardType.NUMBER_0.value
+            for direction in Directions:
+                rotated = games[zeros & (self.direction[games] == direction.value)]
+                self.hands[rotated] = np.roll(self.hands[rotated], direction.value, axis=1)
+
+        if rules.seven_swaps:
+            swapping = games[card_types == CardType.NUMBER_7.value]
+            current, other = self.current_turn[swapping], swap_player_selection[swapping]
+            current_hands = self.hands[swapping, current]
+            self.hands[swapping, current] = self.hands[swapping, other]
+            self.hands[swapping, other] = current_hands
+
+        self._next_player(games[card_types == CardType.BLOCK.value])
+
+        rotating = games[card_types == CardType.ROTATE.value]
+        self.direction[rotating] = -self.direction[rotating]
+
+        self.accumulated_draw_count[games[card_types == CardType.ADD2.value]] += 2
+
+        selecting = card_types >= CardType.COLOR_SELECT.value
+        self.color_selection[games[selecting]] = color_selection[games[selecting]]
+
+        add_4 = card_types == CardType.ADD4.value
+        challenged = add_4 & add_4_challenged[games] if rules.add_4_challengeable else np.zeros_like(add_4)
+        self.accumulated_draw_count[games[add_4 & ~challenged]] += 4
+        challenged_games = games[challenged]
+        could_play_other = (self._playable[open_card[challenged_games], self.color_selection[challenged_games]] & (
+                self.hands[challenged_games, self.current_turn[challenged_games]] > 0)).any(axis=1)
+        self._draw(challenged_games[could_play_other], 4)
+        self.accumulated_draw_count[challenged_games[~could_play_other]] += 6
+
+        penalized = games[(card_types != CardType.ADD2.value) & ~add_4]
+        self._draw(penalized, self.accumulated_draw_count[penalized])
+        self.accumulated_draw_count[penalized] = 0
+
+        self._next_player(games)
+
+        finished = ~self.hands[games].any(axis=(1, 2))
+        self.finished[games[finished]] = True
+        games, card_ids, card_types = games[~finished], card_ids[~finished], card_types[~finished]
+
+        for _ in range(self.player_count):  # skips players with no cards.
+            skipped = games[~self.hands[games, self.current_turn[games]].any(axis=1)]
+            if not len(skipped):
+                break
+            self._next_player(skipped)
+
+        self.open_deck[games, self.open_count[games]] = card_ids
+        self.open_count[games] += 1
+
+        self.color_selection[games[card_types < CardType.COLOR_SELECT.value]] = NO_COLOR_SELECTION
+
+        # lets next player draw cards if some have been stacked and the player has no playable add2 or add4
+        attacked = games[self.accumulated_draw_count[games] != 0]
+        playable = self._playable[card_ids[self.accumulated_draw_count[games] != 0], self.color_selection[attacked]] & (
+                self.hands[attacked, self.current_turn[attacked]] > 0)
+        defenseless = attacked[~playable[:, _ADD_CARDS].any(axis=1)]
+        self._draw(defenseless, self.accumulated_draw_count[defenseless])
+        self.accumulated_draw_count[defenseless] = 0
@@ -1,19 +1,64 @@
-from dataclasses import dataclass
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator, MutableSequence, Sequence
+from dataclasses import dataclass, field
+from typing import overload
 
 from oneEngine.enums import Color, CardType
 from oneEngine.rules import Rules
 
+CARD_ID_COUNT = 54  # 4 colors * 13 colored card types + 2 black card types
+NO_COLOR_SELECTION = 4  # index used in playability tables where no color has been selected
+COLORED_CARD_COUNT = 4 * 13  # colored card ids come first, see Card.id
+SELECTABLE_COLORS = (Color.BLUE, Color.GREEN, Color.YELLOW, Color.RED)  # ordered by value
 
-@dataclass(frozen=True, slots=True)
+
+@dataclass(frozen=True, slots=True, init=False, eq=False)
 class Card:
+    """
+    Cards are interned: there is exactly one instance per color and card_type, so cards compare by identity.
+    """
     color: Color
     card_type: CardType
+    id: int = field(repr=False)  # integer in range(CARD_ID_COUNT)
+
+    def __new__(cls, color: Color, card_type: CardType) -> 'Card':
+        card = _cards_by_values[color.value * len(CardType) + card_type.value]
+        if card is not None:
+            return card
 
-    def __post_init__(self):
-        if self.color is Color.BLACK and self.card_type not in (CardType.COLOR_SELECT, CardType.ADD4):
-            raise ValueError(f'Card of type {self.card_type} cannot be black')
-        elif self.card_type in (CardType.COLOR_SELECT, CardType.ADD4) and self.color is not Color.BLACK:
-            raise ValueError(f'Card of type {self.card_type} must be black')
+        if color is Color.BLACK:
+            raise ValueError(f'Card of type {card_type} cannot be black')
+        raise ValueError(f'Card of type {card_type} must be black')
+
+    @classmethod
+    def from_id(cls, card_id: int) -> 'Card':
+        """
+        :param card_id: integer in range(CARD_ID_COUNT).
+        :return: card with the given id.
+        """
+        return _cards[card_id]
+
+    def __hash__(self):
+        return self.id
+
+    def __reduce__(self):
+        return Card.from_id, (self.id,)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def playable_mask(self, rules: Rules, previous_color_selection: Color | None = None) -> int:
+        """
+        :param rules: rules applying to the game.
+        :param previous_color_selection: must be given if self is black and therefore a color has been selected.
+        :return: bitmask with bit card.id set for every card that can be stacked on self.
+        """
+        selection = NO_COLOR_SELECTION if previous_color_selection is None else previous_color_selection.value
+        return get_playability_table(rules)[self.id * (NO_COLOR_SELECTION + 1) + selection]
 
     def other_is_playable(self, other: 'Card', rules: Rules, previous_color_selection: Color | None = None) -> bool:
         """
@@ -23,19 +68,9 @@ class Card:
         :param previous_color_selection: must be given if self is black and therefore a color has been selected.
         :return: True if other can be stacked on self.
         """
-        if self.card_type.value <= 11:
-            return self.card_type == other.card_type or self.color is other.color or other.color is Color.BLACK
-
-        if self.card_type is CardType.ADD2:
-            return (self.color is other.color and other.card_type is not CardType.ADD2) or (
-                    other.card_type is CardType.ADD2 and rules.add_2_stackable)
+        return bool(self.playable_mask(rules, previous_color_selection) >> other.id & 1)
 
-        if self.color is Color.BLACK:
-            return other.color is previous_color_selection or (other.color is Color.BLACK and rules.black_on_black)
-
-        return rules.black_on_black
-
-    def filter_playable_cards(self, deck: list['Card'], rules: Rules,
+    def filter_playable_cards(self, deck: Iterable['Card'], rules: Rules,
                               previous_color_selection: Color | None = None) -> list['Card']:
         """
         :param deck: list of cards that should be filtered
@@ -43,16 +78,70 @@ class Card:
         :param previous_color_selection: must be given if self is black and therefore a color has been selected.
         :return: list of cards that can be stacked on self.
         """
-        return [card for card in deck if self.other_is_playable(card, rules, previous_color_selection)]
+        playable = self.playable_mask(rules, previous_color_selection)
+        return [card for card in deck if playable >> card.id & 1]
 
     def __repr__(self):
         return f'Card(Color.{self.color.name}, CardType.{self.card_type.name})'
 
 
-def get_standard_card_deck() -> list[Card]:
+def _create_cards() -> tuple[list[Card], list[Card | None]]:
+    cards: list[Card] = []
+    cards_by_values: list[Card | None] = [None] * (len(Color) * len(CardType))
+
+    for color in Color:
+        for card_type in CardType:
+            if (color is Color.BLACK) is not (card_type in (CardType.COLOR_SELECT, CardType.ADD4)):
+                continue
+            card = object.__new__(Card)
+            object.__setattr__(card, 'color', color)
+            object.__setattr__(card, 'card_type', card_type)
+            object.__setattr__(card, 'id', len(cards))
+            cards.append(card)
+            cards_by_values[color.value * len(CardType) + card_type.value] = card
+
+    return cards, cards_by_values
+
+
+# ids enumerate colors and card types in definition order: 13 * color + card_type for colored cards, then the black cards
+_cards, _cards_by_values = _create_cards()
+
+
+def _other_is_playable(card: Card, other: Card, black_on_black: bool, add_2_stackable: bool,
+                       previous_color_selection: Color | None) -> bool:
+    if card.card_type.value <= 11:
+        return card.card_type == other.card_type or card.color is other.color or other.color is Color.BLACK
+
+    if card.card_type is CardType.ADD2:
+        return (card.color is other.color and other.card_type is not CardType.ADD2) or (
+                other.card_type is CardType.ADD2 and add_2_stackable)
+
+    if card.color is Color.BLACK:
+        return other.color is previous_color_selection or (other.color is Color.BLACK and black_on_black)
+
+    return black_on_black
+
+
+_playability_tables: dict[tuple[bool, bool], tuple[int, ...]] = {}
+
+
+def get_playability_table(rules: Rules) -> tuple[int, ...]:
     """
-    :return: standard uno deck, see: https://de.m.wikipedia.org/wiki/Datei:UNO_cards_deck.svg
+    compiled once for every combination of the rules affecting playability.
+    :param rules: rules applying to the game.
+    :return: bitmasks of playable card ids, indexed by open card id * 5 + color selection (NO_COLOR_SELECTION if None).
     """
+    key = (rules.black_on_black, rules.add_2_stackable)
+    if key not in _playability_tables:
+        selections = [*map(Color, range(NO_COLOR_SELECTION)), None]
+        _playability_tables[key] = tuple(
+            sum(1 << other.id for other in _cards if _other_is_playable(card, other, *key, selection))
+            for card in _cards for selection in selections
+        )
+    return _playability_tables[key]
+
+
+def _create_standard_card_deck() -> tuple[Card, ...]:
     card_deck: list[Card] = []
 
     for color in range(4):
@@ -71,4 +160,233 @@ def get_standard_card_deck() -> list[Card]:
     card_deck += [Card(Color.BLACK, CardType.COLOR_SELECT)] * 4
     card_deck += [Card(Color.BLACK, CardType.ADD4)] * 4
 
-    return card_deck
+    return tuple(card_deck)
+
+
+# standard uno deck, see get_standard_card_deck
+STANDARD_DECK = _create_standard_card_deck()
+# bitmask of the ids of ADD2 and ADD4 cards, see Card.playable_mask
+ADD_CARDS_MASK = sum({1 << card.id for card in STANDARD_DECK
+                      if card.card_type is CardType.ADD2 or card.card_type is CardType.ADD4})
+
+
+def get_standard_card_deck() -> list[Card]:
+    """
+    :return: standard uno deck, see: https://de.m.wikipedia.org/wiki/Datei:UNO_cards_deck.svg
+    """
+    return list(STANDARD_DECK)
+
+
+class CardArray(MutableSequence[Card]):
+    """
+    Mutable sequence of cards storing one byte per card, see Card.id and Card.from_id.
+    """
+    __slots__ = ('ids',)
+    ids: 'array[int]'
+
+    def __init__(self, cards: Iterable[Card] = ()):
+        self.ids = cards.ids[:] if isinstance(cards, CardArray) else array('B', [card.id for card in cards])
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int]) -> 'CardArray':
+        """
+        :param ids: card ids, e.g. bytes.
+        """
+        card_array = cls.__new__(cls)
+        card_array.ids = array('B', ids)
+        return card_array
+
+    def copy(self) -> 'CardArray':
+        return CardArray.from_ids(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @overload
+    def __getitem__(self, index: int) -> Card: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'CardArray': ...
+
+    def __getitem__(self, index: int | slice) -> 'Card | CardArray':
+        if isinstance(index, slice):
+            return CardArray.from_ids(self.ids[index])
+        return _cards[self.ids[index]]
+
+    @overload
+    def __setitem__(self, index: int, value: Card) -> None: ...
+
+    @overload
+    def __setitem__(self, index: slice, value: Iterable[Card]) -> None: ...
+
+    def __setitem__(self, index: int | slice, value: Card | Iterable[Card]) -> None:
+        if isinstance(index, slice):
+            assert not isinstance(value, Card)
+            self.ids[index] = array('B', [card.id for card in value])
+        else:
+            assert isinstance(value, Card)
+            self.ids[index] = value.id
+
+    def __delitem__(self, index: int | slice) -> None:
+        del self.ids[index]
+
+    def __iter__(self) -> Iterator[Card]:
+        return map(_cards.__getitem__, self.ids)
+
+    def insert(self, index: int, value: Card) -> None:
+        self.ids.insert(index, value.id)
+
+    def append(self, value: Card) -> None:
+        self.ids.append(value.id)
+
+    def pop(self, index: int = -1) -> Card:
+        return _cards[self.ids.pop(index)]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CardArray):
+            return self.ids == other.ids
+        if isinstance(other, Sequence | deque):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self):
+        return f'CardArray({list(self)!r})'
+
+
+# color and card type values by card id
+_color_values = [card.color.value for card in _cards]
+_card_type_values = [card.card_type.value for card in _cards]
+
+
+class Hand(MutableSequence[Card]):
+    """
+    Mutable sequence of cards keeping counts by card id, color and card type and a bitmask of the card ids it holds,
+    so e.g. whether the hand holds a playable card is answered in constant time, see holds_any.
+    """
+    __slots__ = ('cards', 'id_counts', 'color_counts', 'type_counts', 'mask')
+
+    def __init__(self, cards: Iterable[Card] = ()):
+        if isinstance(cards, Hand):
+            self.cards: list[Card] = cards.cards[:]
+            self.id_counts: list[int] = cards.id_counts[:]
+            self.color_counts: list[int] = cards.color_counts[:]
+            self.type_counts: list[int] = cards.type_counts[:]
+            self.mask: int = cards.mask
+            return
+
+        self.cards = []
+        self.id_counts = [0] * CARD_ID_COUNT
+        self.color_counts = [0] * len(Color)
+        self.type_counts = [0] * len(CardType)
+        self.mask = 0
+        self[:] = cards
+
+    def copy(self) -> 'Hand':
+        return Hand(self)
+
+    def _add(self, card: Card):
+        card_id = card.id
+        self.id_counts[card_id] += 1
+        self.color_counts[_color_values[card_id]] += 1
+        self.type_counts[_card_type_values[card_id]] += 1
+        self.mask |= 1 << card_id
+
+    def _remove(self, card: Card):
+        card_id = card.id
+        self.id_counts[card_id] -= 1
+        self.color_counts[_color_values[card_id]] -= 1
+        self.type_counts[_card_type_values[card_id]] -= 1
+        if not self.id_counts[card_id]:
+            self.mask &= ~(1 << card_id)
+
+    def holds_any(self, mask: int) -> bool:
+        """
+        :param mask: bitmask of card ids, e.g. Card.playable_mask.
+        :return: True if the hand holds a card whose id is set in mask.
+        """
+        return bool(self.mask & mask)
+
+    def count_color(self, color: Color) -> int:
+        return self.color_counts[color.value]
+
+    def count_type(self, card_type: CardType) -> int:
+        return self.type_counts[card_type.value]
+
+    def count(self, value: Card) -> int:  # type: ignore[override]
+        return self.id_counts[value.id]
+
+    def __contains__(self, value: object) -> bool:
+        return isinstance(value, Card) and self.id_counts[value.id] > 0
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    @overload
+    def __getitem__(self, index: int) -> Card: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'Hand': ...
+
+    def __getitem__(self, index: int | slice) -> 'Card | Hand':
+        if isinstance(index, slice):
+            return Hand(self.cards[index])
+        return self.cards[index]
+
+    @overload
+    def __setitem__(self, index: int, value: Card) -> None: ...
+
+    @overload
+    def __setitem__(self, index: slice, value: Iterable[Card]) -> None: ...
+
+    def __setitem__(self, index: int | slice, value: Card | Iterable[Card]) -> None:
+        if isinstance(index, slice):
+            assert not isinstance(value, Card)
+            value = list(value)
+            for card in self.cards[index]:
+                self._remove(card)
+            self.cards[index] = value
+            for card in value:
+                self._add(card)
+        else:
+            assert isinstance(value, Card)
+            self._remove(self.cards[index])
+            self.cards[index] = value
+            self._add(value)
+
+    def __delitem__(self, index: int | slice) -> None:
+        if isinstance(index, slice):
+            for card in self.cards[index]:
+                self._remove(card)
+        else:
+            self._remove(self.cards[index])
+        del self.cards[index]
+
+    def __iter__(self) -> Iterator[Card]:
+        return iter(self.cards)
+
+    def insert(self, index: int, value: Card) -> None:
+        self.cards.insert(index, value)
+        self._add(value)
+
+    def append(self, value: Card) -> None:
+        self.cards.append(value)
+        self._add(value)
+
+    def pop(self, index: int = -1) -> Card:
+        card = self.cards.pop(index)
+        self._remove(card)
+        return card
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Hand):
+            return self.cards == other.cards
+        if isinstance(other, Sequence | deque):
+            return self.cards == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self):
+        return f'Hand({self.cards!r})'
@@ -0,0 +1,259 @@
+import random
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from oneEngine.batch import BatchGame
+from oneEngine.card import CARD_ID_COUNT, COLORED_CARD_COUNT, NO_COLOR_SELECTION, SELECTABLE_COLORS, Card
+from oneEngine.enums import CardType, Color
+from oneEngine.game import Action, Game, GameStop
+from oneEngine.rules import Rules
+
+_COLOR_SELECT_ID = Card(Color.BLACK, CardType.COLOR_SELECT).id
+_ADD4_ID = Card(Color.BLACK, CardType.ADD4).id
+_SEVEN_IDS = [Card(color, CardType.NUMBER_7).id for color in SELECTABLE_COLORS]
+
+
+class ActionSpace:
+    """
+    fixed size action space of games with player_count players. Actions refer to cards by id instead of their index
+    in the hand, indices are laid out as:
+    colored card ids (sevens only if seven swaps are disabled), sevens of every color swapping with the player
+    1 to player_count - 1 seats further, COLOR_SELECT for every color, ADD4 for every color unchallenged and
+    challenged, draw.
+    """
+
+    def __init__(self, player_count: int):
+        self.player_count = player_count
+        self.swap_offset = COLORED_CARD_COUNT
+        self.color_select_offset = self.swap_offset + 4 * (player_count - 1)
+        self.add_4_offset = self.color_select_offset + 4
+        self.draw = self.add_4_offset + 8
+        self.size = self.draw + 1
+
+    def index(self, game: Game, action: Action) -> int:
+        """
+        :param action: action of the current player of game.
+        :return: index of action.
+        """
+        if action.played_card_index is None:
+            return self.draw
+
+        card = game.current_player_deck[action.played_card_index]
+        if card.card_type is CardType.COLOR_SELECT:
+            assert action.color_selection is not None
+            return self.color_select_offset + action.color_selection.value
+        if card.card_type is CardType.ADD4:
+            assert action.color_selection is not None
+            return self.add_4_offset + 2 * action.color_selection.value + action.add_4_challenged
+        if card.card_type is CardType.NUMBER_7 and game.rules.seven_swaps:
+            assert action.swap_player_selection is not None
+            seats = (action.swap_player_selection - game.current_turn) % len(game.player_decks)
+            return self.swap_offset + card.color.value * (self.player_count - 1) + seats - 1
+        return card.id
+
+    def action(self, game: Game, index: int) -> Action:
+        """
+        :param index: index of an action of the current player of game.
+        :raises ValueError: raised when the current player does not hold the card.
+        :return: action with the index of the first matching card in the current player's deck.
+        """
+        if index == self.draw:
+            return Action(None)
+
+        hand = game.current_player_deck
+        if index >= self.add_4_offset:
+            return Action(hand.index(Card.from_id(_ADD4_ID)), Color((index - self.add_4_offset) // 2), None,
+                          bool((index - self.add_4_offset) % 2))
+        if index >= self.color_select_offset:
+            return Action(hand.index(Card.from_id(_COLOR_SELECT_ID)), Color(index - self.color_select_offset))
+        if index >= self.swap_offset:
+            color, seats = divmod(index - self.swap_offset, self.player_count - 1)
+            return Action(hand.index(Card.from_id(_SEVEN_IDS[color])), None,
+                          game.step_index(game.current_turn, seats + 1))
+        return Action(hand.index(Card.from_id(index)))
+
+    def legal_mask(self, game: Game, out: NDArray[np.bool_] | None = None) -> NDArray[np.bool_]:
+        """
+        :param out: buffer of shape (size,) the mask is written to.
+        :return: out, True for every index of Game.legal_actions.
+        """
+        out = np.zeros(self.size, dtype=np.bool_) if out is None else out
+        out.fill(False)
+        for action in game.legal_actions():
+            out[self.index(game, action)] = True
+        return out
+
+
+class ObservationEncoder:
+    """
+    encodes what the current player of a game can see into a float32 vector of size size:
+    counts of the cards in the hand by Card.id, open card one hot by Card.id, color selection one hot
+    (NO_COLOR_SELECTION if None), direction, accumulated draw count, closed deck size and hand sizes of the
+    other players, starting with the next player in clockwise order.
+    """
+
+    def __init__(self, player_count: int):
+        self.player_count = player_count
+        self.open_card_offset = CARD_ID_COUNT
+        self.color_selection_offset = self.open_card_offset + CARD_ID_COUNT
+        self.direction_offset = self.color_selection_offset + NO_COLOR_SELECTION + 1
+        self.accumulated_draw_count_offset = self.direction_offset + 1
+        self.closed_deck_offset = self.accumulated_draw_count_offset + 1
+        self.hand_sizes_offset = self.closed_deck_offset + 1
+        self.size = self.hand_sizes_offset + player_count - 1
+
+    def encode(self, game: Game, out: NDArray[np.float32] | None = None) -> NDArray[np.float32]:
+        """
+        :param out: buffer of shape (size,) the observation is written to.
+        :return: out.
+        """
+        out = np.zeros(self.size, dtype=np.float32) if out is None else out
+        out.fill(0)
+        for card in game.current_player_deck:
+            out[card.id] += 1
+        out[self.open_card_offset + game.open_card.id] = 1
+        out[self.color_selection_offset + (
+            NO_COLOR_SELECTION if game.color_selection is None else game.color_selection.value)] = 1
+        out[self.direction_offset] = game.direction.value
+        out[self.accumulated_draw_count_offset] = game.accumulated_draw_count
+        out[self.closed_deck_offset] = len(game.closed_deck)
+        for seats in range(1, self.player_count):
+            out[self.hand_sizes_offset + seats - 1] = len(game.player_decks[game.step_index(game.current_turn, seats)])
+        return out
+
+    def encode_games(self, games: Sequence[Game], out: NDArray[np.float32] | None = None) -> NDArray[np.float32]:
+        """
+        :param out: buffer of shape (len(games), size).
+        :return: out, one row per game.
+        """
+        out = np.zeros((len(games), self.size), dtype=np.float32) if out is None else out
+        for game, row in zip(games, out):
+            self.encode(game, row)
+        return out
+
+    def encode_batch(self, batch: BatchGame, out: NDArray[np.float32] | None = None) -> NDArray[np.float32]:
+        """
+        vectorized encode of every game of batch.
+        :param out: buffer of shape (batch.game_count, size).
+        :return: out, one row per game.
+        """
+        out = np.zeros((batch.game_count, self.size), dtype=np.float32) if out is None else out
+        games = np.arange(batch.game_count)
+        out.fill(0)
+        out[:, :CARD_ID_COUNT] = batch.hands[games, batch.current_turn]
+        out[games, self.open_card_offset + batch.open_card] = 1
+        out[games, self.color_selection_offset + batch.color_selection] = 1
+        out[:, self.direction_offset] = batch.direction
+        out[:, self.accumulated_draw_count_offset] = batch.accumulated_draw_count
+        out[:, self.closed_deck_offset] = batch.closed_count
+        hand_sizes = batch.hand_sizes()
+        for seats in range(1, self.player_count):
+            out[:, self.hand_sizes_offset + seats - 1] = hand_sizes[
+                games, (batch.current_turn + seats) % self.player_count]
+        return out
+
+
+class VectorEnv:
+    """
+    gym style vector environment of num_envs games played in self-play: every step is taken by the current player
+    of the game. Observations, masks, rewards and flags are written into buffers that are returned by every call,
+    copy them to keep them.
+
+    A game terminates when a hand is empty, the player holding it wins like in tournament.play_game. Passed on
+    zeros and swapped sevens can empty the hand of another player than the acting one. The acting player is
+    rewarded 1 if it wins and -1 if another player wins. Games are truncated after max_steps. Finished games are
+    reset within the same step, so the returned observation belongs to the new game.
+    info['action_mask'] holds the legal actions, info['current_player'] the acting player of every game and
+    info['winner'] the winner of every game terminated by the last step, -1 for the others.
+    """
+
+    def __init__(self, num_envs: int, player_count: int, rules: Rules, seed: int | None = None,
+                 max_steps: int = 10_000):
+        self.num_envs = num_envs
+        self.player_count = player_count
+        self.rules = rules
+        self.max_steps = max_steps
+        self.action_space = ActionSpace(player_count)
+        self.observation_encoder = ObservationEncoder(player_count)
+        self.games: list[Game] = []
+        self.step_counts = np.zeros(num_envs, dtype=np.int64)
+
+        self.observations = np.zeros((num_envs, self.observation_encoder.size), dtype=np.float32)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=np.bool_)
+        self.truncated = np.zeros(num_envs, dtype=np.bool_)
+        self.info: dict[str, Any] = {
+            'action_mask': np.zeros((num_envs, self.action_space.size), dtype=np.bool_),
+            'current_player': np.zeros(num_envs, dtype=np.int64),
+            'winner': np.full(num_envs, -1, dtype=np.int64),
+        }
+        self._seeds = random.Random(seed)
+
+    def _reset_game(self, env: int):
+        game = Game(self.player_count, self.rules, rng=self._seeds.getrandbits(64))
+        if env == len(self.games):
+            self.games.append(game)
+        else:
+            self.games[env] = game
+        self.step_counts[env] = 0
+
+    def _observe(self, env: int):
+        game = self.games[env]
+        self.observation_encoder.encode(game, self.observations[env])
+        self.action_space.legal_mask(game, self.info['action_mask'][env])
+        self.info['current_player'][env] = game.current_turn
+
+    def reset(self, seed: int | None = None) -> tuple[NDArray[np.float32], dict[str, Any]]:
+        """
+        :param seed: reseeds the games if given.
+        :return: observations and info.
+        """
+        if seed is not None:
+            self._seeds = random.Random(seed)
+        for env in range(self.num_envs):
+            self._reset_game(env)
+            self._observe(env)
+        return self.observations, self.info
+
+    def step(self, actions: ArrayLike) -> tuple[NDArray[np.float32], NDArray[np.float32], NDArray[np.bool_],
+                                                NDArray[np.bool_], dict[str, Any]]:
+        """
+        :param actions: one index of action_space per game.
+        :raises ValueError: raised when an action is not legal.
+        :return: observations, rewards, terminated, truncated and info.
+        """
+        actions = np.asarray(actions)
+        self.rewards.fill(0)
+        self.terminated.fill(False)
+        self.truncated.fill(False)
+        winners = self.info['winner']
+        winners.fill(-1)
+
+        for env, game in enumerate(self.games):
+            index = int(actions[env])
+            if not self.info['action_mask'][env, index]:
+                raise ValueError(f'action {index} of environment {env} is not legal')
+            player = game.current_turn
+            self.step_counts[env] += 1
+            try:
+                game.step(*self.action_space.action(game, index))
+            except GameStop:
+                winner: int | None = player
+            else:
+                winner = next((player for player, deck in enumerate(game.player_decks) if not deck), None)
+
+            if winner is not None:
+                self.rewards[env] = 1 if winner == player else -1
+                self.terminated[env] = True
+                winners[env] = winner
+            elif self.step_counts[env] >= self.max_steps:
+                self.truncated[env] = True
+
+            if self.terminated[env] or self.truncated[env]:
+                self._reset_game(env)
+            self._observe(env)
+
+        return self.observations, self.rewards, self.terminated, self.truncated, self.info
@@ -0,0 +1,105 @@
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from time import perf_counter
+from typing import NamedTuple
+
+from oneEngine.card import Card
+from oneEngine.enums import Color, Directions
+
+
+class StepStarted(NamedTuple):
+    player: int
+    played_card_index: int | None
+    color_selection: Color | None
+    swap_player_selection: int | None
+    add_4_challenged: bool
+
+
+class StepEnded(NamedTuple):
+    player: int
+    allowed: bool  # False if step returned False or raised ValueError
+    stopped: bool  # True if step raised GameStop
+
+
+class CardPlayed(NamedTuple):
+    player: int
+    card: Card
+    played_card_index: int
+
+
+class CardDrawn(NamedTuple):
+    player: int
+    card: Card | None  # None if hidden from the recipient, see oneEngine.server
+
+
+class DrawPenalty(NamedTuple):
+    """
+    player has to draw the accumulated count of cards.
+    """
+    player: int
+    card_count: int
+
+
+class Add4Challenged(NamedTuple):
+    player: int  # player who played the ADD4
+    succeeded: bool  # True if player could have played another card
+
+
+class Reshuffled(NamedTuple):
+    card_count: int  # number of cards moved from the open to the closed deck
+
+
+class DecksRotated(NamedTuple):
+    direction: Directions
+
+
+class DecksSwapped(NamedTuple):
+    player: int
+    other_player: int
+
+
+class PlayerSkipped(NamedTuple):
+    """
+    player has no cards and is skipped.
+    """
+    player: int
+
+
+Event = (StepStarted | StepEnded | CardPlayed | CardDrawn | DrawPenalty | Add4Challenged | Reshuffled | DecksRotated
+         | DecksSwapped | PlayerSkipped)
+Observer = Callable[[Event], None]
+
+
+class EventCounter:
+    """
+    observer counting events by their type name, e.g. counts['CardDrawn'].
+    """
+
+    def __init__(self):
+        self.counts: Counter[str] = Counter()
+
+    def __call__(self, event: Event):
+        self.counts[type(event).__name__] += 1
+
+
+class StepTimer:
+    """
+    observer measuring the time spent in Game.step per branch: 'draw', the name of the played card type or 'rejected'.
+    """
+
+    def __init__(self):
+        self.seconds: defaultdict[str, float] = defaultdict(float)
+        self.counts: Counter[str] = Counter()
+        self._branch = 'rejected'
+        self._start = 0.0
+
+    def __call__(self, event: Event):
+        if isinstance(event, StepStarted):
+            self._branch = 'draw' if event.played_card_index is None else 'rejected'
+            self._start = perf_counter()
+        elif isinstance(event, CardPlayed):
+            self._branch = event.card.card_type.name
+        elif isinstance(event, StepEnded):
+            branch = self._branch if event.allowed else 'rejected'
+            self.seconds[branch] += perf_counter() - self._start
+            self.counts[branch] += 1
@@ -1,50 +1,158 @@
-from collections import deque
-from random import shuffle
+from collections.abc import Callable, Iterable, MutableSequence
+import random
+from typing import TYPE_CHECKING, Any, NamedTuple
 
-from oneEngine.card import Card, get_standard_card_deck
+from oneEngine import events
+from oneEngine.card import ADD_CARDS_MASK, SELECTABLE_COLORS, STANDARD_DECK, Card, CardArray, Hand
 from oneEngine.enums import CardType, Color, Directions
+from oneEngine.pile import PileView, Piles
 from oneEngine.rules import Rules
 
+if TYPE_CHECKING:
+    from oneEngine.record import GameRecord
+
+
+def _holds_playable(deck: Iterable[Card], playable_mask: int) -> bool:
+    """
+    :param playable_mask: see Card.playable_mask
+    :return: True if deck contains a card whose id is set in playable_mask.
+    """
+    if isinstance(deck, Hand):
+        return deck.holds_any(playable_mask)
+    for card in deck:
+        if playable_mask >> card.id & 1:
+            return True
+    return False
+
+
+def _deck_key(deck: Iterable[Card]) -> tuple[Card, ...] | bytes:
+    """
+    :return: hashable copy of the cards of deck in order, without creating Card objects for a CardArray.
+    """
+    # isinstance checks against the ABC based card containers are slow
+    if type(deck) is CardArray:
+        return deck.ids.tobytes()
+    if type(deck) is Hand:
+        return tuple(deck.cards)
+    return tuple(deck)
+
 
 class GameStop(Exception):
     def __init__(self):
         super().__init__()
 
 
+class Action(NamedTuple):
+    """
+    arguments of Game.step, i.e. game.step(*action).
+    """
+    played_card_index: int | None
+    color_selection: Color | None = None
+    swap_player_selection: int | None = None
+    add_4_challenged: bool = False
+
+
+class GameSnapshot(NamedTuple):
+    """
+    state of a game as returned by Game.snapshot, the generator state is not included.
+    """
+    closed_deck: tuple[Card, ...]
+    open_deck: tuple[Card, ...]
+    player_decks: tuple[tuple[Card, ...], ...]
+    current_turn: int
+    direction: Directions
+    color_selection: Color | None
+    accumulated_draw_count: int
+
+
+class PlayerView(NamedTuple):
+    """
+    what player can see of a game, as returned by Game.view.
+    """
+    player: int
+    hand: tuple[Card, ...]
+    hand_sizes: tuple[int, ...]  # indexed by player
+    open_card: Card
+    color_selection: Color | None
+    direction: Directions
+    accumulated_draw_count: int
+    current_turn: int
+    closed_deck_size: int
+
+
+# operations recorded in the undo log
+_DRAW, _PLAY, _ROTATE_DECKS, _SWAP_DECKS, _DISCARD, _RESHUFFLE = range(6)
+
+
 class Game:
+    _piles: Piles  # closed and open deck
+
     @property
-    def current_player_deck(self) -> list[Card]:
+    def current_player_deck(self) -> MutableSequence[Card]:
         return self.player_decks[self.current_turn]
 
     @property
-    def open_card(self):
+    def open_card(self) -> Card:
         """
         :return: last card of self.open_deck (i.e. most upper card)
         """
-        return self.open_deck[-1]
+        return self._piles.top()
 
-    def __init__(self, player_count: int, rules: Rules, deck: list[Card] | None = None):
+    @property
+    def closed_deck(self) -> PileView:
         """
-        :param player_count:
-        :param rules:
-        :param deck: list of cards that should be used in the game. get_standard_card_deck() used if None.
+        :return: live view of the closed deck, the top card is last. see Piles.
         """
-        if deck is None:
-            deck = get_standard_card_deck()
-        self.closed_deck: deque[Card] = deque(deck)
-        shuffle(self.closed_deck)
+        return self._piles.closed_deck
 
-        self.open_deck: deque[Card] = deque([self.closed_deck.pop()])
-        illegal_initial_card_types = [CardType.BLOCK, CardType.ROTATE, CardType.ADD2, CardType.ADD4,
-                                      CardType.COLOR_SELECT]
-        while self.open_deck[0].card_type in illegal_initial_card_types:
-            self.open_deck[0] = self.closed_deck.pop()
+    @closed_deck.setter
+    def closed_deck(self, cards: Iterable[Card]):
+        self._version += 1
+        self._piles = Piles(cards, self._piles.open_deck, self._piles.capacity, self._pile_type)
 
-        self.player_decks: list[list[Card]] = [[] for _ in range(player_count)]  # sorted clockwise
+    @property
+    def open_deck(self) -> PileView:
+        """
+        :return: live view of the open deck, the top card is last. see Piles.
+        """
+        return self._piles.open_deck
 
-        for _ in range(rules.player_card_count):
-            for player in range(player_count):
-                self.player_decks[player].append(self.closed_deck.pop())
+    @open_deck.setter
+    def open_deck(self, cards: Iterable[Card]):
+        self._version += 1
+        self._piles = Piles(self._piles.closed_deck, cards, self._piles.capacity, self._pile_type)
+
+    def __init__(self, player_count: int, rules: Rules, deck: list[Card] | None = None, compact: bool = False,
+                 rng: random.Random | int | None = None, counted_hands: bool = False):
+        """
+        :param player_count:
+        :param rules:
+        :param deck: list of cards that should be used in the game. get_standard_card_deck() used if None.
+        :param compact: if True, decks are stored as CardArray (one byte per card) instead of lists.
+        :param rng: generator or seed used for every shuffle of this game. the module level generator is used if None.
+        :param counted_hands: if True, player decks are stored as Hand, answering playability checks in constant time.
+        """
+        # None stands for the module level functions like random.shuffle
+        self.rng: random.Random | None = rng if rng is None or isinstance(rng, random.Random) else random.Random(rng)
+        # shuffles a list and deals by slicing, which gives the same games as shuffling the closed deck, popping
+        # the open card until it is a number card and dealing one card per player at a time
+        cards = list(STANDARD_DECK if deck is None else deck)
+        (random.shuffle if self.rng is None else self.rng.shuffle)(cards)
+
+        top = len(cards) - 1
+        while top >= 0 and cards[top].card_type.value > CardType.NUMBER_9.value:
+            top -= 1  # cards drawn as open card but not allowed to start the game leave the game
+        start = top - rules.player_card_count * player_count
+        if start < 0:
+            raise IndexError('deck holds too few cards to start the game')
+        dealt = cards[top - 1:start - 1 if start else None:-1]  # in order of dealing
+
+        self._pile_type: Callable[..., MutableSequence[Card]] = CardArray if compact else list
+        self._piles = Piles(cards[:start], [cards[top]], len(cards), self._pile_type)
+
+        self._hand_type: Callable[..., MutableSequence[Card]] = Hand if counted_hands else CardArray if compact else list
+        self.player_decks: list[MutableSequence[Card]] = [  # sorted clockwise
+            self._hand_type(dealt[player::player_count]) for player in range(player_count)]
 
         self.rules = rules
         self.current_turn: int = 0
@@ -52,6 +160,27 @@ class Game:
         self.color_selection: Color | None = None
         self.accumulated_draw_count = 0
 
+        self._sampling_rng: random.Random | None = None  # see determinizations
+        self._version = 0  # incremented by every step, undo, restore and pile assignment
+        self._legal_actions: tuple[tuple[Any, ...], tuple[Action, ...]] | None = None
+        self._undo_log: list[tuple[tuple[int, Directions, Color | None, int], list[tuple[Any, ...]]]] | None = None
+        self._undo_operations: list[tuple[Any, ...]] | None = None  # operations of the step currently recorded
+        self._observers: list[events.Observer] = []
+        self._observer: events.Observer | None = None  # None if there are no observers, checked before emitting
+
+    @classmethod
+    def many(cls, game_count: int, player_count: int, rules: Rules, seed: int | None = None,
+             deck: list[Card] | None = None, compact: bool = False, counted_hands: bool = False) -> list['Game']:
+        """
+        creates game_count games, each with its own generator seeded from seed, so the games do not depend on the
+        order in which they are played.
+        :param seed: seed of the generator the seeds of the games are drawn from. random seeds are used if None.
+        :return: list of games.
+        """
+        seeds = random.Random(seed)
+        return [cls(player_count, rules, deck, compact, seeds.getrandbits(64), counted_hands)
+                for _ in range(game_count)]
+
     def step_index(self, current: int, steps: int) -> int:
         """
         :param current: starting point
@@ -60,11 +189,269 @@ class Game:
         """
         return (current + steps) % len(self.player_decks)
 
-    def _draw(self, player_index: int):
-        self.player_decks[player_index].append(self.closed_deck.pop())
+    def legal_actions(self) -> tuple[Action, ...]:
+        """
+        cached until the game is modified, direct modifications of its attributes and the current player's deck are
+        detected as well.
+        :return: every move the current player is allowed to make, one action per playable card index,
+            color selection, swap player selection and challenge.
+        """
+        key = (self._version, self.current_turn, len(self.player_decks), self._piles.top(), self.color_selection,
+               self.accumulated_draw_count, self.rules, _deck_key(self.current_player_deck))
+        if self._legal_actions is not None and self._legal_actions[0] == key:
+            return self._legal_actions[1]
+
+        playable_mask = self.open_card.playable_mask(self.rules, self.color_selection)
+        holds_playable = False
+        actions: list[Action] = []
+
+        for index, card in enumerate(self.current_player_deck):
+            if not playable_mask >> card.id & 1:
+                continue
+            holds_playable = True
+            if card.card_type is CardType.COLOR_SELECT:
+                actions += [Action(index, color) for color in SELECTABLE_COLORS]
+            elif card.card_type is CardType.ADD4:
+                actions += [Action(index, color, None, add_4_challenged) for color in SELECTABLE_COLORS
+                            for add_4_challenged in ((False, True) if self.rules.add_4_challengeable else (False,))]
+            elif card.card_type is CardType.NUMBER_7 and self.rules.seven_swaps:
+                actions += [Action(index, None, player) for player in range(len(self.player_decks))
+                            if player != self.current_turn]
+            else:
+                actions.append(Action(index))
+
+        if not self.accumulated_draw_count and not (self.rules.mandatory_playing and holds_playable):
+            actions.append(Action(None))
+
+        self._legal_actions = key, tuple(actions)
+        return self._legal_actions[1]
+
+    def _copy(self) -> 'Game':
+        """
+        :return: shallow copy without undo log, containers are still shared with self.
+        """
+        game = Game.__new__(Game)
+        game.__dict__.update(self.__dict__)
+        game._undo_log = game._undo_operations = None
+        game._sampling_rng = None
+        game._observers = []
+        game._observer = None
+        return game
+
+    def clone(self) -> 'Game':
+        """
+        :return: independent copy sharing rules. it gets its own copy of rng unless the module level generator is used.
+        """
+        game = self._copy()
+        game._piles = self._piles.copy()
+        game.player_decks = [self._hand_type(player_deck) for player_deck in self.player_decks]
+        if self.rng is not None:
+            game.rng = random.Random()
+            game.rng.setstate(self.rng.getstate())
+        return game
+
+    @staticmethod
+    def replay(record: 'GameRecord', compact: bool = False) -> 'Game':
+        """
+        plays the recorded steps of a game written by oneEngine.record.GameRecordWriter, reproducing its state.
+        :param record: see oneEngine.record.GameRecordReader.
+        :param compact: see Game.
+        :raises ValueError: raised when the record does not match the rules of the game.
+        :return: game after the last recorded step.
+        """
+        from oneEngine.record import replay  # oneEngine.record depends on this module
+        return replay(record, compact)
+
+    def determinize(self, observer: int, rng: random.Random | None = None) -> 'Game':
+        """
+        see determinizations.
+        """
+        return self.determinizations(observer, 1, rng)[0]
+
+    def determinizations(self, observer: int, count: int, rng: random.Random | None = None) -> list['Game']:
+        """
+        samples games consistent with what observer knows: the decks of the other players and the closed deck
+        are dealt again from the cards hidden from observer, keeping their sizes. the open deck, the deck of
+        observer and the remaining state are kept.
+        :param observer: index of the observing player.
+        :param count: number of games sampled.
+        :param rng: generator used for sampling and for seeding the generators of the sampled games. If None, a
+            generator of self seeded from the state of self.rng (or of the module level generator) is used, so sampling does not change self.rng.
+        :return: independent games sharing rules.
+        """
+        if rng is None:
+            if self._sampling_rng is None:
+                self._sampling_rng = random.Random(hash(random.getstate() if self.rng is None else self.rng.getstate()))
+            rng = self._sampling_rng
+        hidden_players = [player for player in range(len(self.player_decks)) if player != observer]
+        hidden_cards = list(self.closed_deck)
+        bounds = [len(hidden_cards)]
+        for player in hidden_players:
+            hidden_cards += self.player_decks[player]
+            bounds.append(len(hidden_cards))
+
+        games = []
+        for _ in range(count):
+            rng.shuffle(hidden_cards)
+            game = self._copy()
+            game.rng = random.Random(rng.getrandbits(64))
+            game._legal_actions = None
+            game._piles = Piles(hidden_cards[:bounds[0]], self.open_deck, self._piles.capacity, self._pile_type)
+            game.player_decks = self.player_decks.copy()
+            game.player_decks[observer] = self._hand_type(self.player_decks[observer])
+            for player, start, end in zip(hidden_players, bounds, bounds[1:]):
+                game.player_decks[player] = self._hand_type(hidden_cards[start:end])
+            games.append(game)
+
+        return games
+
+    def snapshot(self) -> GameSnapshot:
+        """
+        :return: state that can be passed to restore.
+        """
+        return GameSnapshot(tuple(self.closed_deck), tuple(self.open_deck), tuple(map(tuple, self.player_decks)),
+                            self.current_turn, self.direction, self.color_selection, self.accumulated_draw_count)
+
+    def view(self, player: int) -> PlayerView:
+        """
+        :return: immutable observation of player, the other decks are reduced to their sizes. see sync.DeltaEncoder.
+        """
+        return PlayerView(player, tuple(self.player_decks[player]), tuple(map(len, self.player_decks)),
+                          self._piles.top(), self.color_selection, self.direction, self.accumulated_draw_count,
+                          self.current_turn, self._piles.closed_count)
+
+    def restore(self, snapshot: GameSnapshot):
+        """
+        resets self to the state of snapshot, the undo log is cleared.
+        """
+        self._version += 1
+        self._piles = Piles(snapshot.closed_deck, snapshot.open_deck, self._piles.capacity, self._pile_type)
+        self.player_decks = [self._hand_type(player_deck) for player_deck in snapshot.player_decks]
+        self.current_turn = snapshot.current_turn
+        self.direction = snapshot.direction
+        self.color_selection = snapshot.color_selection
+        self.accumulated_draw_count = snapshot.accumulated_draw_count
+        if self._undo_log is not None:
+            self._undo_log.clear()
+
+    def enable_undo(self, enabled: bool = True):
+        """
+        :param enabled: if True, every following step is recorded so it can be reverted by undo.
+        """
+        self._undo_log = [] if enabled else None
+        self._undo_operations = None
+
+    def undo(self):
+        """
+        reverts the last recorded step, only the changed state is touched.
+        :raises IndexError: raised when no recorded step is left.
+        """
+        if not self._undo_log:
+            raise IndexError('no recorded step to undo')
+        self._version += 1
+        (current_turn, direction, color_selection, accumulated_draw_count), operations = self._undo_log.pop()
+
+        for operation, *arguments in reversed(operations):
+            if operation == _DRAW:
+                self._piles.put_back(self.player_decks[arguments[0]].pop())
+            elif operation == _PLAY:
+                self.player_decks[current_turn].insert(*arguments)
+            elif operation == _ROTATE_DECKS:
+                self._rotate_player_decks(Directions(-arguments[0].value))
+            elif operation == _SWAP_DECKS:
+                self._swap_player_decks(*arguments)
+            elif operation == _DISCARD:
+                self._piles.take_back()
+            elif operation == _RESHUFFLE:
+                self._piles.unreshuffle(arguments[0])
+
+        self.current_turn = current_turn
+        self.direction = direction
+        self.color_selection = color_selection
+        self.accumulated_draw_count = accumulated_draw_count
+
+    def _begin_step(self):
+        """
+        called before a step modifies the game.
+        """
+        self._version += 1
+        if self._undo_log is None:
+            self._undo_operations = None
+        else:
+            self._undo_operations = []
+            self._undo_log.append(((self.current_turn, self.direction, self.color_selection,
+                                    self.accumulated_draw_count), self._undo_operations))
+
+    def add_observer(self, observer: events.Observer):
+        """
+        observer is called with every event emitted by step, see oneEngine.events. clones and determinizations
+        do not inherit observers.
+        """
+        self._observers.append(observer)
+        self._update_observer()
+
+    def remove_observer(self, observer: events.Observer):
+        """
+        :raises ValueError: raised when observer has not been added.
+        """
+        self._observers.remove(observer)
+        self._update_observer()
+
+    def _update_observer(self):
+        observers = tuple(self._observers)
+        if len(observers) > 1:
+            def emit(event: events.Event):
+                for observer in observers:
+                    observer(event)
+            self._observer = emit
+        else:
+            self._observer = observers[0] if observers else None
+
+    def _reshuffle(self):
+        """
+        shuffles the open deck except its top card into the empty closed deck.
+        """
+        if self._piles.open_count < 2:
+            return
+        if self._undo_operations is not None:
+            self._undo_operations.append((_RESHUFFLE, tuple(self.open_deck)[:-1]))
+        moved_count = self._piles.reshuffle(self.rng)
+        if self._observer is not None:
+            self._observer(events.Reshuffled(moved_count))
+
+    def _draw(self, player_index: int) -> bool:
+        """
+        reshuffles first if the closed deck is empty, nothing is drawn if every other card is held by the players.
+        :return: True if a card was drawn.
+        """
+        if not self._piles.closed_count:
+            self._reshuffle()
+            if not self._piles.closed_count:
+                return False
+        card = self._piles.draw()
+        self.player_decks[player_index].append(card)
+        if self._undo_operations is not None:
+            self._undo_operations.append((_DRAW, player_index))
+        if self._observer is not None:
+            self._observer(events.CardDrawn(player_index, card))
+        return True
+
+    def _rotate_player_decks(self, direction: Directions):
+        if direction is Directions.CLOCKWISE:
+            self.player_decks.insert(0, self.player_decks.pop())
+        else:
+            begin = self.player_decks[0]
+            del self.player_decks[0]
+            self.player_decks.append(begin)
+
+    def _swap_player_decks(self, player_index: int, other_player_index: int):
+        self.player_decks[player_index], self.player_decks[other_player_index] \
+            = self.player_decks[other_player_index], self.player_decks[player_index]
 
     def _raise_step_exception(self, message: str, played_card_index: int, played_card: Card):
         self.current_player_deck.insert(played_card_index, played_card)  # inserts removed card again
+        if self._undo_log is not None:
+            self._undo_log.pop()
         raise ValueError(message)
 
     def step(self, played_card_index: int | None, color_selection: Color | None = None,
@@ -78,48 +465,71 @@ class Game:
         :raises GameStop: raised when game stopped (i.e. no one has at least one card).
         :return: True if move is allowed.
         """
+        observer = self._observer
+        if observer is None:
+            return self._step(played_card_index, color_selection, swap_player_selection, add_4_challenged)
+
+        player = self.current_turn
+        observer(events.StepStarted(player, played_card_index, color_selection, swap_player_selection,
+                                    add_4_challenged))
+        try:
+            allowed = self._step(played_card_index, color_selection, swap_player_selection, add_4_challenged)
+        except GameStop:
+            observer(events.StepEnded(player, True, True))
+            raise
+        except ValueError:
+            observer(events.StepEnded(player, False, False))
+            raise
+        observer(events.StepEnded(player, allowed, False))
+        return allowed
+
+    def _step(self, played_card_index: int | None, color_selection: Color | None, swap_player_selection: int | None,
+              add_4_challenged: bool) -> bool:
+        playable_mask = self.open_card.playable_mask(self.rules, self.color_selection)
+
         if played_card_index is None:  # draw is attempted
-            if self.rules.mandatory_playing and self.open_card.filter_playable_cards(self.current_player_deck,
-                                                                                     self.rules, self.color_selection):
+            if self.rules.mandatory_playing and _holds_playable(self.current_player_deck, playable_mask):
                 return False
 
             if self.accumulated_draw_count != 0:  # if the player has a playable add2 or add4, they are not allowed to draw anyway.
                 return False
 
-            self._draw(self.current_turn)
-
-            if not self.closed_deck:  # reshuffles when closed deck is empty
-                shuffle(self.open_deck)
-                self.closed_deck = self.open_deck.copy()
-                self.open_deck = deque()
-
-            if not self.rules.draw_until_play:
+            self._begin_step()
+            # the turn passes if nothing is left to draw, even if the player could draw until playing
+            if not self._draw(self.current_turn) or not self.rules.draw_until_play:
                 self.current_turn = self.step_index(self.current_turn, self.direction.value)
             return True
 
         played_card = self.current_player_deck[played_card_index]
 
-        if not self.open_card.other_is_playable(played_card, self.rules, self.color_selection):
+        if not playable_mask >> played_card.id & 1:
             return False
 
+        self._begin_step()
         del self.current_player_deck[played_card_index]
+        if self._undo_operations is not None:
+            self._undo_operations.append((_PLAY, played_card_index, played_card))
+        if self._observer is not None:
+            self._observer(events.CardPlayed(self.current_turn, played_card, played_card_index))
 
         match played_card.card_type:
             case CardType.NUMBER_0 if self.rules.zero_passes_on:
-                if self.direction is Directions.CLOCKWISE:
-                    self.player_decks.insert(0, self.player_decks.pop())
-                else:
-                    begin = self.player_decks[0]
-                    del self.player_decks[0]
-                    self.player_decks.append(begin)
+                self._rotate_player_decks(self.direction)
+                if self._undo_operations is not None:
+                    self._undo_operations.append((_ROTATE_DECKS, self.direction))
+                if self._observer is not None:
+                    self._observer(events.DecksRotated(self.direction))
 
             case CardType.NUMBER_7 if self.rules.seven_swaps:
                 if swap_player_selection == self.current_turn or swap_player_selection is None:
                     self._raise_step_exception('swap player must be someone else', played_card_index, played_card)
                     return False
 
-                self.player_decks[self.current_turn], self.player_decks[swap_player_selection] \
-                    = self.player_decks[swap_player_selection], self.player_decks[self.current_turn]
+                self._swap_player_decks(self.current_turn, swap_player_selection)
+                if self._undo_operations is not None:
+                    self._undo_operations.append((_SWAP_DECKS, self.current_turn, swap_player_selection))
+                if self._observer is not None:
+                    self._observer(events.DecksSwapped(self.current_turn, swap_player_selection))
 
             case CardType.BLOCK:
                 self.current_turn = self.step_index(self.current_turn, self.direction.value)
@@ -142,18 +552,23 @@ class Game:
                     return False
                 self.color_selection = color_selection
 
-                if (add_4_challenged and self.rules.add_4_challengeable and self.open_card.filter_playable_cards(
-                        self.current_player_deck, self.rules,
-                        self.color_selection
+                if (add_4_challenged and self.rules.add_4_challengeable and _holds_playable(
+                        self.current_player_deck, self.open_card.playable_mask(self.rules, self.color_selection)
                 )):  # player could have played different cards
+                    if self._observer is not None:
+                        self._observer(events.Add4Challenged(self.current_turn, True))
                     for _ in range(4):
                         self._draw(self.current_turn)
                 elif add_4_challenged and self.rules.add_4_challengeable:
+                    if self._observer is not None:
+                        self._observer(events.Add4Challenged(self.current_turn, False))
                     self.accumulated_draw_count += 6  # challenge failed
                 else:
                     self.accumulated_draw_count += 4
 
         if played_card.card_type is not CardType.ADD2 and played_card.card_type is not CardType.ADD4:  # if the player for some reason decides not to lay an add2 or add4 despite being attacked, they have to draw
+            if self.accumulated_draw_count and self._observer is not None:
+                self._observer(events.DrawPenalty(self.current_turn, self.accumulated_draw_count))
             for _ in range(self.accumulated_draw_count):
                 self._draw(self.current_turn)
             self.accumulated_draw_count = 0
@@ -164,9 +579,13 @@ class Game:
             raise GameStop()
 
         while not self.current_player_deck:  # skips players with no cards.
+            if self._observer is not None:
+                self._observer(events.PlayerSkipped(self.current_turn))
             self.current_turn = self.step_index(self.current_turn, self.direction.value)
 
-        self.open_deck.append(played_card)
+        self._piles.discard(played_card)
+        if self._undo_operations is not None:
+            self._undo_operations.append((_DISCARD,))
 
         if not any(self.player_decks):
             raise GameStop()
@@ -175,10 +594,11 @@ class Game:
             self.color_selection = None
 
         # lets next player draw cards if some have been stacked and the player has no playable add2 or add4
-        playable_add_cards = filter(lambda card: card.card_type is CardType.ADD2 or card.card_type is CardType.ADD4,
-                                    self.open_card.filter_playable_cards(self.current_player_deck, self.rules,
-                                                                         self.color_selection))
-        if not list(playable_add_cards):
+        if self.accumulated_draw_count and not _holds_playable(
+                self.current_player_deck,
+                self.open_card.playable_mask(self.rules, self.color_selection) & ADD_CARDS_MASK):
+            if self._observer is not None:
+                self._observer(events.DrawPenalty(self.current_turn, self.accumulated_draw_count))
             for _ in range(self.accumulated_draw_count):
                 self._draw(self.current_turn)
             self.accumulated_draw_count = 0
@@ -0,0 +1,236 @@
+import random
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, MutableSequence, Sequence
+from typing import overload
+
+from oneEngine.card import Card
+
+_FILLER = Card.from_id(0)  # occupies free slots of the ring
+
+
+class Piles:
+    """
+    closed and open deck stored in one ring of fixed capacity, so drawing, discarding and reshuffling never
+    reallocate. Going around the ring from start: the closed deck (its top card at start), the open deck (its top
+    card last), then free slots for the cards held by the players. The ring grows if it is full.
+    """
+    __slots__ = ('ring', 'start', 'closed_count', 'open_count', 'closed_deck', 'open_deck')
+
+    def __init__(self, closed_deck: Iterable[Card] = (), open_deck: Iterable[Card] = (), capacity: int = 0,
+                 storage: Callable[[list[Card]], MutableSequence[Card]] = list):
+        """
+        :param closed_deck: cards of the closed deck, top card last.
+        :param open_deck: cards of the open deck, top card last.
+        :param capacity: number of cards the ring holds before growing, e.g. the size of the deck.
+        :param storage: type of the ring, e.g. list or CardArray.
+        """
+        self.closed_deck = PileView(self, True)
+        self.open_deck = PileView(self, False)
+        self._reset(list(closed_deck), list(open_deck), capacity, storage)
+
+    def _reset(self, closed_deck: list[Card], open_deck: list[Card], capacity: int,
+               storage: Callable[[list[Card]], MutableSequence[Card]]):
+        cards = closed_deck[::-1] + open_deck
+        self.ring: MutableSequence[Card] = storage(cards + [_FILLER] * (max(capacity, len(cards), 1) - len(cards)))
+        self.start = 0
+        self.closed_count = len(closed_deck)
+        self.open_count = len(open_deck)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.ring)
+
+    def copy(self) -> 'Piles':
+        piles = Piles.__new__(Piles)
+        piles.ring = self.ring.copy()  # type: ignore[attr-defined]
+        piles.start = self.start
+        piles.closed_count = self.closed_count
+        piles.open_count = self.open_count
+        piles.closed_deck = PileView(piles, True)
+        piles.open_deck = PileView(piles, False)
+        return piles
+
+    def _grow(self):
+        self._reset(list(self.closed_deck), list(self.open_deck), 2 * len(self.ring), type(self.ring))
+
+    def draw(self) -> Card:
+        """
+        :raises IndexError: raised when the closed deck is empty.
+        :return: top card of the closed deck, which is removed.
+        """
+        if not self.closed_count:
+            raise IndexError('closed deck is empty')
+        card = self.ring[self.start]
+        self.start = (self.start + 1) % len(self.ring)
+        self.closed_count -= 1
+        return card
+
+    def put_back(self, card: Card):
+        """
+        puts card on top of the closed deck, reverting draw.
+        """
+        if self.closed_count + self.open_count == len(self.ring):
+            self._grow()
+        self.start = (self.start - 1) % len(self.ring)
+        self.ring[self.start] = card
+        self.closed_count += 1
+
+    def discard(self, card: Card):
+        """
+        puts card on top of the open deck.
+        """
+        if self.closed_count + self.open_count == len(self.ring):
+            self._grow()
+        self.ring[(self.start + self.closed_count + self.open_count) % len(self.ring)] = card
+        self.open_count += 1
+
+    def take_back(self) -> Card:
+        """
+        reverts discard.
+        :raises IndexError: raised when the open deck is empty.
+        :return: top card of the open deck, which is removed.
+        """
+        card = self.top()
+        self.open_count -= 1
+        return card
+
+    def top(self) -> Card:
+        """
+        :raises IndexError: raised when the open deck is empty.
+        :return: top card of the open deck.
+        """
+        if not self.open_count:
+            raise IndexError('open deck is empty')
+        return self.ring[(self.start + self.closed_count + self.open_count - 1) % len(self.ring)]
+
+    def reshuffle(self, rng: random.Random | None) -> int:
+        """
+        moves the open deck except its top card below the closed deck and shuffles the closed deck in place.
+        :param rng: generator used for shuffling, the module level generator if None.
+        :return: number of moved cards.
+        """
+        moved_count = max(self.open_count - 1, 0)
+        if moved_count:
+            self.closed_count += moved_count
+            self.open_count = 1
+            (random.shuffle if rng is None else rng.shuffle)(self.closed_deck)
+        return moved_count
+
+    def unreshuffle(self, moved_cards: Sequence[Card]):
+        """
+        reverts reshuffle with an empty closed deck.
+        :param moved_cards: open deck without its top card before reshuffling.
+        """
+        assert self.closed_count == len(moved_cards)
+        self.closed_count = 0
+        self.open_count += len(moved_cards)
+        for index, card in enumerate(moved_cards):
+            self.ring[(self.start + index) % len(self.ring)] = card
+
+
+class PileView(MutableSequence[Card]):
+    """
+    live view of the closed or open deck of Piles, the top card is last. Appending and popping the top card are
+    done in place, other modifications rebuild the ring.
+    """
+    __slots__ = ('_piles', '_closed')
+
+    def __init__(self, piles: Piles, closed: bool):
+        self._piles = piles
+        self._closed = closed
+
+    def __len__(self) -> int:
+        return self._piles.closed_count if self._closed else self._piles.open_count
+
+    def _ring_index(self, index: int) -> int:
+        piles = self._piles
+        length = piles.closed_count if self._closed else piles.open_count
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('pile index out of range')
+        if self._closed:
+            return (piles.start + piles.closed_count - 1 - index) % len(piles.ring)
+        return (piles.start + piles.closed_count + index) % len(piles.ring)
+
+    @overload
+    def __getitem__(self, index: int) -> Card: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Card]: ...
+
+    def __getitem__(self, index: int | slice) -> 'Card | list[Card]':
+        if isinstance(index, slice):
+            return list(self)[index]
+        return self._piles.ring[self._ring_index(index)]
+
+    def _replace(self, cards: list[Card]):
+        piles = self._piles
+        closed_deck = cards if self._closed else list(piles.closed_deck)
+        open_deck = list(piles.open_deck) if self._closed else cards
+        piles._reset(closed_deck, open_deck, len(piles.ring), type(piles.ring))
+
+    @overload
+    def __setitem__(self, index: int, value: Card) -> None: ...
+
+    @overload
+    def __setitem__(self, index: slice, value: Iterable[Card]) -> None: ...
+
+    def __setitem__(self, index: int | slice, value: Card | Iterable[Card]) -> None:
+        if isinstance(index, slice):
+            assert not isinstance(value, Card)
+            cards = list(self)
+            cards[index] = value
+            self._replace(cards)
+        else:
+            assert isinstance(value, Card)
+            self._piles.ring[self._ring_index(index)] = value
+
+    def __delitem__(self, index: int | slice) -> None:
+        if isinstance(index, int) and index in (-1, len(self) - 1):
+            self.pop()
+            return
+        cards = list(self)
+        del cards[index]
+        self._replace(cards)
+
+    def __iter__(self) -> Iterator[Card]:
+        piles = self._piles
+        ring = piles.ring
+        ring_length = len(ring)
+        if self._closed:
+            top = piles.start + piles.closed_count - 1
+            return (ring[(top - index) % ring_length] for index in range(piles.closed_count))
+        bottom = piles.start + piles.closed_count
+        return (ring[(bottom + index) % ring_length] for index in range(piles.open_count))
+
+    def insert(self, index: int, value: Card) -> None:
+        if index >= len(self):
+            self.append(value)
+            return
+        cards = list(self)
+        cards.insert(index, value)
+        self._replace(cards)
+
+    def append(self, value: Card) -> None:
+        if self._closed:
+            self._piles.put_back(value)
+        else:
+            self._piles.discard(value)
+
+    def pop(self, index: int = -1) -> Card:
+        if index in (-1, len(self) - 1):
+            return self._piles.draw() if self._closed else self._piles.take_back()
+        card = self[index]
+        del self[index]
+        return card
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence | deque):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self):
+        return f'PileView({list(self)!r})'
@@ -0,0 +1,252 @@
+import mmap
+import random
+import struct
+from collections.abc import Iterator, MutableSequence
+from types import TracebackType
+from typing import BinaryIO, NamedTuple
+
+from oneEngine import events
+from oneEngine.card import Card
+from oneEngine.enums import CardType, Color
+from oneEngine.game import Action, Game, GameStop
+from oneEngine.rules import Rules
+
+# file layout: MAGIC, then one game after another:
+#   _GAME_HEADER (size of the game in bytes without the size field, player count, player card count, rule flags,
+#   seed, deck length), the deck as card ids (empty for the standard deck), then the entries of the game.
+# entries are 16 bit words, see _pack_action. a word with _RESHUFFLE_BIT set is followed by the new closed deck
+# as (word & ~_RESHUFFLE_BIT) card ids.
+MAGIC = b'oneR\x01'
+_GAME_HEADER = struct.Struct('<IBBBQH')
+_WORD = struct.Struct('<H')
+_RULE_FLAGS = ('black_on_black', 'zero_passes_on', 'seven_swaps', 'add_2_stackable', 'add_4_challengeable',
+               'draw_until_play', 'mandatory_playing')
+
+_DRAW_INDEX = 0x7f
+_NO_COLOR = 0x7
+_NO_SWAP = 0xf
+_RESHUFFLE_BIT = 0x8000
+
+
+def _pack_action(action: Action) -> int:
+    """
+    bits 0-6: played card index (_DRAW_INDEX for draws), 7-9: color, 10-13: swap player, 14: challenge.
+    """
+    if not 0 <= (action.played_card_index or 0) < _DRAW_INDEX or not 0 <= (action.swap_player_selection or 0) < _NO_SWAP:
+        raise ValueError(f'{action} cannot be recorded')
+    index = _DRAW_INDEX if action.played_card_index is None else action.played_card_index
+    color = _NO_COLOR if action.color_selection is None else action.color_selection.value
+    swap = _NO_SWAP if action.swap_player_selection is None else action.swap_player_selection
+    return index | color << 7 | swap << 10 | action.add_4_challenged << 14
+
+
+def _unpack_action(word: int) -> Action:
+    index, color, swap = word & 0x7f, word >> 7 & 0x7, word >> 10 & 0xf
+    return Action(None if index == _DRAW_INDEX else index, None if color == _NO_COLOR else Color(color),
+                  None if swap == _NO_SWAP else swap, bool(word >> 14 & 1))
+
+
+class GameRecord(NamedTuple):
+    player_count: int
+    rules: Rules
+    seed: int  # seed of Game.rng
+    deck: bytes  # card ids of the deck passed to Game, empty for the standard deck
+    entries: bytes  # see MAGIC
+
+    def _decode(self) -> Iterator[Action | bytes]:
+        offset = 0
+        while offset < len(self.entries):
+            word, = _WORD.unpack_from(self.entries, offset)
+            offset += _WORD.size
+            if word & _RESHUFFLE_BIT:
+                card_count = word & ~_RESHUFFLE_BIT
+                yield self.entries[offset:offset + card_count]
+                offset += card_count
+            else:
+                yield _unpack_action(word)
+
+    def actions(self) -> list[Action]:
+        """
+        :return: allowed steps of the game in order.
+        """
+        return [entry for entry in self._decode() if isinstance(entry, Action)]
+
+    def reshuffled_decks(self) -> list[bytes]:
+        """
+        :return: card ids of the closed deck after every reshuffle.
+        """
+        return [entry for entry in self._decode() if isinstance(entry, bytes)]
+
+    def to_bytes(self) -> bytes:
+        flags = sum(getattr(self.rules, flag) << bit for bit, flag in enumerate(_RULE_FLAGS))
+        try:
+            header = _GAME_HEADER.pack(_GAME_HEADER.size - 4 + len(self.deck) + len(self.entries), self.player_count,
+                                       self.rules.player_card_count, flags, self.seed, len(self.deck))
+        except struct.error as error:
+            raise ValueError(f'game cannot be recorded: {error}') from None
+        return header + self.deck + self.entries
+
+
+class _ReplayRandom(random.Random):
+    """
+    generator of replayed games, returning the recorded reshuffles instead of shuffling. reshuffles depend on
+    every random decision taken from Game.rng, e.g. by agents, so they are recorded instead of the generator state.
+    """
+
+    def __init__(self, reshuffled_decks: list[bytes]):
+        super().__init__()
+        self._reshuffled_decks = iter(reshuffled_decks)
+
+    def shuffle(self, x: MutableSequence[Card]) -> None:  # type: ignore[override]
+        card_ids = next(self._reshuffled_decks, None)
+        if card_ids is None or sorted(card_ids) != sorted(card.id for card in x):
+            raise ValueError('reshuffle does not match the record')
+        for index, card_id in enumerate(card_ids):  # in place, x may be a view of the piles
+            x[index] = Card.from_id(card_id)
+
+
+def replay(record: GameRecord, compact: bool = False) -> Game:
+    """
+    see Game.replay.
+    """
+    deck = [Card.from_id(card_id) for card_id in record.deck] if record.deck else None
+    game = Game(record.player_count, record.rules, deck, compact, record.seed)
+    game.rng = _ReplayRandom(record.reshuffled_decks())
+    actions = record.actions()
+    for step_index, action in enumerate(actions):
+        try:
+            allowed = game.step(*action)
+        except GameStop:
+            if step_index != len(actions) - 1:
+                raise ValueError('game stopped before the end of the record') from None
+            allowed = True
+        if not allowed:
+            raise ValueError(f'recorded step {action} is not allowed')
+    game.rng = random.Random(record.seed)  # further reshuffles are not recorded
+    return game
+
+
+class _GameRecorder:
+    def __init__(self, writer: 'GameRecordWriter', game: Game, header: GameRecord):
+        self.writer = writer
+        self.game = game
+        self.header = header
+        self.entries = bytearray()
+        self.step_started = events.StepStarted(game.current_turn, None, None, None, False)
+        self.action = Action(None)
+
+    def __call__(self, event: events.Event):
+        if isinstance(event, events.StepStarted):
+            self.step_started = event
+            self.action = Action(None)
+        elif isinstance(event, events.CardPlayed):  # only the arguments used by the step are recorded
+            card_type = event.card.card_type
+            step_started = self.step_started
+            self.action = Action(
+                event.played_card_index,
+                step_started.color_selection if event.card.color is Color.BLACK else None,
+                step_started.swap_player_selection
+                if card_type is CardType.NUMBER_7 and self.game.rules.seven_swaps else None,
+                step_started.add_4_challenged and card_type is CardType.ADD4)
+        elif isinstance(event, events.Reshuffled):
+            self.entries += _WORD.pack(_RESHUFFLE_BIT | len(self.game.closed_deck))
+            self.entries += bytes(card.id for card in self.game.closed_deck)
+        elif isinstance(event, events.StepEnded):
+            if event.allowed:
+                self.entries += _WORD.pack(_pack_action(self.action))
+            if event.stopped:
+                self.writer.finish(self.game)
+
+
+class GameRecordWriter:
+    """
+    writes games to a binary file while they are played. Games are buffered in memory until they are finished.
+    """
+
+    def __init__(self, file: BinaryIO):
+        """
+        :param file: binary file opened for writing, it is not closed by the writer.
+        """
+        self.file = file
+        self.file.write(MAGIC)
+        self._recorders: dict[Game, _GameRecorder] = {}
+
+    def record(self, player_count: int, rules: Rules, seed: int, deck: list[Card] | None = None,
+               compact: bool = False) -> Game:
+        """
+        creates a game recording every allowed step. The game is written when it stops or finish is called.
+        :param seed: seed of Game.rng, an integer in range(2 ** 64).
+        :param deck: see Game.
+        :param compact: see Game.
+        :return: recorded game.
+        """
+        if not 0 <= seed < 1 << 64:
+            raise ValueError('seed must be in range(2 ** 64)')
+        game = Game(player_count, rules, deck, compact, seed)
+        header = GameRecord(player_count, rules, seed, b'' if deck is None else bytes(card.id for card in deck), b'')
+        recorder = _GameRecorder(self, game, header)
+        game.add_observer(recorder)
+        self._recorders[game] = recorder
+        return game
+
+    def finish(self, game: Game):
+        """
+        stops recording game and writes it, called automatically when the game stops.
+        """
+        recorder = self._recorders.pop(game)
+        game.remove_observer(recorder)
+        self.file.write(recorder.header._replace(entries=bytes(recorder.entries)).to_bytes())
+
+    def close(self):
+        """
+        finishes every game still being recorded.
+        """
+        for game in list(self._recorders):
+            self.finish(game)
+
+    def __enter__(self) -> 'GameRecordWriter':
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None,
+                 traceback: TracebackType | None):
+        self.close()
+
+
+class GameRecordReader:
+    """
+    iterates over the games of a file written by GameRecordWriter. The file is memory mapped, only the game
+    currently decoded is copied into memory.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f'{path} is not a game record file')
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        offset = len(MAGIC)
+        while offset < len(self._map):
+            if offset + _GAME_HEADER.size > len(self._map):
+                raise ValueError('game record is truncated')
+            size, player_count, player_card_count, flags, seed, deck_length = _GAME_HEADER.unpack_from(
+                self._map, offset)
+            end = offset + 4 + size
+            if end > len(self._map):
+                raise ValueError('game record is truncated')
+            rules = Rules(player_card_count, **{flag: bool(flags >> bit & 1) for bit, flag in enumerate(_RULE_FLAGS)})
+            deck_offset = offset + _GAME_HEADER.size
+            yield GameRecord(player_count, rules, seed, self._map[deck_offset:deck_offset + deck_length],
+                             self._map[deck_offset + deck_length:end])
+            offset = end
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self) -> 'GameRecordReader':
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None,
+                 traceback: TracebackType | None):
+        self.close()
@@ -0,0 +1,225 @@
+import asyncio
+from collections.abc import Callable
+from typing import NamedTuple
+
+from oneEngine import events
+from oneEngine.card import Card
+from oneEngine.game import Action, Game, GameStop
+from oneEngine.rules import Rules
+
+
+class TurnTimedOut(NamedTuple):
+    """
+    player did not act within the turn timeout, the following events are the automatic move.
+    """
+    player: int
+
+
+class ActionRejected(NamedTuple):
+    """
+    only sent to the player who submitted action.
+    """
+    player: int
+    action: Action
+    reason: str
+
+
+class Update(NamedTuple):
+    """
+    delta sent to a single player after every move. Drawn cards of other players are hidden (CardDrawn.card is None).
+    """
+    table_id: int
+    events: tuple[events.Event | TurnTimedOut | ActionRejected, ...]
+    current_turn: int
+    hand: tuple[Card, ...] | None  # complete hand after the update, only sent on joining and when hands moved
+
+
+# receives updates, must not block, e.g. by putting them into the outgoing queue of a connection.
+Client = Callable[[Update], None]
+
+
+class Table:
+    __slots__ = ('table_id', 'game', 'clients', 'finished', '_queued', '_events', '_timer')
+
+    def __init__(self, table_id: int, game: Game):
+        self.table_id = table_id
+        self.game = game
+        self.clients: list[Client | None] = [None] * len(game.player_decks)
+        self.finished = False
+        self._queued: list[tuple[int, Action]] = []  # actions of all players in submission order
+        self._events: list[events.Event] = []
+        self._timer: asyncio.TimerHandle | None = None
+        game.add_observer(self._events.append)
+
+
+class TableManager:
+    """
+    runs many tables in a single event loop. Moves are applied as soon as they are submitted, so tables do not hold
+    tasks or locks while players think; the only per-table resource besides the game is an optional turn timer.
+    Must be used from the thread running the event loop.
+    """
+
+    def __init__(self, turn_timeout: float | None = 30.0, compact: bool = True):
+        """
+        :param turn_timeout: seconds after which the current player draws a card automatically, or plays the first legal
+            move if drawing is not allowed. The turn ends either way. None to wait forever.
+        :param compact: see Game.
+        """
+        self.turn_timeout = turn_timeout
+        self.compact = compact
+        self.tables: dict[int, Table] = {}
+        self._next_table_id = 0
+
+    def create_table(self, player_count: int, rules: Rules, seed: int | None = None) -> int:
+        """
+        the turn timer starts when every seat is taken.
+        :param seed: seed of Game.rng. Tables without a seed share the module level generator, which saves about
+            2.5 kB per table.
+        :return: table id.
+        """
+        table_id = self._next_table_id
+        self._next_table_id += 1
+        self.tables[table_id] = Table(table_id, Game(player_count, rules, compact=self.compact, rng=seed))
+        return table_id
+
+    def close_table(self, table_id: int):
+        table = self.tables.pop(table_id)
+        if table._timer is not None:
+            table._timer.cancel()
+
+    def join(self, table_id: int, player: int, client: Client):
+        """
+        seats client at table, replacing a previous client of player. client receives the hand of player at once.
+        """
+        table = self.tables[table_id]
+        table.clients[player] = client
+        client(Update(table_id, (), table.game.current_turn, tuple(table.game.player_decks[player])))
+        self._restart_timer(table)
+
+    def leave(self, table_id: int, player: int):
+        """
+        the turn timer stops until the seat is taken again.
+        """
+        table = self.tables[table_id]
+        table.clients[player] = None
+        self._restart_timer(table)
+
+    def submit(self, table_id: int, player: int, action: Action):
+        """
+        queues action of player, it is applied when it is the turn of player. Actions that are not allowed at that
+        time are rejected with an ActionRejected update.
+        """
+        table = self.tables[table_id]
+        table._queued.append((player, action))
+        self._process(table)
+
+    def _process(self, table: Table):
+        current_turn = table.game.current_turn
+        while not table.finished:
+            for index, (player, action) in enumerate(table._queued):
+                if player == table.game.current_turn:
+                    del table._queued[index]
+                    self._step(table, player, action)
+                    break
+            else:
+                break
+
+        if table.game.current_turn != current_turn or table._timer is None:
+            self._restart_timer(table)
+
+    def _step(self, table: Table, player: int, action: Action, timed_out: bool = False):
+        reason = ''
+        try:
+            allowed = table.game.step(*action)
+        except GameStop:
+            allowed = True
+            table.finished = True
+            table._queued.clear()
+        except ValueError as error:
+            allowed = False
+            reason = str(error)
+
+        step_events: list[events.Event | TurnTimedOut | ActionRejected] = [TurnTimedOut(player)] if timed_out else []
+        step_events += table._events
+        table._events.clear()
+
+        if allowed:
+            self._broadcast(table, tuple(step_events))
+        elif (client := table.clients[player]) is not None:
+            client(Update(table.table_id, (ActionRejected(player, action, reason or 'move is not allowed'),),
+                          table.game.current_turn, None))
+
+    def _broadcast(self, table: Table, step_events: tuple[events.Event | TurnTimedOut | ActionRejected, ...]):
+        hands_moved = any(isinstance(event, events.DecksRotated | events.DecksSwapped) for event in step_events)
+
+        for player, client in enumerate(table.clients):
+            if client is None:
+                continue
+            client(Update(
+                table.table_id,
+                tuple(event._replace(card=None) if isinstance(event, events.CardDrawn) and event.player != player
+                      else event for event in step_events),
+                table.game.current_turn,
+                tuple(table.game.player_decks[player]) if hands_moved else None
+            ))
+
+    def _restart_timer(self, table: Table):
+        if table._timer is not None:
+            table._timer.cancel()
+            table._timer = None
+        if self.turn_timeout is not None and not table.finished and None not in table.clients:
+            table._timer = asyncio.get_running_loop().call_later(self.turn_timeout, self._time_out, table)
+
+    def _time_out(self, table: Table):
+        table._timer = None
+        game = table.game
+        player = game.current_turn
+        legal_actions = game.legal_actions()
+        # drawing is not allowed with mandatory playing or stacked draw cards, then the first legal move is played
+        action = Action(None) if Action(None) in legal_actions else legal_actions[0]
+        self._step(table, player, action, timed_out=True)
+
+        # with draw_until_play drawing does not end the turn, cards are drawn until one can be played. Game passes
+        # the turn if nothing is left to draw.
+        while action.played_card_index is None and not table.finished and game.current_turn == player:
+            legal_actions = game.legal_actions()
+            action = next((legal_action for legal_action in legal_actions if legal_action.played_card_index is not None),
+                          legal_actions[0])
+            self._step(table, player, action)
+        self._process(table)  # restarts the timer
+
+
+class LocalClient:
+    """
+    in-process client, e.g. for tests. It keeps track of its hand using the updates.
+    """
+
+    def __init__(self, manager: TableManager, table_id: int, player: int):
+        self.manager = manager
+        self.table_id = table_id
+        self.player = player
+        self.hand: list[Card] = []
+        self.current_turn = 0
+        self.updates: asyncio.Queue[Update] = asyncio.Queue()
+        manager.join(table_id, player, self.updates.put_nowait)
+
+    def submit(self, action: Action):
+        self.manager.submit(self.table_id, self.player, action)
+
+    async def receive(self) -> Update:
+        """
+        :return: next update, after applying it to hand and current_turn.
+        """
+        update = await self.updates.get()
+        self.current_turn = update.current_turn
+        if update.hand is not None:
+            self.hand = list(update.hand)
+            return update
+
+        for event in update.events:
+            if isinstance(event, events.CardPlayed) and event.player == self.player:
+                del self.hand[event.played_card_index]
+            elif isinstance(event, events.CardDrawn) and event.player == self.player:
+                assert event.card is not None
+                self.hand.append(event.card)
+        return update
@@ -0,0 +1,297 @@
+import random
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any, NamedTuple
+
+from oneEngine import events
+from oneEngine.card import CARD_ID_COUNT, NO_COLOR_SELECTION, Card
+from oneEngine.enums import CardType, Directions
+from oneEngine.game import Action, Game, GameStop
+
+_MASK = (1 << 64) - 1
+_MIX = 0x9e3779b97f4a7c15  # odd multiplier spreading the hand hashes of the players
+_LOSS, _UNKNOWN, _WIN = -1, 0, 1  # values of positions for the solving player
+_PROVEN_DEPTH = 1 << 30  # depth of decided positions in the transposition table, they are decided at any depth
+_EXACT, _LOWER, _UPPER = range(3)  # bounds of values in the transposition table
+
+
+class _KeepOrder(random.Random):
+    """
+    generator of the searched game, reshuffles keep the order of the open deck so the search is deterministic.
+    """
+
+    def shuffle(self, x) -> None:  # type: ignore[no-untyped-def]
+        pass
+
+
+class _Timeout(Exception):
+    pass
+
+
+def _card_action(hand: Sequence[Card], action: Action | None) -> Action | None:
+    """
+    :return: action with the id of the played card instead of its index, hands are hashed as multisets.
+    """
+    if action is None or action.played_card_index is None:
+        return action
+    return action._replace(played_card_index=hand[action.played_card_index].id)
+
+
+def _index_action(hand: Sequence[Card], action: Action | None) -> Action | None:
+    """
+    :return: inverse of _card_action, None if hand does not hold the card.
+    """
+    if action is None or action.played_card_index is None:
+        return action
+    try:
+        return action._replace(played_card_index=hand.index(Card.from_id(action.played_card_index)))
+    except ValueError:
+        return None
+
+
+class Solution(NamedTuple):
+    action: Action  # best action of the current player
+    value: int  # 1 if the current player wins against every play of the others, -1 if it loses, 0 if unknown
+    depth: int  # depth of the last completed iteration, the game is decided within it if value is not 0
+    node_count: int
+
+
+class EndgameSolver:
+    """
+    searches the best action of the current player of a game by iterative deepening alpha-beta search over
+    Game.step and Game.undo. The current player wins if it runs out of cards first, the other players play
+    together against it. The next player decides whether an ADD4 is challenged.
+    The order of the closed deck is treated as known, solve a determinization (see Game.determinize) if it is not.
+    Positions are identified by a Zobrist hash, see hash, and kept in a transposition table whose least recently used
+    entries are dropped first. The hash is updated from the events of every step instead of being recomputed.
+    A node costs about 50 µs, so endgames of 2 or 3 players with up to about 5 cards in total are solved within
+    milliseconds. Larger ones, e.g. 2 players with 5 cards each, are usually not decided within seconds, use
+    time_limit to get the best action of the last completed iteration.
+    """
+
+    def __init__(self, table_size: int = 1 << 16, max_depth: int = 64, seed: int = 0):
+        """
+        :param table_size: maximum number of positions in the transposition table.
+        :param max_depth: maximum number of steps searched.
+        :param seed: seed of the Zobrist keys.
+        """
+        self.table_size = table_size
+        self.max_depth = max_depth
+        self._keys = random.Random(seed)
+        self._card_keys = [self._keys.getrandbits(64) for _ in range(CARD_ID_COUNT)]  # added up per hand
+        self._player_keys: list[int] = []  # mixed into the hand of every player
+        self._turn_keys: list[int] = []
+        self._root_keys: list[int] = []  # values are stored for the solving player
+        self._count_keys: list[int] = []  # accumulated draw count
+        self._pile_keys: tuple[list[list[int]], list[list[int]]] = ([], [])  # closed and open deck, by position
+        self._color_keys = [self._keys.getrandbits(64) for _ in range(NO_COLOR_SELECTION + 1)]
+        self._direction_key = self._keys.getrandbits(64)
+        # depth, value, bound and best action, see _card_action
+        self._table: OrderedDict[int, tuple[int, int, int, Action | None]] = OrderedDict()
+        self._deadline: float | None = None
+        self.node_count = 0
+
+        # hashes of the hands and piles of the searched game, updated by _observe while it steps
+        self._game: Game | None = None
+        self._hands: list[int] = []
+        self._piles = [0, 0]
+        self._played: Card | None = None  # card played by the last step
+        self._reshuffled = False  # True if the last step reshuffled
+        self._handlers: dict[type, Callable[[Any], None]] = {
+            events.StepStarted: self._step_started, events.CardDrawn: self._card_drawn,
+            events.CardPlayed: self._card_played, events.DecksRotated: self._decks_rotated,
+            events.DecksSwapped: self._decks_swapped, events.Reshuffled: self._reshuffled_event}
+
+    def _extend(self, keys: list[int], length: int):
+        keys.extend(self._keys.getrandbits(64) for _ in range(length - len(keys)))
+
+    def _pile_key(self, pile: int, position: int, card: Card) -> int:
+        """
+        :param pile: 0 for the closed deck, 1 for the open deck.
+        :param position: position of card counted from the bottom of the pile.
+        """
+        keys = self._pile_keys[pile]
+        while len(keys) <= position:
+            keys.append([self._keys.getrandbits(64) for _ in range(CARD_ID_COUNT)])
+        return keys[position][card.id]
+
+    def _pile_hash(self, pile: int, cards: Iterable[Card]) -> int:
+        return sum([self._pile_key(pile, position, card) for position, card in enumerate(cards)]) & _MASK
+
+    def _hand_hash(self, hand: Iterable[Card]) -> int:
+        card_keys = self._card_keys
+        return sum([card_keys[card.id] for card in hand]) & _MASK
+
+    def _combine(self, game: Game, hands: list[int], closed_hash: int, open_hash: int) -> int:
+        """
+        :return: hash of game from the hashes of its hands and piles, see hash.
+        """
+        if len(self._player_keys) < len(hands):
+            for keys in (self._player_keys, self._turn_keys, self._root_keys):
+                self._extend(keys, len(hands))
+        count = game.accumulated_draw_count
+        if count >= len(self._count_keys):
+            self._extend(self._count_keys, count + 1)
+
+        value = sum([(hand ^ key) * _MIX for hand, key in zip(hands, self._player_keys)]) & _MASK
+        value ^= closed_hash ^ open_hash ^ self._turn_keys[game.current_turn] ^ self._count_keys[count] ^ \
+            self._color_keys[NO_COLOR_SELECTION if game.color_selection is None else game.color_selection.value]
+        if game.direction is Directions.COUNTERCLOCKWISE:
+            value ^= self._direction_key
+        return value
+
+    def hash(self, game: Game) -> int:
+        """
+        :return: 64 bit Zobrist hash of the hands, the closed and the open deck, the current turn, the direction,
+            the color selection and the accumulated draw count. Hands are hashed as multisets, piles in order.
+        """
+        return self._combine(game, [self._hand_hash(hand) for hand in game.player_decks],
+                             self._pile_hash(0, game.closed_deck), self._pile_hash(1, game.open_deck))
+
+    def _observe(self, event: events.Event):
+        """
+        updates the hashes of the hands and the closed deck of the searched game while it steps, see _child.
+        """
+        handler = self._handlers.get(type(event))
+        if handler is not None:
+            handler(event)
+
+    def _step_started(self, event: events.StepStarted):
+        self._played = None
+        self._reshuffled = False
+
+    def _card_drawn(self, event: events.CardDrawn):
+        assert event.card is not None and self._game is not None
+        self._hands[event.player] = (self._hands[event.player] + self._card_keys[event.card.id]) & _MASK
+        self._piles[0] = (self._piles[0] - self._pile_key(0, len(self._game.closed_deck), event.card)) & _MASK
+
+    def _card_played(self, event: events.CardPlayed):
+        self._hands[event.player] = (self._hands[event.player] - self._card_keys[event.card.id]) & _MASK
+        self._played = event.card
+
+    def _decks_rotated(self, event: events.DecksRotated):
+        if event.direction is Directions.CLOCKWISE:
+            self._hands.insert(0, self._hands.pop())
+        else:
+            self._hands.append(self._hands.pop(0))
+
+    def _decks_swapped(self, event: events.DecksSwapped):
+        hands = self._hands
+        hands[event.player], hands[event.other_player] = hands[event.other_player], hands[event.player]
+
+    def _reshuffled_event(self, event: events.Reshuffled):
+        assert self._game is not None
+        self._piles[0] = self._pile_hash(0, self._game.closed_deck)
+        self._reshuffled = True
+
+    def clear(self):
+        self._table.clear()
+
+    def solve(self, game: Game, time_limit: float | None = None) -> Solution:
+        """
+        :param game: game with at least one legal action, it is not modified.
+        :param time_limit: seconds after which the search returns the result of the last completed iteration.
+        :raises ValueError: raised when the current player has no legal action.
+        """
+        if not game.legal_actions():
+            raise ValueError('the current player has no legal action')
+        game = game.clone()
+        game.rng = _KeepOrder()
+        game.enable_undo()
+        root = game.current_turn
+        self._game = game
+        self._hands = [self._hand_hash(hand) for hand in game.player_decks]
+        self._piles = [self._pile_hash(0, game.closed_deck), self._pile_hash(1, game.open_deck)]
+        game.add_observer(self._observe)
+        self._deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self.node_count = 0
+
+        solution = Solution(game.legal_actions()[0], 0, 0, 0)
+        for depth in range(1, self.max_depth + 1):
+            try:
+                value, action = self._search(game, root, depth, _LOSS, _WIN)
+            except _Timeout:
+                break
+            assert action is not None
+            solution = Solution(action, value, depth, self.node_count)
+            if value:
+                break
+        return solution._replace(node_count=self.node_count)
+
+    def _store(self, key: int, depth: int, value: int, bound: int, action: Action | None):
+        self._table[key] = _PROVEN_DEPTH if value else depth, value, bound, action
+        self._table.move_to_end(key)
+        if len(self._table) > self.table_size:
+            self._table.popitem(last=False)
+
+    def _search(self, game: Game, root: int, depth: int, alpha: int, beta: int) -> tuple[int, Action | None]:
+        """
+        :return: value of game for root, _UNKNOWN if it is not decided within depth steps, and the best action.
+        """
+        self.node_count += 1
+        if self._deadline is not None and not self.node_count & 0xff and time.perf_counter() > self._deadline:
+            raise _Timeout()
+
+        key = self._combine(game, self._hands, *self._piles) ^ self._root_keys[root]
+        entry = self._table.get(key)
+        best_action = None
+        if entry is not None:
+            self._table.move_to_end(key)
+            entry_depth, value, bound, best_action = entry
+            best_action = _index_action(game.current_player_deck, best_action)
+            if entry_depth >= depth and best_action is not None and (
+                    bound == _EXACT or bound == _LOWER and value >= beta or bound == _UPPER and value <= alpha):
+                return value, best_action
+        actions = game.legal_actions()
+        if not depth or not actions:
+            return _UNKNOWN, None
+
+        maximizing = game.current_turn == root
+        challenger_maximizing = game.step_index(game.current_turn, game.direction.value) == root
+        original_alpha, original_beta = alpha, beta
+        best_value = _LOSS - 1 if maximizing else _WIN + 1
+
+        for action in sorted(actions, key=lambda action: (action != best_action, action.played_card_index is None)):
+            if action.add_4_challenged:
+                continue  # evaluated together with the unchallenged action
+            value = self._child(game, root, action, depth, alpha, beta)
+            challenged = action._replace(add_4_challenged=True)
+            if action.played_card_index is not None and challenged in actions and game.current_player_deck[
+                    action.played_card_index].card_type is CardType.ADD4:
+                challenged_value = self._child(game, root, challenged, depth, alpha, beta)
+                value = max(value, challenged_value) if challenger_maximizing else min(value, challenged_value)
+
+            if maximizing and value > best_value or not maximizing and value < best_value:
+                best_value, best_action = value, action
+            if maximizing:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+        bound = _UPPER if best_value <= original_alpha else _LOWER if best_value >= original_beta else _EXACT
+        self._store(key, depth, best_value, bound, _card_action(game.current_player_deck, best_action))
+        return best_value, best_action
+
+    def _child(self, game: Game, root: int, action: Action, depth: int, alpha: int, beta: int) -> int:
+        player = game.current_turn
+        hands, piles = self._hands[:], self._piles[:]
+        try:
+            game.step(*action)
+        except GameStop:
+            winner: int | None = player
+        else:
+            winner = next((player for player, deck in enumerate(game.player_decks) if not deck), None)
+        try:
+            if winner is not None:
+                return _WIN if winner == root else _LOSS
+            if self._reshuffled:
+                self._piles[1] = self._pile_hash(1, game.open_deck)
+            elif self._played is not None:  # the played card is discarded at the end of the step
+                self._piles[1] = (self._piles[1] + self._pile_key(1, len(game.open_deck) - 1, self._played)) & _MASK
+            return self._search(game, root, depth - 1, alpha, beta)[0]
+        finally:
+            game.undo()
+            self._hands, self._piles = hands, piles
@@ -0,0 +1,156 @@
+import math
+import os
+import random
+from collections.abc import Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field, fields
+from itertools import product
+from statistics import NormalDist
+from typing import Any
+
+from oneEngine.rules import Rules
+from oneEngine.tournament import Agent, TournamentResult, play_games
+
+RULE_FLAGS = tuple(rules_field.name for rules_field in fields(Rules) if rules_field.name != 'player_card_count')
+
+
+def rules_grid(player_card_counts: Sequence[int] = (7,), **fixed: bool) -> list[Rules]:
+    """
+    :param player_card_counts: values of Rules.player_card_count.
+    :param fixed: flags of Rules kept at the given value instead of being varied.
+    :raises ValueError: raised when fixed contains something else than a flag of Rules.
+    :return: every combination of the flags of Rules for every player card count.
+    """
+    if unknown := set(fixed) - set(RULE_FLAGS):
+        raise ValueError(f'unknown flags {sorted(unknown)}')
+    varied = [flag for flag in RULE_FLAGS if flag not in fixed]
+    return [Rules(player_card_count, **fixed, **dict(zip(varied, values)))
+            for player_card_count in player_card_counts for values in product([False, True], repeat=len(varied))]
+
+
+@dataclass
+class _Configuration:
+    rules: Rules
+    seeds: random.Random
+    result: TournamentResult
+    submitted_chunk_count: int = 0
+    merged_chunk_count: int = 0
+    finished_chunks: dict[int, TournamentResult] = field(default_factory=dict)  # waiting to be merged in order
+    stopped_early: bool = False
+    done: bool = False
+
+
+def _half_widths(result: TournamentResult, z: float) -> tuple[float, float]:
+    """
+    :return: half widths of the confidence intervals of the mean game length and of the widest seat win rate.
+    """
+    game_count = max(result.game_count, 1)
+    length = z * math.sqrt(max(result.game_length_variance, 0) / game_count)
+    win_rate = max(z * math.sqrt(wins / game_count * (1 - wins / game_count) / game_count)
+                   for wins in result.seat_wins)
+    return length, win_rate
+
+
+def sweep(agents: Sequence[Agent], rules: Sequence[Rules], max_games: int = 10_000, min_games: int = 1000,
+          length_tolerance: float = 0.02, win_rate_tolerance: float = 0.02, confidence: float = 0.95,
+          seed: int = 0, max_workers: int | None = None, chunk_size: int = 250,
+          max_steps: int = 10_000) -> dict[str, list[Any]]:
+    """
+    plays games for every rules of rules in one pool of worker processes, see iter_tournament. A configuration stops
+    once it played min_games and the confidence intervals of its mean game length (relative to the mean) and of
+    every seat win rate are narrower than the tolerances, or after max_games.
+    Chunks are merged in order and chunks after stopping are discarded, so results do not depend on max_workers.
+    :param agents: one agent per player.
+    :param rules: configurations, e.g. rules_grid().
+    :param max_games: maximum number of games per configuration.
+    :param min_games: number of games played before a configuration may stop early.
+    :param length_tolerance: half width of the confidence interval of the mean game length, relative to the mean.
+    :param win_rate_tolerance: half width of the confidence intervals of the seat win rates.
+    :param confidence: confidence level of the intervals.
+    :param seed:
+    :param max_workers: number of worker processes, see ProcessPoolExecutor.
+    :param chunk_size: number of games played per task.
+    :param max_steps: number of steps after which a game is given up.
+    :return: columns with one entry per configuration: the flags of Rules, game_count, stopped_early,
+        unfinished_rate, mean_game_length, game_length_half_width, mean_drawn_card_count, seat_win_rates
+        (list per configuration), seat_win_rate_half_width and seat_advantage (highest seat win rate minus the mean).
+    """
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    seeds = random.Random(seed)
+    configurations = [_Configuration(configuration_rules, random.Random(seeds.getrandbits(64)),
+                                     TournamentResult(len(agents))) for configuration_rules in rules]
+    chunk_count = math.ceil(max_games / chunk_size)
+
+    def merge_finished_chunks(configuration: _Configuration) -> bool:
+        """
+        :return: True if configuration is done.
+        """
+        while not configuration.done and configuration.merged_chunk_count in configuration.finished_chunks:
+            configuration.result.merge(configuration.finished_chunks.pop(configuration.merged_chunk_count))
+            configuration.merged_chunk_count += 1
+            length, win_rate = _half_widths(configuration.result, z)
+            if configuration.result.game_count >= min_games and length <= length_tolerance * \
+                    configuration.result.mean_game_length and win_rate <= win_rate_tolerance:
+                configuration.stopped_early = configuration.merged_chunk_count < chunk_count
+                configuration.done = True
+            configuration.done |= configuration.merged_chunk_count == chunk_count
+        if configuration.done:
+            configuration.finished_chunks.clear()
+        return configuration.done
+
+    max_workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers) as executor:
+        pending: dict[Future[TournamentResult], tuple[_Configuration, int]] = {}
+        next_configuration = 0
+
+        while True:
+            # submits chunks round robin over the configurations still running, bounding the number of queued chunks
+            while len(pending) < 2 * max_workers:
+                waiting = [configuration for configuration in configurations
+                           if not configuration.done and configuration.submitted_chunk_count < chunk_count]
+                if not waiting:
+                    break
+                configuration = waiting[next_configuration % len(waiting)]
+                next_configuration += 1
+                chunk = configuration.submitted_chunk_count
+                configuration.submitted_chunk_count += 1
+                first_game = chunk * chunk_size
+                future = executor.submit(play_games, agents, configuration.rules, first_game,
+                                         min(chunk_size, max_games - first_game),
+                                         configuration.seeds.getrandbits(64), max_steps)
+                pending[future] = configuration, chunk
+
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                configuration, chunk = pending.pop(future)
+                if configuration.done:
+                    continue
+                configuration.finished_chunks[chunk] = future.result()
+                if merge_finished_chunks(configuration):
+                    for other_future, (other_configuration, _) in pending.items():
+                        if other_configuration is configuration:
+                            other_future.cancel()
+
+    columns: dict[str, list[Any]] = {name: [] for name in (
+        'player_card_count', *RULE_FLAGS, 'game_count', 'stopped_early', 'unfinished_rate', 'mean_game_length',
+        'game_length_half_width', 'mean_drawn_card_count', 'seat_win_rates', 'seat_win_rate_half_width',
+        'seat_advantage')}
+    for configuration in configurations:
+        result = configuration.result
+        game_count = max(result.game_count, 1)
+        seat_win_rates = [wins / game_count for wins in result.seat_wins]
+        length, win_rate = _half_widths(result, z)
+        for name in ('player_card_count', *RULE_FLAGS):
+            columns[name].append(getattr(configuration.rules, name))
+        columns['game_count'].append(result.game_count)
+        columns['stopped_early'].append(configuration.stopped_early)
+        columns['unfinished_rate'].append(result.unfinished_count / game_count)
+        columns['mean_game_length'].append(result.mean_game_length)
+        columns['game_length_half_width'].append(length)
+        columns['mean_drawn_card_count'].append(result.mean_drawn_card_count)
+        columns['seat_win_rates'].append(seat_win_rates)
+        columns['seat_win_rate_half_width'].append(win_rate)
+        columns['seat_advantage'].append(max(seat_win_rates) - sum(seat_win_rates) / len(seat_win_rates))
+    return columns
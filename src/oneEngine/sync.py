@@ -0,0 +1,176 @@
+import struct
+from typing import Any, NamedTuple
+
+from oneEngine.card import NO_COLOR_SELECTION, Card
+from oneEngine.enums import Color, Directions
+from oneEngine.game import Game, PlayerView
+
+# fields of PlayerView sent as a whole when they change, bit i of the flags in ViewDelta.to_bytes is set for field i
+_SCALAR_FIELDS = ('open_card', 'color_selection', 'direction', 'accumulated_draw_count', 'current_turn',
+                  'closed_deck_size')
+_HEADER = struct.Struct('<BBB')  # player, player count, flags
+_SCALAR_FORMATS = [struct.Struct(scalar_format) for scalar_format in ('<B', '<B', '<b', '<H', '<B', '<H')]
+_SPLICE = struct.Struct('<HHH')  # hand start, removed count, added count
+_HAND_SIZE = struct.Struct('<BH')  # player, size
+
+
+class ViewDelta(NamedTuple):
+    """
+    changes of the view of player, see diff. The hand changes by replacing hand[hand_start:hand_start + hand_removed]
+    with hand_added.
+    """
+    player: int
+    player_count: int
+    changes: dict[str, Any]  # changed fields of PlayerView except player, hand and hand_sizes
+    hand_start: int = 0
+    hand_removed: int = 0
+    hand_added: tuple[Card, ...] = ()
+    hand_sizes: tuple[tuple[int, int], ...] = ()  # player and hand size of every changed hand size
+
+    def __bool__(self) -> bool:
+        """
+        :return: False if nothing changed.
+        """
+        return bool(self.changes or self.hand_removed or self.hand_added or self.hand_sizes)
+
+    def to_bytes(self) -> bytes:
+        """
+        :return: compact encoding of self, see from_bytes.
+        """
+        flags = sum(1 << bit for bit, name in enumerate(_SCALAR_FIELDS) if name in self.changes)
+        parts = [_HEADER.pack(self.player, self.player_count, flags)]
+        for name, scalar_format in zip(_SCALAR_FIELDS, _SCALAR_FORMATS):
+            if name in self.changes:
+                parts.append(scalar_format.pack(_pack_scalar(name, self.changes[name])))
+        parts.append(_SPLICE.pack(self.hand_start, self.hand_removed, len(self.hand_added)))
+        parts.append(bytes(card.id for card in self.hand_added))
+        parts.append(bytes([len(self.hand_sizes)]))
+        parts += [_HAND_SIZE.pack(player, size) for player, size in self.hand_sizes]
+        return b''.join(parts)
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'ViewDelta':
+        """
+        :raises ValueError: raised when data is no encoded ViewDelta.
+        """
+        try:
+            player, player_count, flags = _HEADER.unpack_from(data)
+            offset = _HEADER.size
+            changes = {}
+            for bit, (name, scalar_format) in enumerate(zip(_SCALAR_FIELDS, _SCALAR_FORMATS)):
+                if flags >> bit & 1:
+                    changes[name] = _unpack_scalar(name, scalar_format.unpack_from(data, offset)[0])
+                    offset += scalar_format.size
+            hand_start, hand_removed, added_count = _SPLICE.unpack_from(data, offset)
+            offset += _SPLICE.size
+            hand_added = tuple(map(Card.from_id, data[offset:offset + added_count]))
+            offset += added_count
+            hand_sizes = tuple(_HAND_SIZE.unpack_from(data, offset + 1 + index * _HAND_SIZE.size)
+                               for index in range(data[offset]))
+            offset += 1 + len(hand_sizes) * _HAND_SIZE.size
+        except (struct.error, IndexError, KeyError) as error:
+            raise ValueError('invalid view delta') from error
+        if offset != len(data) or len(hand_added) != added_count:
+            raise ValueError('invalid view delta')
+        return ViewDelta(player, player_count, changes, hand_start, hand_removed, hand_added, hand_sizes)
+
+
+def _pack_scalar(name: str, value: Any) -> int:
+    if name == 'open_card':
+        return int(value.id)
+    if name == 'color_selection':
+        return NO_COLOR_SELECTION if value is None else int(value.value)
+    if name == 'direction':
+        return int(value.value)
+    return int(value)
+
+
+def _unpack_scalar(name: str, value: int) -> Any:
+    if name == 'open_card':
+        return Card.from_id(value)
+    if name == 'color_selection':
+        return None if value == NO_COLOR_SELECTION else Color(value)
+    if name == 'direction':
+        return Directions(value)
+    return value
+
+
+def diff(previous: PlayerView | None, view: PlayerView) -> ViewDelta:
+    """
+    :param previous: view the receiver holds, None if it holds none.
+    :param view: view of the same player.
+    :return: delta turning previous into view, see apply.
+    """
+    if previous is None:
+        return ViewDelta(view.player, len(view.hand_sizes), {name: getattr(view, name) for name in _SCALAR_FIELDS},
+                         0, 0, view.hand, tuple(enumerate(view.hand_sizes)))
+
+    changes = {name: getattr(view, name) for name in _SCALAR_FIELDS if getattr(view, name) != getattr(previous, name)}
+
+    # the common prefix and suffix of the hands are kept, plays remove one card and draws append cards
+    old_hand, hand = previous.hand, view.hand
+    start = 0
+    common = min(len(old_hand), len(hand))
+    while start < common and old_hand[start] is hand[start]:
+        start += 1
+    end = 0
+    while end < common - start and old_hand[-1 - end] is hand[-1 - end]:
+        end += 1
+
+    hand_sizes = tuple((player, size) for player, (size, old_size) in enumerate(zip(view.hand_sizes,
+                                                                                    previous.hand_sizes))
+                       if size != old_size)
+    return ViewDelta(view.player, len(view.hand_sizes), changes, start, len(old_hand) - start - end,
+                     hand[start:len(hand) - end], hand_sizes)
+
+
+def apply(view: PlayerView | None, delta: ViewDelta) -> PlayerView:
+    """
+    :param view: view delta was computed from, None for the first delta.
+    :raises ValueError: raised when delta does not belong to view.
+    :return: updated view.
+    """
+    if view is None:
+        if set(delta.changes) != set(_SCALAR_FIELDS) or delta.hand_start or delta.hand_removed:
+            raise ValueError('the first delta must contain the whole view')
+        hand_sizes = [0] * delta.player_count
+        fields = delta.changes
+    else:
+        if view.player != delta.player or len(view.hand_sizes) != delta.player_count or \
+                delta.hand_start + delta.hand_removed > len(view.hand):
+            raise ValueError('delta does not belong to view')
+        hand_sizes = list(view.hand_sizes)
+        fields = {name: getattr(view, name) for name in _SCALAR_FIELDS} | delta.changes
+
+    hand = () if view is None else view.hand
+    hand = hand[:delta.hand_start] + delta.hand_added + hand[delta.hand_start + delta.hand_removed:]
+    for player, size in delta.hand_sizes:
+        hand_sizes[player] = size
+    return PlayerView(delta.player, hand, tuple(hand_sizes), **fields)
+
+
+class DeltaEncoder:
+    """
+    keeps the last view sent to every player, so only changes have to be sent after every step.
+    """
+
+    def __init__(self):
+        self._views: dict[int, PlayerView] = {}
+
+    def encode(self, game: Game, player: int) -> ViewDelta:
+        """
+        :return: changes of the view of player since the previous call, the whole view for the first call.
+        """
+        view = game.view(player)
+        delta = diff(self._views.get(player), view)
+        self._views[player] = view
+        return delta
+
+    def reset(self, player: int | None = None):
+        """
+        forgets the views of player, or of every player if None, e.g. when a client reconnects.
+        """
+        if player is None:
+            self._views.clear()
+        else:
+            self._views.pop(player, None)
@@ -0,0 +1,170 @@
+import os
+import random
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
+
+from oneEngine.game import Action, Game, GameStop
+from oneEngine.rules import Rules
+
+# must be picklable, e.g. a module level function, to be run in worker processes.
+# agents should take random decisions from Game.rng to keep tournaments reproducible.
+Agent = Callable[[Game], Action]
+
+
+@dataclass
+class TournamentResult:
+    """
+    Statistics of finished games, merged incrementally while a tournament is running.
+    A game is won by the first player running out of cards. Games reaching max_steps count as unfinished.
+    """
+    agent_count: int
+    game_count: int = 0
+    unfinished_count: int = 0
+    wins: list[int] = field(default_factory=list)  # indexed by agent
+    seat_wins: list[int] = field(default_factory=list)  # indexed by player index
+    step_count: int = 0  # allowed steps of all games
+    squared_step_count: int = 0  # sum of squared game lengths
+    drawn_card_count: int = 0
+
+    def __post_init__(self):
+        self.wins = self.wins or [0] * self.agent_count
+        self.seat_wins = self.seat_wins or [0] * self.agent_count
+
+    def merge(self, other: 'TournamentResult'):
+        """
+        adds the statistics of other to self.
+        """
+        self.game_count += other.game_count
+        self.unfinished_count += other.unfinished_count
+        self.wins = [wins + other_wins for wins, other_wins in zip(self.wins, other.wins)]
+        self.seat_wins = [wins + other_wins for wins, other_wins in zip(self.seat_wins, other.seat_wins)]
+        self.step_count += other.step_count
+        self.squared_step_count += other.squared_step_count
+        self.drawn_card_count += other.drawn_card_count
+
+    @property
+    def win_rates(self) -> list[float]:
+        return [wins / max(self.game_count, 1) for wins in self.wins]
+
+    @property
+    def mean_game_length(self) -> float:
+        return self.step_count / max(self.game_count, 1)
+
+    @property
+    def game_length_variance(self) -> float:
+        return self.squared_step_count / max(self.game_count, 1) - self.mean_game_length ** 2
+
+    @property
+    def mean_drawn_card_count(self) -> float:
+        return self.drawn_card_count / max(self.game_count, 1)
+
+
+def play_game(game: Game, agents: Sequence[Agent], max_steps: int = 10_000) -> tuple[int | None, int, int]:
+    """
+    plays game until the first player runs out of cards.
+    :param game:
+    :param agents: agent of every player.
+    :param max_steps: number of allowed steps after which the game is given up.
+    :raises ValueError: raised when an agent chooses a move that is not allowed.
+    :return: index of the winning player (None if unfinished), number of allowed steps and number of drawn cards.
+    """
+    drawn_card_count = 0
+    hand_card_count = sum(map(len, game.player_decks))
+
+    for step_count in range(1, max_steps + 1):
+        player = game.current_turn
+        action = agents[player](game)
+        try:
+            if not game.step(*action):
+                raise ValueError(f'agent of player {player} chose a disallowed move {action}')
+        except GameStop:
+            return player, step_count, drawn_card_count
+
+        previous_hand_card_count, hand_card_count = hand_card_count, sum(map(len, game.player_decks))
+        drawn_card_count += hand_card_count - previous_hand_card_count + (action.played_card_index is not None)
+
+        for player, deck in enumerate(game.player_decks):
+            if not deck:
+                return player, step_count, drawn_card_count
+
+    return None, max_steps, drawn_card_count
+
+
+def play_games(agents: Sequence[Agent], rules: Rules, first_game: int, game_count: int, seed: int,
+               max_steps: int = 10_000) -> TournamentResult:
+    """
+    plays a chunk of games in the current process, see iter_tournament.
+    :param first_game: index of the first game, the seating of agents rotates with the game index.
+    :param seed: seed of the generator the seeds of the games are drawn from.
+    :return: result of the games.
+    """
+    game_seeds = random.Random(seed)
+    result = TournamentResult(len(agents))
+
+    for game_index in range(first_game, first_game + game_count):
+        seating = [agents[(seat + game_index) % len(agents)] for seat in range(len(agents))]
+        game = Game(len(agents), rules, rng=game_seeds.getrandbits(64))
+        winner, step_count, drawn_card_count = play_game(game, seating, max_steps)
+
+        result.game_count += 1
+        result.step_count += step_count
+        result.squared_step_count += step_count ** 2
+        result.drawn_card_count += drawn_card_count
+        if winner is None:
+            result.unfinished_count += 1
+        else:
+            result.wins[(winner + game_index) % len(agents)] += 1
+            result.seat_wins[winner] += 1
+
+    return result
+
+
+def iter_tournament(agents: Sequence[Agent], rules: Rules, game_count: int, seed: int = 0,
+                    max_workers: int | None = None, chunk_size: int = 1000,
+                    max_steps: int = 10_000) -> Iterator[TournamentResult]:
+    """
+    plays game_count games in worker processes, agents take turns sitting at each seat.
+    Games are played in chunks of chunk_size, every chunk is seeded from seed and its position, so results
+    do not depend on max_workers.
+    :param agents: one agent per player.
+    :param rules:
+    :param game_count:
+    :param seed:
+    :param max_workers: number of worker processes, see ProcessPoolExecutor.
+    :param chunk_size: number of games played per task.
+    :param max_steps: number of steps after which a game is given up.
+    :return: iterator of the merged result, updated after each finished chunk.
+    """
+    seeds = random.Random(seed)
+    result = TournamentResult(len(agents))
+
+    max_workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers) as executor:
+        pending: set[Future[TournamentResult]] = set()
+
+        for first_game in range(0, game_count, chunk_size):
+            if len(pending) >= 2 * max_workers:  # bounds the number of queued chunks
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result.merge(future.result())
+                    yield result
+            pending.add(executor.submit(play_games, agents, rules, first_game,
+                                        min(chunk_size, game_count - first_game), seeds.getrandbits(64), max_steps))
+
+        for future in as_completed(pending):
+            result.merge(future.result())
+            yield result
+
+
+def run_tournament(agents: Sequence[Agent], rules: Rules, game_count: int, seed: int = 0,
+                   max_workers: int | None = None, chunk_size: int = 1000,
+                   max_steps: int = 10_000) -> TournamentResult:
+    """
+    see iter_tournament.
+    :return: result of all games.
+    """
+    result = TournamentResult(len(agents))
+    for result in iter_tournament(agents, rules, game_count, seed, max_workers, chunk_size, max_steps):
+        pass
+    return result
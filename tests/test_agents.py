@@ -0,0 +1,113 @@
+from random import Random
+
+import pytest
+
+from oneEngine import Action, Card, CardType, Color, Game, GameStop, Hand, Rules
+from oneEngine.agents import (GreedyColorAgent, HoldWildAgent, RandomAgent, StackAggressiveAgent, decide,
+                              hand_statistics)
+from oneEngine.tournament import run_tournament
+
+AGENTS = [GreedyColorAgent(), HoldWildAgent(), StackAggressiveAgent()]
+
+
+def random_games(count: int, rules: Rules, counted_hands: bool = False) -> list[Game]:
+    games = []
+    for seed in range(count):
+        game = Game(3, rules, rng=seed, counted_hands=counted_hands)
+        for _ in range(seed % 30):
+            try:
+                game.step(*game.rng.choice(game.legal_actions()))
+            except GameStop:
+                break
+        games.append(game)
+    return games
+
+
+def test_hand_statistics():
+    cards = [Card(Color.RED, CardType.NUMBER_1), Card(Color.RED, CardType.ADD2), Card(Color.BLACK, CardType.ADD4)]
+    mask, color_counts = hand_statistics(cards)
+    assert (mask, color_counts) == hand_statistics(Hand(cards))
+    assert mask == sum(1 << card.id for card in cards)
+    assert color_counts == [0, 0, 0, 2, 1]
+
+
+@pytest.mark.parametrize('agent', [RandomAgent(), *AGENTS])
+@pytest.mark.parametrize('rules', [Rules(), Rules(seven_swaps=True, mandatory_playing=False)])
+def test_actions_are_legal(agent, rules):
+    for counted_hands in (False, True):
+        games = random_games(40, rules, counted_hands)
+        actions = decide(agent, games)
+        for game, action in zip(games, actions):
+            if game.legal_actions():
+                assert action in game.legal_actions()
+                assert action == agent(game) or isinstance(agent, RandomAgent)
+
+
+def test_heuristics():
+    game = Game(2, Rules(), rng=1)
+    game.open_deck.append(Card(Color.RED, CardType.NUMBER_5))
+    game.player_decks[0][:] = [Card(Color.BLACK, CardType.COLOR_SELECT), Card(Color.RED, CardType.ADD2),
+                               Card(Color.BLUE, CardType.NUMBER_5), Card(Color.BLUE, CardType.NUMBER_1),
+                               Card(Color.BLUE, CardType.NUMBER_2)]
+
+    assert GreedyColorAgent()(game) == Action(2)  # blue is held most often
+    assert HoldWildAgent()(game) == Action(2)
+    assert StackAggressiveAgent()(game) == Action(1)
+
+    del game.player_decks[0][1:]
+    assert GreedyColorAgent()(game) == Action(0, Color.BLUE)
+    game.player_decks[0].append(Card(Color.GREEN, CardType.NUMBER_1))
+    assert GreedyColorAgent()(game) == Action(0, Color.GREEN)
+    assert HoldWildAgent()(game) == Action(0, Color.GREEN)
+
+    game.player_decks[0][:] = [Card(Color.GREEN, CardType.NUMBER_1)]
+    assert HoldWildAgent()(game) == Action(None)
+
+
+def test_decide_accepts_functions():
+    games = random_games(5, Rules())
+    assert decide(lambda game: game.legal_actions()[0], games) == [game.legal_actions()[0] for game in games]
+
+
+def test_tournament():
+    result = run_tournament([StackAggressiveAgent(), RandomAgent()], Rules(), 40, seed=1, max_workers=1)
+    assert sum(result.wins) + result.unfinished_count == 40
+
+
+@pytest.mark.parametrize('agent', AGENTS)
+@pytest.mark.parametrize('rules', [Rules(3), Rules(3, seven_swaps=True, mandatory_playing=False)])
+def test_decide_batch_matches_games(agent, rules):
+    pytest.importorskip('numpy')
+    from oneEngine.batch import BatchGame
+
+    games = random_games(40, rules)
+    batch = BatchGame.from_games(games)
+    played_card_ids, color_selection, swap_player_selection, add_4_challenged = agent.decide_batch(batch)
+
+    for index, game in enumerate(games):
+        if not game.legal_actions():
+            continue
+        action = agent(game)
+        if action.played_card_index is None:
+            assert played_card_ids[index] < 0
+            continue
+        card = game.current_player_deck[action.played_card_index]
+        assert played_card_ids[index] == card.id
+        if action.color_selection is not None:
+            assert color_selection[index] == action.color_selection.value
+        if action.swap_player_selection is not None:
+            assert swap_player_selection[index] == action.swap_player_selection
+        assert not add_4_challenged[index]
+
+    assert batch.step(played_card_ids, color_selection, swap_player_selection, add_4_challenged)[
+        ~batch.finished].all()
+
+
+def test_random_decide_batch():
+    pytest.importorskip('numpy')
+    from oneEngine.batch import BatchGame
+
+    batch = BatchGame(50, 3, Rules(), seed=Random(2).getrandbits(32))
+    for _ in range(100):
+        active = ~batch.finished
+        assert batch.step(*RandomAgent().decide_batch(batch))[active].all()
@@ -0,0 +1,83 @@
+from math import comb
+from random import Random
+
+import pytest
+
+from oneEngine import Card, CardType, Color, Game, Rules
+from oneEngine.analytics import (ADD_CARDS_MASK, MonteCarloEstimator, expected_count, expected_penalty,
+                                 probability_at_least_one, probability_draws_any, probability_holds_any,
+                                 probability_next_player_can_stack, unseen_card_counts)
+
+
+@pytest.mark.parametrize('pool_size, matching_count, sample_size', [(10, 3, 4), (108, 8, 7), (5, 5, 1), (6, 0, 3),
+                                                                    (4, 2, 4), (3, 1, 0)])
+def test_probability_at_least_one(pool_size, matching_count, sample_size):
+    expected = 1 - comb(pool_size - matching_count, sample_size) / comb(pool_size, sample_size)
+    assert probability_at_least_one(pool_size, matching_count, sample_size) == pytest.approx(expected)
+
+
+def test_unseen_card_counts():
+    game = Game(3, Rules(), rng=1)
+    counts = unseen_card_counts(game, 0)
+    assert sum(counts) == 108 - 1 - 7
+    assert counts[game.open_card.id] == 2 - 1 - game.player_decks[0].count(game.open_card)
+
+    with pytest.raises(ValueError):
+        unseen_card_counts(game, 0, [game.open_card])
+
+
+def test_probabilities_match_sampling():
+    game = Game(3, Rules(), rng=2)
+    mask = ADD_CARDS_MASK
+    samples = game.determinizations(0, 4000, Random(0))
+
+    sampled = sum(any(mask >> card.id & 1 for card in sample.player_decks[1]) for sample in samples) / len(samples)
+    assert probability_holds_any(game, 0, 1, mask) == pytest.approx(sampled, abs=0.04)
+
+    sampled = sum(bool(mask >> sample.closed_deck[-1].id & 1) for sample in samples) / len(samples)
+    assert probability_draws_any(game, 0, mask) == pytest.approx(sampled, abs=0.03)
+
+    sampled = sum(sum(mask >> card.id & 1 for card in sample.player_decks[2]) for sample in samples) / len(samples)
+    assert expected_count(game, 0, 2, mask) == pytest.approx(sampled, abs=0.05)
+
+    assert probability_holds_any(game, 0, 0, mask) == any(mask >> card.id & 1 for card in game.player_decks[0])
+    assert 0 <= probability_next_player_can_stack(game, 0) <= 1
+
+
+def test_expected_penalty():
+    game = Game(2, Rules(), rng=3)
+    game.player_decks[0].append(Card(Color.RED, CardType.ADD2))
+    game.player_decks[0].append(Card(Color.BLACK, CardType.ADD4))
+
+    add_2_penalty = expected_penalty(game, len(game.player_decks[0]) - 2)
+    assert 0 < add_2_penalty < 2
+    assert 0 < expected_penalty(game, len(game.player_decks[0]) - 1, Color.RED) <= 4
+
+    game.accumulated_draw_count = 2
+    assert expected_penalty(game, len(game.player_decks[0]) - 2) == pytest.approx(2 * add_2_penalty)
+
+    with pytest.raises(ValueError):
+        expected_penalty(game, next(index for index, card in enumerate(game.player_decks[0])
+                                    if card.card_type is not CardType.ADD2 and card.card_type is not CardType.ADD4))
+
+
+def test_monte_carlo_estimator():
+    game = Game(3, Rules(), rng=4)
+    estimator = MonteCarloEstimator(sample_count=20, cache_size=2)
+    evaluations = []
+
+    def hand_size(sample: Game) -> float:
+        evaluations.append(sample)
+        return len(sample.player_decks[1])
+
+    assert estimator.estimate(game, 0, hand_size) == 7
+    assert estimator.estimate(game, 0, hand_size) == 7
+    assert len(evaluations) == 20
+
+    win_probability = estimator.win_probability(game, 0)
+    assert 0 <= win_probability <= 1
+    assert MonteCarloEstimator(sample_count=20).win_probability(game, 0) == win_probability
+
+    estimator.estimate(game, 1, hand_size)  # drops the least recently used estimate
+    estimator.estimate(game, 0, hand_size)
+    assert len(evaluations) == 60
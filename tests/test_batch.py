@@ -0,0 +1,139 @@
+from itertools import product
+from random import Random, seed
+
+import pytest
+
+from oneEngine import Card, Color, CardType, Game, GameStop, Rules
+from oneEngine.card import CARD_ID_COUNT
+from oneEngine.events import Reshuffled
+from oneEngine.sweep import RULE_FLAGS
+
+np = pytest.importorskip('numpy')
+from oneEngine.batch import BatchGame, NO_COLOR_SELECTION  # noqa: E402
+
+
+def assert_same_state(batch: BatchGame, index: int, game: Game):
+    assert list(batch.closed_deck[index, :batch.closed_count[index]]) == [card.id for card in game.closed_deck]
+    assert list(batch.open_deck[index, :batch.open_count[index]]) == [card.id for card in game.open_deck]
+    for player, player_deck in enumerate(game.player_decks):
+        expected = np.zeros(CARD_ID_COUNT, dtype=np.int16)
+        for card in player_deck:
+            expected[card.id] += 1
+        assert (batch.hands[index, player] == expected).all()
+    assert batch.current_turn[index] == game.current_turn
+    assert batch.direction[index] == game.direction.value
+    assert batch.color_selection[index] == (
+        NO_COLOR_SELECTION if game.color_selection is None else game.color_selection.value)
+    assert batch.accumulated_draw_count[index] == game.accumulated_draw_count
+
+
+@pytest.mark.parametrize('flags', list(product([False, True], repeat=len(RULE_FLAGS))))
+def test_differential_random_play(flags):
+    rules = Rules(3, **dict(zip(RULE_FLAGS, flags)))
+    rng = Random(7)
+    seed(7)
+    games = [Game(3, rules) for _ in range(8)]
+    batch = BatchGame.from_games(games)
+    diverged = [False] * len(games)  # Game and BatchGame shuffle differently when reshuffling
+
+    def diverge(index):
+        def observer(event):
+            if isinstance(event, Reshuffled):
+                diverged[index] = True
+        return observer
+
+    for index, game in enumerate(games):
+        game.add_observer(diverge(index))
+
+    for _ in range(300):
+        card_ids = np.full(len(games), -1)
+        color_selection = np.full(len(games), NO_COLOR_SELECTION)
+        swap_player_selection = np.full(len(games), -1)
+        add_4_challenged = np.zeros(len(games), dtype=bool)
+        expected = np.zeros(len(games), dtype=bool)
+
+        for index, game in enumerate(games):
+            if game is None or diverged[index]:
+                continue
+            playable = [index for index, card in enumerate(game.current_player_deck)
+                        if game.open_card.other_is_playable(card, rules, game.color_selection)]
+            played_card_index = rng.choice(
+                playable if playable and rng.random() < 0.8 else [None, *range(len(game.current_player_deck))])
+            color = rng.choice([Color.BLUE, Color.GREEN, Color.YELLOW, Color.RED])
+            swap = rng.choice([player for player in range(3) if player != game.current_turn])
+            challenged = rng.random() < 0.5
+
+            if played_card_index is not None:
+                card_ids[index] = game.current_player_deck[played_card_index].id
+            color_selection[index] = color.value
+            swap_player_selection[index] = swap
+            add_4_challenged[index] = challenged
+
+            try:
+                expected[index] = game.step(played_card_index, color, swap, challenged)
+            except GameStop:
+                expected[index] = True
+                games[index] = None
+
+        allowed = batch.step(card_ids, color_selection, swap_player_selection, add_4_challenged)
+
+        for index, game in enumerate(games):
+            if game is None:
+                assert batch.finished[index]
+            elif not diverged[index]:
+                assert allowed[index] == expected[index]
+                assert_same_state(batch, index, game)
+
+
+def test_initial_deal():
+    rules = Rules(7)
+    batch = BatchGame(100, 4, rules, seed=1)
+
+    assert (batch.hand_sizes() == 7).all()
+    assert (batch.open_count == 1).all()
+    assert (batch.open_card < 4 * 13).all()
+    assert (batch.open_card % 13 <= CardType.NUMBER_9.value).all()
+    assert (batch.closed_count + 1 + 4 * 7 <= 108).all()
+
+
+def test_deck_too_small():
+    with pytest.raises(IndexError):
+        BatchGame(2, 2, Rules(7), deck=[Card(Color.RED, CardType(card_type)) for card_type in range(1, 10)])
+    with pytest.raises(IndexError):
+        BatchGame(2, 1, Rules(1), deck=[Card(Color.RED, CardType.BLOCK)] * 5)
+    batch = BatchGame(20, 2, Rules(2), deck=[Card(Color.RED, CardType(card_type)) for card_type in range(1, 6)])
+    assert (batch.closed_count == 0).all()
+    assert (batch.hand_sizes() == 2).all()
+
+
+def test_draw_not_allowed_with_playable_card():
+    seed(1)
+    game = Game(2, Rules(mandatory_playing=True))
+    batch = BatchGame.from_games([game])
+    legal = batch.legal_actions()
+
+    assert legal[0, -1] == (not game.open_card.filter_playable_cards(game.current_player_deck, game.rules))
+    assert batch.step([-1])[0] == legal[0, -1]
+
+
+@pytest.mark.parametrize('draw_until_play', [False, True])
+def test_turn_passes_if_nothing_can_be_drawn(draw_until_play):
+    game = Game(2, Rules(draw_until_play=draw_until_play), rng=1)
+    game.closed_deck = []
+    game.open_deck = [Card(Color.GREEN, CardType.NUMBER_1)]
+    game.player_decks[0] = [Card(Color.RED, CardType.NUMBER_2), Card(Color.BLUE, CardType.NUMBER_3)]
+    batch = BatchGame.from_games([game])
+
+    assert batch.step([-1])[0] and game.step(None)
+    assert_same_state(batch, 0, game)
+    assert batch.current_turn[0] == 1
+
+
+def test_finished():
+    seed(3)
+    game = Game(1, Rules(player_card_count=1))
+    batch = BatchGame.from_games([game])
+
+    assert batch.step([game.current_player_deck[0].id])[0]
+    assert batch.finished[0]
+    assert not batch.step([-1])[0]
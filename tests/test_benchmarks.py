@@ -0,0 +1,15 @@
+from benchmarks.suite import WORKLOADS, Config, compare, run
+
+
+def test_workloads_run():
+    results = run(Config(game_count=2, max_steps=50, repeat=1))
+
+    assert results.keys() == WORKLOADS.keys()
+    assert all(value > 0 for metrics in results.values() for value in metrics.values())
+
+
+def test_compare():
+    baseline = {'steps': {'steps_per_second': 100.0, 'allocated_bytes_per_step': 100.0}}
+
+    assert compare({'steps': {'steps_per_second': 95.0, 'allocated_bytes_per_step': 105.0}}, baseline, 0.1) == []
+    assert len(compare({'steps': {'steps_per_second': 80.0, 'allocated_bytes_per_step': 120.0}}, baseline, 0.1)) == 2
@@ -1,8 +1,11 @@
+import pickle
+from copy import deepcopy
 from itertools import product
+from random import Random
 
 import pytest
 
-from oneEngine import Card, Color, CardType, Rules
+from oneEngine import Card, CardArray, Color, CardType, Hand, Rules, get_standard_card_deck
 
 for_all_rules = pytest.mark.parametrize(
     'black_on_black, zero_passes_on, seven_swaps, add_2_stackable, add_4_challengeable, draw_until_play, mandatory_playing',
@@ -103,3 +106,86 @@ def test_color_validation(color, card_type, exception_expected):
             Card(color, card_type)
     else:
         Card(color, card_type)
+
+
+@for_all_rules
+def test_filter_playable_cards(black_on_black, zero_passes_on, seven_swaps, add_2_stackable, add_4_challengeable,
+                               draw_until_play, mandatory_playing):
+    rules = Rules(7, black_on_black, zero_passes_on, seven_swaps, add_2_stackable, add_4_challengeable,
+                  draw_until_play, mandatory_playing)
+    deck = get_standard_card_deck()
+
+    for card in set(deck):
+        for color_selection in (None, Color.RED):
+            assert card.filter_playable_cards(deck, rules, color_selection) == [
+                other for other in deck if card.other_is_playable(other, rules, color_selection)]
+
+
+def test_cards_are_interned():
+    for card in get_standard_card_deck():
+        assert Card(card.color, card.card_type) is card
+        assert Card.from_id(card.id) is card
+        assert pickle.loads(pickle.dumps(card)) is card
+        assert deepcopy(card) is card
+
+    assert sorted({card.id for card in get_standard_card_deck()}) == list(range(54))
+
+
+def test_card_array():
+    deck = get_standard_card_deck()
+    card_array = CardArray(deck)
+
+    assert len(card_array) == len(deck)
+    assert card_array == deck
+    assert card_array.ids.tobytes() == bytes(card.id for card in deck)
+    assert card_array.pop() is deck[-1]
+
+    del card_array[0]
+    card_array.insert(1, deck[0])
+    card_array[2] = deck[5]
+    assert list(card_array[:3]) == [deck[1], deck[0], deck[5]]
+    assert CardArray.from_ids(card_array.ids.tobytes()) == card_array
+
+
+def test_hand():
+    rng = Random(4)
+    deck = get_standard_card_deck()
+    hand = Hand(deck[:10])
+    model = deck[:10]
+
+    for _ in range(500):
+        operation = rng.randrange(5)
+        if operation == 0 or not model:
+            card = rng.choice(deck)
+            hand.append(card)
+            model.append(card)
+        elif operation == 1:
+            index = rng.randrange(len(model) + 1)
+            card = rng.choice(deck)
+            hand.insert(index, card)
+            model.insert(index, card)
+        elif operation == 2:
+            index = rng.randrange(len(model))
+            assert hand.pop(index) is model.pop(index)
+        elif operation == 3:
+            index = rng.randrange(len(model))
+            del hand[index]
+            del model[index]
+        else:
+            start = rng.randrange(len(model))
+            cards = rng.sample(deck, 3)
+            hand[start:start + 2] = cards
+            model[start:start + 2] = cards
+
+        assert hand == model
+        assert hand.mask == sum({1 << card.id for card in model})
+        assert all(hand.count(card) == model.count(card) for card in deck)
+        assert all(hand.count_color(color) == sum(card.color is color for card in model) for color in Color)
+        assert all(hand.count_type(card_type) == sum(card.card_type is card_type for card in model)
+                   for card_type in CardType)
+
+    copy = hand.copy()
+    copy.append(deck[0])
+    assert copy != hand and hand == model
+    assert hand.holds_any(Card(Color.RED, CardType.NUMBER_1).playable_mask(Rules())) == any(
+        Card(Color.RED, CardType.NUMBER_1).filter_playable_cards(model, Rules()))
@@ -0,0 +1,105 @@
+from random import Random
+
+import pytest
+
+from oneEngine import Color, Game, GameStop, Rules
+from oneEngine.card import CARD_ID_COUNT
+
+np = pytest.importorskip('numpy')
+from oneEngine.batch import BatchGame  # noqa: E402
+from oneEngine.encoding import ActionSpace, ObservationEncoder, VectorEnv  # noqa: E402
+
+
+def random_games(count: int, player_count: int, rules: Rules, steps: int) -> list[Game]:
+    games = []
+    for seed in range(count):
+        game = Game(player_count, rules, rng=seed)
+        for _ in range(seed % steps):
+            try:
+                game.step(*game.rng.choice(game.legal_actions()))
+            except GameStop:
+                break
+        games.append(game)
+    return games
+
+
+@pytest.mark.parametrize('rules', [Rules(), Rules(seven_swaps=False, add_4_challengeable=False)])
+def test_action_space(rules):
+    action_space = ActionSpace(4)
+    mask = np.zeros(action_space.size, dtype=np.bool_)
+
+    for game in random_games(50, 4, rules, 40):
+        legal_actions = game.legal_actions()
+        action_space.legal_mask(game, mask)
+        indices = {action_space.index(game, action) for action in legal_actions}
+        assert set(np.flatnonzero(mask)) == indices
+
+        for action in legal_actions:
+            decoded = action_space.action(game, action_space.index(game, action))
+            card = None if action.played_card_index is None else game.current_player_deck[action.played_card_index]
+            assert decoded._replace(played_card_index=None) == action._replace(played_card_index=None)
+            assert card is None or game.current_player_deck[decoded.played_card_index] is card
+
+
+def test_observation():
+    encoder = ObservationEncoder(3)
+    game = Game(3, Rules(), rng=1)
+    game.color_selection = Color.RED
+    observation = encoder.encode(game)
+
+    assert observation.shape == (encoder.size,)
+    assert observation[:CARD_ID_COUNT].sum() == len(game.current_player_deck)
+    assert observation[encoder.open_card_offset + game.open_card.id] == 1
+    assert observation[encoder.color_selection_offset + Color.RED.value] == 1
+    assert observation[encoder.closed_deck_offset] == len(game.closed_deck)
+    assert list(observation[encoder.hand_sizes_offset:]) == [7, 7]
+
+    out = np.full(encoder.size, 5, dtype=np.float32)
+    assert encoder.encode(game, out) is out
+    assert (out == observation).all()
+
+
+def test_encode_batch():
+    games = random_games(30, 3, Rules(), 30)
+    encoder = ObservationEncoder(3)
+    expected = encoder.encode_games(games)
+    assert (encoder.encode_batch(BatchGame.from_games(games)) == expected).all()
+
+
+def test_vector_env():
+    env = VectorEnv(8, 3, Rules(), seed=2, max_steps=300)
+    observations, info = env.reset()
+    assert observations.shape == (8, env.observation_encoder.size)
+    assert info['action_mask'].any(axis=1).all()
+    rng = Random(0)
+    terminated_count = 0
+
+    for _ in range(500):
+        actions = [rng.choice(np.flatnonzero(mask)) for mask in info['action_mask']]
+        observations, rewards, terminated, truncated, info = env.step(actions)
+        assert ((rewards != 0) == terminated).all()
+        terminated_count += terminated.sum()
+        for game, observation in zip(env.games, observations):
+            assert (observation == env.observation_encoder.encode(game)).all()
+    assert terminated_count > 0
+
+    with pytest.raises(ValueError):
+        env.step([int(np.flatnonzero(~mask)[0]) for mask in info['action_mask']])
+
+
+def test_vector_env_passed_on_hands():
+    env = VectorEnv(16, 3, Rules(2, zero_passes_on=True, seven_swaps=True), seed=3, max_steps=300)
+    _, info = env.reset()
+    rng = Random(1)
+    other_winner_count = 0
+
+    for _ in range(2000):
+        actions = [rng.choice(np.flatnonzero(mask)) for mask in info['action_mask']]
+        players = info['current_player'].copy()
+        _, rewards, terminated, truncated, info = env.step(actions)
+        assert ((info['winner'] >= 0) == terminated).all()
+        assert (rewards == np.where(terminated, np.where(info['winner'] == players, 1, -1), 0)).all()
+        other_winner_count += (terminated & (info['winner'] != players)).sum()
+        for game in env.games:
+            assert all(game.player_decks)  # games with an empty hand have terminated
+    assert other_winner_count > 0
@@ -0,0 +1,97 @@
+from oneEngine import Card, CardType, Color, Game, GameStop, Rules
+from oneEngine.events import (CardDrawn, CardPlayed, DecksRotated, DecksSwapped, DrawPenalty, EventCounter, StepEnded, StepStarted,
+                              StepTimer)
+
+
+def play(game: Game, steps: int):
+    for _ in range(steps):
+        try:
+            game.step(*game.rng.choice(game.legal_actions()))
+        except GameStop:
+            return
+
+
+def test_events_match_game():
+    game = Game(3, Rules(seven_swaps=True, zero_passes_on=True), rng=5)
+    events = []
+    game.add_observer(events.append)
+
+    for _ in range(200):
+        hand_sizes = [*map(len, game.player_decks)]
+        player = game.current_turn
+        del events[:]
+        try:
+            allowed = game.step(*game.rng.choice(game.legal_actions()))
+        except GameStop:
+            assert events[-1] == StepEnded(player, True, True)
+            break
+
+        assert events[0].player == player and isinstance(events[0], StepStarted)
+        assert events[-1] == StepEnded(player, allowed, False)
+        if any(isinstance(event, DecksRotated | DecksSwapped) for event in events):
+            continue  # hands moved between players
+        drawn = [0] * len(hand_sizes)
+        for event in events:
+            if isinstance(event, CardDrawn):
+                drawn[event.player] += 1
+            elif isinstance(event, CardPlayed):
+                drawn[event.player] -= 1
+        assert [size + count for size, count in zip(hand_sizes, drawn)] == [*map(len, game.player_decks)]
+
+
+def test_draw_penalty():
+    game = Game(2, Rules(), rng=1)
+    game.open_deck.append(Card(Color.RED, CardType.NUMBER_1))
+    game.player_decks[0].append(Card(Color.RED, CardType.ADD2))
+    game.player_decks[1][:] = [card for card in game.player_decks[1] if card.card_type is not CardType.ADD2]
+    events = []
+    game.add_observer(events.append)
+
+    assert game.step(len(game.player_decks[0]) - 1)
+    assert DrawPenalty(1, 2) in events
+    assert sum(isinstance(event, CardDrawn) and event.player == 1 for event in events) == 2
+
+
+def test_counters_and_timer():
+    game = Game(4, Rules(), rng=2)
+    counter = EventCounter()
+    timer = StepTimer()
+    game.add_observer(counter)
+    game.add_observer(timer)
+    play(game, 50)
+
+    assert counter.counts['StepStarted'] == counter.counts['StepEnded'] == sum(timer.counts.values())
+    assert counter.counts['CardPlayed'] == sum(count for branch, count in timer.counts.items()
+                                               if branch not in ('draw', 'rejected'))
+    assert timer.counts['draw'] > 0
+    assert all(seconds >= 0 for seconds in timer.seconds.values())
+
+    game.remove_observer(counter)
+    steps = counter.counts['StepStarted']
+    play(game, 5)
+    assert counter.counts['StepStarted'] == steps
+    assert sum(timer.counts.values()) > steps
+
+
+def test_rejected_step():
+    game = Game(2, Rules(), rng=3)
+    timer = StepTimer()
+    game.add_observer(timer)
+    game.player_decks[0].append(Card(Color.BLACK, CardType.COLOR_SELECT))
+
+    try:
+        game.step(len(game.player_decks[0]) - 1)
+    except ValueError:
+        pass
+    assert timer.counts == {'rejected': 1}
+
+
+def test_clones_do_not_emit():
+    game = Game(2, Rules(), rng=4)
+    counter = EventCounter()
+    game.add_observer(counter)
+
+    clone = game.clone()
+    play(clone, 10)
+    play(game.determinize(0), 10)
+    assert not counter.counts
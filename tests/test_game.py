@@ -1,9 +1,10 @@
 from collections import deque
-from random import seed
+from itertools import product
+from random import Random, getstate, seed
 
 import pytest
 
-from oneEngine import Card, Color, CardType, Game, Rules, GameStop
+from oneEngine import Action, Card, CardArray, Hand, Color, CardType, Game, Rules, GameStop, get_standard_card_deck
 
 
 @pytest.mark.parametrize(
@@ -104,6 +105,264 @@ def test_reshuffle():
 
     g.step(played_card_index=None)
 
-    assert g.open_deck == deque([])
-    assert list(g.closed_deck) == [Card(Color.GREEN, CardType.NUMBER_1)]
+    assert list(g.open_deck) == [Card(Color.GREEN, CardType.NUMBER_1)]
+    assert list(g.closed_deck) == []
     assert g.player_decks == [[Card(Color.YELLOW, CardType.NUMBER_3), Card(Color.RED, CardType.NUMBER_2)]]
+
+    g.step(played_card_index=None)  # nothing left to reshuffle, the top card stays open
+    assert list(g.open_deck) == [Card(Color.GREEN, CardType.NUMBER_1)]
+    assert len(g.player_decks[0]) == 2
+
+
+@pytest.mark.parametrize('draw_until_play', [False, True])
+def test_turn_passes_if_nothing_can_be_drawn(draw_until_play):
+    game = Game(2, Rules(draw_until_play=draw_until_play), rng=1)
+    game.closed_deck = []
+    game.open_deck = [Card(Color.GREEN, CardType.NUMBER_1)]
+    game.player_decks[0] = [Card(Color.RED, CardType.NUMBER_2), Card(Color.BLUE, CardType.NUMBER_3)]
+    assert game.legal_actions() == (Action(None),)
+
+    assert game.step(None)
+    assert game.current_turn == 1
+    assert len(game.player_decks[0]) == 2
+
+
+@pytest.mark.parametrize('compact, counted_hands, hand_type', [(True, False, CardArray), (False, True, Hand),
+                                                               (True, True, Hand)])
+def test_compact_game_plays_like_game(compact, counted_hands, hand_type):
+    rng = Random(2)
+    seed(2)
+    game = Game(4, Rules())
+    seed(2)
+    compact_game = Game(4, Rules(), compact=compact, counted_hands=counted_hands)
+
+    for _ in range(200):
+        played_card_index = rng.choice([None, *range(len(game.current_player_deck))])
+        color_selection = rng.choice([Color.BLUE, Color.GREEN, Color.YELLOW, Color.RED])
+        swap_player_selection = (game.current_turn + 1) % 4
+        assert game.step(played_card_index, color_selection, swap_player_selection) == compact_game.step(
+            played_card_index, color_selection, swap_player_selection)
+
+        assert compact_game.closed_deck == game.closed_deck
+        assert compact_game.open_deck == game.open_deck
+        assert compact_game.player_decks == game.player_decks
+        assert isinstance(compact_game.current_player_deck, hand_type)
+
+
+def test_rng():
+    seed(1)
+    state = getstate()
+    game = Game(3, Rules(), rng=5)
+    assert getstate() == state  # the module level generator is not used
+
+    same_game = Game(3, Rules(), rng=Random(5))
+    assert list(game.closed_deck) == list(same_game.closed_deck)
+    assert game.player_decks == same_game.player_decks
+
+    other_game = Game(3, Rules(), rng=6)
+    assert list(game.closed_deck) != list(other_game.closed_deck)
+
+    seed(5)
+    module_game = Game(3, Rules())
+    assert module_game.rng is None and module_game.clone().rng is None
+    assert getstate() != state  # the module level generator is used
+    seed(5)
+    assert list(Game(3, Rules()).closed_deck) == list(module_game.closed_deck)
+
+
+@pytest.mark.parametrize(
+    'seven_swaps, add_4_challengeable, mandatory_playing',
+    list(product([False, True], repeat=3))
+)
+def test_legal_actions(seven_swaps, add_4_challengeable, mandatory_playing):
+    rules = Rules(seven_swaps=seven_swaps, add_4_challengeable=add_4_challengeable,
+                  mandatory_playing=mandatory_playing)
+    game = Game(3, rules, rng=4)
+
+    for _ in range(25):
+        legal_actions = game.legal_actions()
+        assert game.legal_actions() is legal_actions  # cached
+
+        candidates = [Action(None)] + [
+            Action(index, color, player, challenged) for index in range(len(game.current_player_deck))
+            for color in [None, Color.RED] for player in [None, game.current_turn, (game.current_turn + 1) % 3]
+            for challenged in [False, True]]
+        for action in candidates:
+            trial = game.clone()
+            try:
+                allowed = trial.step(*action)
+            except ValueError:
+                allowed = False
+            except GameStop:
+                allowed = True
+            card_type = None if action.played_card_index is None else game.current_player_deck[
+                action.played_card_index].card_type
+            if allowed and (card_type is not CardType.ADD4 or add_4_challengeable or not action.add_4_challenged):
+                # unused selections are not part of legal actions
+                assert Action(action.played_card_index,
+                              action.color_selection if card_type in (CardType.COLOR_SELECT, CardType.ADD4) else None,
+                              action.swap_player_selection if card_type is CardType.NUMBER_7 and seven_swaps else None,
+                              action.add_4_challenged and card_type is CardType.ADD4) in legal_actions
+            elif action in legal_actions:
+                assert allowed
+
+        try:
+            game.step(*game.rng.choice(legal_actions))
+        except GameStop:
+            break
+
+
+@pytest.mark.parametrize('compact, counted_hands', [(False, False), (True, False), (False, True)])
+def test_legal_actions_cache_detects_direct_modifications(compact, counted_hands):
+    def assert_fresh(game: Game):
+        cached = game.legal_actions()
+        game._legal_actions = None
+        assert game.legal_actions() == cached
+
+    game = Game(3, Rules(mandatory_playing=False), rng=5, compact=compact, counted_hands=counted_hands)
+    assert_fresh(game)
+    game.open_deck = [Card(Color.BLACK, CardType.ADD4)]
+    game.color_selection = Color.RED
+    assert_fresh(game)
+    game.color_selection = Color.BLUE
+    assert_fresh(game)
+    game.accumulated_draw_count = 4
+    assert_fresh(game)
+    game.player_decks[0][:] = [Card(Color.BLUE, CardType.NUMBER_2), Card(Color.RED, CardType.NUMBER_2)]
+    assert_fresh(game)
+    game.player_decks[0].reverse()
+    assert_fresh(game)
+    game.player_decks[0] = [Card(Color.BLACK, CardType.COLOR_SELECT), Card(Color.RED, CardType.NUMBER_2)]
+    assert_fresh(game)
+    game.restore(Game(3, Rules(), rng=6).snapshot())
+    assert_fresh(game)
+
+
+@pytest.mark.parametrize('compact, counted_hands', [(False, False), (True, False), (False, True)])
+def test_undo(compact, counted_hands):
+    game = Game(3, Rules(player_card_count=3), rng=8, compact=compact, counted_hands=counted_hands)
+    game.enable_undo()
+    snapshots = []
+
+    for _ in range(150):
+        snapshots.append(game.snapshot())
+        action = game.rng.choice(game.legal_actions())
+        try:
+            game.step(*action)
+        except GameStop:
+            break
+
+        game.undo()
+        assert game.snapshot() == snapshots[-1]
+        game.step(*action)
+
+    for snapshot in reversed(snapshots):
+        game.undo()
+        assert game.snapshot() == snapshot
+
+    with pytest.raises(IndexError):
+        game.undo()
+
+
+def test_failed_step_is_not_recorded():
+    game = Game(2, Rules(), rng=1)
+    game.player_decks[0].insert(0, Card(Color.BLACK, CardType.COLOR_SELECT))
+    game.enable_undo()
+
+    with pytest.raises(ValueError):
+        game.step(0)
+    with pytest.raises(IndexError):
+        game.undo()
+
+
+def test_clone_and_restore():
+    game = Game(3, Rules(), rng=9)
+    snapshot = game.snapshot()
+    clone = game.clone()
+
+    action = game.legal_actions()[0]
+    game.step(*action)
+    assert clone.snapshot() == snapshot
+    assert clone.player_decks[0] is not game.player_decks[0]
+
+    clone.step(*action)
+    assert clone.snapshot() == game.snapshot()
+    assert clone.rng.getstate() == game.rng.getstate()
+
+    game.restore(snapshot)
+    assert game.snapshot() == snapshot
+
+
+def test_determinizations():
+    game = Game(4, Rules(), rng=10)
+    for _ in range(10):
+        game.step(*game.rng.choice(game.legal_actions()))
+    snapshot = game.snapshot()
+    all_cards = sorted(card.id for deck in [game.closed_deck, game.open_deck, *game.player_decks] for card in deck)
+
+    determinizations = game.determinizations(1, 20, Random(3))
+    assert game.snapshot() == snapshot
+
+    for determinization in determinizations:
+        assert determinization.player_decks[1] == game.player_decks[1]
+        assert determinization.player_decks[1] is not game.player_decks[1]
+        assert list(determinization.open_deck) == list(game.open_deck)
+        assert [*map(len, determinization.player_decks)] == [*map(len, game.player_decks)]
+        assert len(determinization.closed_deck) == len(game.closed_deck)
+        assert (determinization.current_turn, determinization.color_selection, determinization.direction) == (
+            game.current_turn, game.color_selection, game.direction)
+        assert sorted(card.id for deck in [determinization.closed_deck, determinization.open_deck,
+                                           *determinization.player_decks] for card in deck) == all_cards
+
+    assert len({tuple(determinization.player_decks[2]) for determinization in determinizations}) > 1
+
+    determinization = game.determinize(1)
+    determinization.step(*determinization.legal_actions()[0])
+    assert game.snapshot() == snapshot
+
+
+def test_determinizations_keep_rng():
+    game = Game(4, Rules(), rng=11)
+    state = game.rng.getstate()
+    first, second = game.determinizations(2, 2)
+    hands = [tuple(first.player_decks[0]), tuple(second.player_decks[0])]
+    assert first.rng is not game.rng and first.rng is not second.rng
+    for determinization in (first, second, game.determinize(2)):
+        determinization.step(*determinization.rng.choice(determinization.legal_actions()))
+    assert game.rng.getstate() == state
+
+    assert tuple(game.determinize(2).player_decks[0]) != tuple(game.determinize(2).player_decks[0])
+    same_game = Game(4, Rules(), rng=11)
+    assert [tuple(sample.player_decks[0]) for sample in same_game.determinizations(2, 2)] == hands
+
+
+@pytest.mark.parametrize('player_count, player_card_count', [(1, 7), (2, 7), (4, 7), (5, 20)])
+def test_deal_matches_sequential_dealing(player_count, player_card_count):
+    rules = Rules(player_card_count)
+    for game_seed in range(20):
+        closed_deck = deque(get_standard_card_deck())
+        Random(game_seed).shuffle(closed_deck)
+        open_deck = [closed_deck.pop()]
+        while open_deck[0].card_type.value > CardType.NUMBER_9.value:
+            open_deck[0] = closed_deck.pop()
+        player_decks: list[list[Card]] = [[] for _ in range(player_count)]
+        for _ in range(player_card_count):
+            for player in range(player_count):
+                player_decks[player].append(closed_deck.pop())
+
+        game = Game(player_count, rules, rng=game_seed)
+        assert list(game.closed_deck) == list(closed_deck)
+        assert list(game.open_deck) == open_deck
+        assert game.player_decks == player_decks
+
+
+def test_deck_too_small():
+    with pytest.raises(IndexError):
+        Game(4, Rules(30))
+
+
+def test_many():
+    games = Game.many(20, 3, Rules(), seed=4, compact=True)
+    assert len(games) == 20
+    assert len({tuple(game.closed_deck) for game in games}) == 20
+    assert [game.snapshot() for game in games] == [game.snapshot() for game in Game.many(20, 3, Rules(), seed=4)]
@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import oneEngine
+
+
+def run_python(statement: str) -> str:
+    source_directory = os.path.dirname(os.path.dirname(oneEngine.__file__))
+    python_path = os.pathsep.join(filter(None, [source_directory, os.environ.get('PYTHONPATH')]))
+    environment = os.environ | {'PYTHONPATH': python_path}
+    return subprocess.run([sys.executable, '-c', statement], env=environment, check=True, capture_output=True,
+                          text=True).stdout
+
+
+def test_import_is_lazy():
+    loaded = run_python('import sys, oneEngine; print(sorted(name for name in sys.modules '
+                        'if name.startswith("oneEngine") or name == "numpy"))')
+    assert loaded.strip() == "['oneEngine']"
+
+    loaded = run_python('import sys; from oneEngine import Game; print("numpy" in sys.modules)')
+    assert loaded.strip() == 'False'
+
+
+def test_attributes():
+    for name in oneEngine.__all__:
+        assert getattr(oneEngine, name).__module__.startswith('oneEngine.')
+    assert oneEngine.game.Game is oneEngine.Game
+    assert set(oneEngine.__all__) <= set(dir(oneEngine))
+
+    with pytest.raises(AttributeError):
+        oneEngine.missing
+
+
+def test_submodules_are_complete():
+    package_directory = os.path.dirname(oneEngine.__file__)
+    assert oneEngine._SUBMODULES == {name[:-3] for name in os.listdir(package_directory)
+                                     if name.endswith('.py') and name != '__init__.py'}
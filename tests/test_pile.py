@@ -0,0 +1,80 @@
+from random import Random
+
+import pytest
+
+from oneEngine import CardArray, Game, GameStop, Rules, get_standard_card_deck
+from oneEngine.pile import Piles
+
+
+@pytest.mark.parametrize('storage', [list, CardArray])
+def test_piles(storage):
+    deck = get_standard_card_deck()[:10]
+    piles = Piles(deck[:6], deck[6:8], 10, storage)
+    assert list(piles.closed_deck) == deck[:6]
+    assert list(piles.open_deck) == deck[6:8]
+    assert piles.top() == deck[7]
+
+    assert piles.draw() == deck[5]
+    piles.discard(deck[5])
+    assert piles.open_deck == deck[6:8] + [deck[5]]
+    assert piles.take_back() == deck[5]
+    piles.put_back(deck[5])
+    assert piles.closed_deck == deck[:6]
+
+    for card in reversed(deck[:6]):
+        assert piles.draw() == card
+        piles.discard(card)
+    with pytest.raises(IndexError):
+        piles.draw()
+
+    open_deck = list(piles.open_deck)
+    assert piles.reshuffle(Random(1)) == 7
+    assert list(piles.open_deck) == [deck[0]]  # the top card stays open
+    assert sorted(card.id for card in piles.closed_deck) == sorted(card.id for card in open_deck[:-1])
+
+    piles.unreshuffle(open_deck[:-1])
+    assert list(piles.open_deck) == open_deck
+    assert not piles.closed_deck
+    assert piles.capacity == 10
+
+
+def test_piles_grow():
+    deck = get_standard_card_deck()
+    piles = Piles(deck[:2], deck[2:3], 3)
+    piles.discard(deck[3])
+    piles.put_back(deck[4])
+    assert piles.capacity == 6
+    assert list(piles.closed_deck) == [*deck[:2], deck[4]]
+    assert list(piles.open_deck) == deck[2:4]
+
+
+def test_pile_view():
+    deck = get_standard_card_deck()[:6]
+    piles = Piles(deck[:3], deck[3:])
+    closed_deck = piles.closed_deck
+
+    closed_deck.append(deck[5])
+    assert closed_deck.pop() == deck[5]
+    closed_deck.insert(0, deck[4])
+    assert closed_deck == [deck[4], *deck[:3]]
+    del closed_deck[1]
+    closed_deck[0] = deck[5]
+    assert closed_deck[:] == [deck[5], *deck[1:3]]
+    assert closed_deck[-1] == deck[2]
+    assert list(piles.open_deck) == deck[3:]
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_game_does_not_reallocate_piles(compact):
+    for game_seed in range(20):
+        game = Game(4, Rules(), rng=game_seed, compact=compact)
+        ring = game._piles.ring
+        card_count = sum(map(len, [game.closed_deck, game.open_deck, *game.player_decks]))
+        for _ in range(1000):
+            try:
+                game.step(*game.rng.choice(game.legal_actions()))
+            except GameStop:
+                break
+            assert game.open_deck
+            assert sum(map(len, [game.closed_deck, game.open_deck, *game.player_decks])) == card_count
+        assert game._piles.ring is ring
@@ -0,0 +1,92 @@
+import pytest
+
+from oneEngine import Card, CardType, Color, Game, GameStop, Rules, get_standard_card_deck
+from oneEngine.events import EventCounter
+from oneEngine.game import Action
+from oneEngine.record import GameRecordReader, GameRecordWriter, _pack_action, _unpack_action
+
+
+def play_randomly(game: Game, steps: int):
+    for _ in range(steps):
+        if not any(game.player_decks):
+            break
+        try:
+            game.step(*game.rng.choice(game.legal_actions()))
+        except GameStop:
+            break
+
+
+@pytest.mark.parametrize('action', [
+    Action(None), Action(0), Action(126, Color.RED), Action(3, Color.BLUE, None, True), Action(5, None, 14),
+    Action(1, Color.BLACK),
+])
+def test_pack_action(action):
+    assert _unpack_action(_pack_action(action)) == action
+
+
+def test_pack_action_out_of_range():
+    with pytest.raises(ValueError):
+        _pack_action(Action(127))
+    with pytest.raises(ValueError):
+        _pack_action(Action(0, None, 15))
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_replay(tmp_path, compact):
+    path = tmp_path / 'games.bin'
+    rules = [Rules(), Rules(3, zero_passes_on=False, add_2_stackable=False), Rules(player_card_count=12)]
+    deck = get_standard_card_deck()[::-1]
+    games = []
+    game_seeds = {}
+    reshuffle_counter = EventCounter()
+
+    with open(path, 'wb') as file, GameRecordWriter(file) as writer:
+        for index in range(30):
+            game = writer.record(2 + index % 3, rules[index % 3], index, deck if index % 2 else None, compact)
+            game.add_observer(reshuffle_counter)
+            play_randomly(game, 300)
+            games.append(game)
+            game_seeds[game] = index
+
+    assert reshuffle_counter.counts['Reshuffled'] > 0
+
+    with GameRecordReader(str(path)) as reader:
+        records = {record.seed: record for record in reader}  # games are written in the order they finish
+        assert len(records) == len(game_seeds)
+        for game in games:
+            record = records[game_seeds[game]]
+            assert record.rules == game.rules
+            replayed = Game.replay(record, compact)
+            assert replayed.snapshot() == game.snapshot()
+            play_randomly(replayed, 10)
+
+
+def test_unused_arguments_are_not_recorded(tmp_path):
+    path = tmp_path / 'games.bin'
+    actions = []
+    with open(path, 'wb') as file, GameRecordWriter(file) as writer:
+        game = writer.record(3, Rules(seven_swaps=False), 2)
+        for _ in range(30):
+            action = game.rng.choice(game.legal_actions())
+            if not game.step(action.played_card_index, action.color_selection or Color.RED, 1,
+                             action.add_4_challenged):
+                break
+            actions.append(action)
+        game.player_decks[0].append(Card(Color.BLACK, CardType.COLOR_SELECT))
+
+    with GameRecordReader(str(path)) as reader:
+        record, = reader
+        assert record.actions() == actions
+
+
+def test_invalid_file(tmp_path):
+    path = tmp_path / 'games.bin'
+    path.write_bytes(b'not a record')
+    with pytest.raises(ValueError):
+        GameRecordReader(str(path))
+
+    with open(path, 'wb') as file, GameRecordWriter(file) as writer:
+        play_randomly(writer.record(2, Rules(), 5), 20)
+    path.write_bytes(path.read_bytes()[:-1])
+    with GameRecordReader(str(path)) as reader, pytest.raises(ValueError):
+        list(reader)
@@ -0,0 +1,134 @@
+import asyncio
+import tracemalloc
+from random import Random
+
+from oneEngine import Card, CardType, Color, Rules
+from oneEngine.events import CardDrawn
+from oneEngine.game import Action
+from oneEngine.server import ActionRejected, LocalClient, TableManager, TurnTimedOut
+
+
+def test_clients_track_hands():
+    async def main():
+        manager = TableManager(turn_timeout=None)
+        rng = Random(1)
+        for seed in range(5):
+            table_id = manager.create_table(3, Rules(), seed)
+            game = manager.tables[table_id].game
+            clients = [LocalClient(manager, table_id, player) for player in range(3)]
+
+            for _ in range(200):
+                for client in clients:
+                    while not client.updates.empty():
+                        update = await client.receive()
+                        for event in update.events:
+                            if isinstance(event, CardDrawn):
+                                assert (event.card is None) is (event.player != client.player)
+                    assert client.hand == list(game.player_decks[client.player])
+                    assert client.current_turn == game.current_turn
+                if manager.tables[table_id].finished:
+                    break
+                clients[game.current_turn].submit(rng.choice(game.legal_actions()))
+            manager.close_table(table_id)
+
+    asyncio.run(main())
+
+
+def test_queued_and_rejected_actions():
+    async def main():
+        manager = TableManager(turn_timeout=None)
+        table_id = manager.create_table(2, Rules(mandatory_playing=False, draw_until_play=False), 3)
+        game = manager.tables[table_id].game
+        clients = [LocalClient(manager, table_id, player) for player in range(2)]
+        for client in clients:
+            await client.receive()
+
+        clients[1].submit(Action(None))  # queued until player 0 moved
+        assert game.current_turn == 0 and clients[1].updates.empty()
+        clients[0].submit(Action(None))
+        assert clients[1].updates.qsize() == 2
+        assert game.current_turn == 0
+
+        game.player_decks[0].append(Card(Color.BLACK, CardType.COLOR_SELECT))
+        clients[0].submit(Action(len(game.player_decks[0]) - 1, Color.BLACK))
+        assert clients[1].updates.qsize() == 2
+        for _ in range(3):
+            update = await clients[0].receive()
+        assert update.events == (ActionRejected(0, Action(len(game.player_decks[0]) - 1, Color.BLACK),
+                                                'color except black must be selected'),)
+        assert game.current_turn == 0
+
+    asyncio.run(main())
+
+
+def test_turn_timeout():
+    async def main():
+        manager = TableManager(turn_timeout=0.01)
+        table_id = manager.create_table(2, Rules(), 4)
+        game = manager.tables[table_id].game
+        client = LocalClient(manager, table_id, 0)
+        await client.receive()
+        await asyncio.sleep(0.05)
+        assert client.updates.empty()  # the timer starts when every seat is taken
+
+        other = LocalClient(manager, table_id, 1)
+        legal_actions = game.legal_actions()
+        update = await asyncio.wait_for(client.receive(), 1)
+        assert update.events[0] == TurnTimedOut(0)
+        assert update.events[1].played_card_index == (None if Action(None) in legal_actions
+                                                      else legal_actions[0].played_card_index)
+        while not client.updates.empty():  # the automatic move may take several steps, see test_turn_timeout_ends_turn
+            await client.receive()
+        assert client.hand == list(game.player_decks[0])
+
+        manager.close_table(table_id)
+        assert not manager.tables
+        update_count = other.updates.qsize()
+        await asyncio.sleep(0.05)
+        assert other.updates.qsize() == update_count
+
+    asyncio.run(main())
+
+
+def test_turn_timeout_ends_turn():
+    async def main():
+        manager = TableManager(turn_timeout=0.001)
+        for seed in range(5):
+            table_id = manager.create_table(3, Rules(draw_until_play=True, mandatory_playing=False), seed)
+            table = manager.tables[table_id]
+            game = table.game
+            turns = []
+            clients = [LocalClient(manager, table_id, player) for player in range(3)]
+            for _ in range(30):
+                turns.append(game.current_turn)
+                if table.finished:
+                    break
+                await asyncio.sleep(0.005)
+            assert len(set(turns)) > 1
+            assert max(map(len, game.player_decks)) < 40
+            for client in clients:
+                while not client.updates.empty():
+                    await client.receive()
+                assert client.hand == list(game.player_decks[client.player])
+                assert client.current_turn == game.current_turn
+            manager.close_table(table_id)
+
+    asyncio.run(main())
+
+
+def test_idle_table_memory():
+    async def main():
+        manager = TableManager(turn_timeout=60)
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        for _ in range(1000):
+            table_id = manager.create_table(4, Rules())
+            for player in range(4):
+                manager.join(table_id, player, lambda update: None)
+        per_table = (tracemalloc.get_traced_memory()[0] - start) / 1000
+        tracemalloc.stop()
+        assert per_table < 3000, per_table
+        for table_id in list(manager.tables):
+            manager.close_table(table_id)
+
+    asyncio.run(main())
@@ -0,0 +1,153 @@
+from random import Random
+
+import pytest
+
+from oneEngine import Card, CardType, Color, Game, GameStop, Rules
+from oneEngine.solver import EndgameSolver, _KeepOrder
+
+
+def minimax(game: Game, root: int, depth: int) -> int:
+    """
+    plain minimax without pruning on clones, see EndgameSolver.
+    """
+    if not depth:
+        return 0
+    values = {}
+    for action in game.legal_actions():
+        child = game.clone()
+        player = child.current_turn
+        try:
+            child.step(*action)
+        except GameStop:
+            winner: int | None = player
+        else:
+            winner = next((player for player, deck in enumerate(child.player_decks) if not deck), None)
+        value = minimax(child, root, depth - 1) if winner is None else 1 if winner == root else -1
+        values[action] = value
+
+    challenger_maximizing = game.step_index(game.current_turn, game.direction.value) == root
+    choices = []
+    for action, value in values.items():
+        if action.add_4_challenged:
+            continue
+        challenged = action._replace(add_4_challenged=True)
+        if challenged in values:
+            value = (max if challenger_maximizing else min)(value, values[challenged])
+        choices.append(value)
+    return (max if game.current_turn == root else min)(choices)
+
+
+def endgame(player_count: int, card_count: int, seed: int, rules: Rules | None = None) -> Game:
+    game = Game(player_count, rules or Rules(card_count, seven_swaps=True, zero_passes_on=True), rng=seed)
+    game.rng = _KeepOrder()
+    return game
+
+
+def assert_solved(game: Game, max_depth: int):
+    solution = EndgameSolver(max_depth=max_depth).solve(game)
+    assert solution.action in game.legal_actions()
+    assert solution.value == minimax(game, game.current_turn, solution.depth)
+    if solution.value:
+        assert solution.value == minimax(game, game.current_turn, max_depth)
+
+
+@pytest.mark.parametrize('player_count, card_count', [(2, 1), (2, 2), (3, 1), (3, 2)])
+def test_matches_minimax(player_count, card_count):
+    for seed in range(10):
+        assert_solved(endgame(player_count, card_count, seed), 5)
+
+
+def test_add_4_challenge():
+    for seed in range(10):
+        game = endgame(2, 1, seed, Rules(1))
+        game.player_decks[game.current_turn].append(Card(Color.BLACK, CardType.ADD4))
+        assert_solved(game, 6)
+
+
+def test_immediate_win():
+    game = Game(3, Rules(), rng=1)
+    game.player_decks[0][:] = [Card(Color.GREEN, CardType.NUMBER_1), Card(Color.BLACK, CardType.COLOR_SELECT)]
+    game.player_decks[0].pop(0)
+    solution = EndgameSolver().solve(game)
+    assert solution.value == 1
+    assert solution.depth == 1
+    assert game.current_player_deck[solution.action.played_card_index].card_type is CardType.COLOR_SELECT
+
+
+def test_reused_solver_on_permuted_hand():
+    solver = EndgameSolver(max_depth=4)
+    hand = [Card(Color.BLUE, CardType.NUMBER_2), Card(Color.BLACK, CardType.COLOR_SELECT)]
+    for seed in range(5):
+        cards = []
+        for permutation in (hand, hand[::-1]):
+            game = Game(3, Rules(), rng=seed)
+            game.player_decks[0][:] = permutation
+            solution = solver.solve(game)  # the second solve finds the first in the transposition table
+            assert solution.action in game.legal_actions()
+            cards.append(game.current_player_deck[solution.action.played_card_index])
+        assert cards[0] == cards[1]
+
+
+def test_game_is_not_modified():
+    game = Game(2, Rules(4), rng=2)
+    snapshot = game.snapshot()
+    state = game.rng.getstate()
+    EndgameSolver(table_size=100).solve(game, time_limit=0.05)
+    assert game.snapshot() == snapshot
+    assert game.rng.getstate() == state
+
+
+def test_hash():
+    solver = EndgameSolver()
+    game = Game(3, Rules(), rng=3)
+    game.enable_undo()
+    key = solver.hash(game)
+
+    other = game.clone()
+    other.player_decks[1].reverse()
+    assert solver.hash(other) == key  # hands are multisets
+    other.player_decks[1][0], other.player_decks[2][0] = other.player_decks[2][0], other.player_decks[1][0]
+    assert solver.hash(other) != key or other.player_decks[1][0] == other.player_decks[2][0]
+
+    game.step(*game.legal_actions()[0])
+    assert solver.hash(game) != key
+    game.undo()
+    assert solver.hash(game) == key
+
+    other = game.clone()
+    other.open_deck = [Card(Color.RED, CardType.NUMBER_1), Card(Color.BLUE, CardType.NUMBER_2), game.open_card]
+    reordered = other.clone()
+    reordered.open_deck[:2] = reordered.open_deck[1::-1]
+    assert solver.hash(other) != solver.hash(reordered)  # reshuffles keep the order of the open deck
+
+
+class _CheckedSolver(EndgameSolver):
+    def _search(self, game, root, depth, alpha, beta):
+        assert self._combine(game, self._hands, *self._piles) == self.hash(game)
+        return super()._search(game, root, depth, alpha, beta)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_incremental_hash(seed):
+    # small closed decks reshuffle during the search
+    game = Game(3, Rules(2), rng=seed)
+    closed_deck = list(game.closed_deck)
+    game.open_deck = closed_deck[:-3] + list(game.open_deck)
+    game.closed_deck = closed_deck[-3:]
+    _CheckedSolver(max_depth=6).solve(game)
+
+
+def test_table_is_bounded():
+    solver = EndgameSolver(table_size=50)
+    for seed in range(5):
+        solver.solve(Game(2, Rules(3), rng=seed), time_limit=0.05)
+        assert len(solver._table) <= 50
+    solver.clear()
+    assert not solver._table
+
+
+def test_time_limit():
+    solver = EndgameSolver(max_depth=1000)
+    solution = solver.solve(Game(4, Rules(), rng=Random(4).getrandbits(32)), time_limit=0.05)
+    assert solution.value == 0
+    assert solution.depth < 1000
@@ -0,0 +1,45 @@
+import pytest
+
+from oneEngine import Action, Game, Rules
+from oneEngine.sweep import RULE_FLAGS, rules_grid, sweep
+
+
+def random_agent(game: Game) -> Action:
+    return game.rng.choice(game.legal_actions())
+
+
+def test_rules_grid():
+    grid = rules_grid()
+    assert len(grid) == 2 ** len(RULE_FLAGS)
+    assert len({tuple(getattr(rules, flag) for flag in RULE_FLAGS) for rules in grid}) == len(grid)
+
+    grid = rules_grid((5, 7), seven_swaps=False, zero_passes_on=False)
+    assert len(grid) == 2 * 2 ** (len(RULE_FLAGS) - 2)
+    assert not any(rules.seven_swaps or rules.zero_passes_on for rules in grid)
+    assert {rules.player_card_count for rules in grid} == {5, 7}
+
+    with pytest.raises(ValueError):
+        rules_grid(swaps=True)
+
+
+@pytest.mark.parametrize('max_workers', [1, 3])
+def test_sweep(max_workers):
+    rules = [Rules(), Rules(3, add_2_stackable=False), Rules(mandatory_playing=False)]
+    columns = sweep([random_agent] * 3, rules, max_games=200, min_games=100, length_tolerance=1,
+                    win_rate_tolerance=1, seed=1, max_workers=max_workers, chunk_size=50, max_steps=2000)
+
+    assert all(len(column) == len(rules) for column in columns.values())
+    assert columns['player_card_count'] == [7, 3, 7]
+    assert columns['add_2_stackable'] == [True, False, True]
+    assert columns['game_count'] == [100] * 3  # loose tolerances stop at min_games
+    assert all(columns['stopped_early'])
+    assert all(length > 0 for length in columns['mean_game_length'])
+    assert all(abs(sum(rates) + unfinished - 1) < 1e-9
+               for rates, unfinished in zip(columns['seat_win_rates'], columns['unfinished_rate']))
+
+    strict = sweep([random_agent] * 3, rules[:1], max_games=150, min_games=100, length_tolerance=0,
+                   seed=1, max_workers=max_workers, chunk_size=50, max_steps=2000)
+    assert strict['game_count'] == [150] and strict['stopped_early'] == [False]
+    assert strict['mean_game_length'] == sweep([random_agent] * 3, rules[:1], max_games=150, min_games=100,
+                                               length_tolerance=0, seed=1, max_workers=2, chunk_size=50,
+                                               max_steps=2000)['mean_game_length']
@@ -0,0 +1,68 @@
+import pickle
+
+import pytest
+
+from oneEngine import Game, GameStop, Rules
+from oneEngine.game import PlayerView
+from oneEngine.sync import DeltaEncoder, ViewDelta, apply, diff
+
+
+def test_view():
+    game = Game(3, Rules(), rng=1)
+    view = game.view(1)
+
+    assert view == PlayerView(1, tuple(game.player_decks[1]), (7, 7, 7), game.open_card, None, game.direction, 0, 0,
+                              len(game.closed_deck))
+    game.step(*game.legal_actions()[0])
+    assert view.hand_sizes == (7, 7, 7)  # views are not live
+
+
+@pytest.mark.parametrize('player_count', [2, 10])
+def test_deltas_rebuild_views(player_count):
+    game = Game(player_count, Rules(seven_swaps=True, zero_passes_on=True), rng=player_count)
+    encoder = DeltaEncoder()
+    client_views: list[PlayerView | None] = [None] * player_count
+
+    for _ in range(300):
+        for player in range(player_count):
+            delta = encoder.encode(game, player)
+            client_views[player] = apply(client_views[player], ViewDelta.from_bytes(delta.to_bytes()))
+            assert client_views[player] == game.view(player)
+        try:
+            game.step(*game.rng.choice(game.legal_actions()))
+        except GameStop:
+            break
+
+
+def test_delta_is_small():
+    game = Game(10, Rules(), rng=3)
+    encoder = DeltaEncoder()
+    full_sizes = [len(encoder.encode(game, player).to_bytes()) for player in range(10)]
+    delta_sizes = []
+    for _ in range(50):
+        game.step(*game.rng.choice(game.legal_actions()))
+        delta_sizes += [len(encoder.encode(game, player).to_bytes()) for player in range(10)]
+
+    assert sum(delta_sizes) / len(delta_sizes) < min(full_sizes) / 2
+    assert max(full_sizes) < len(pickle.dumps(game.view(0))) / 4
+    assert not diff(game.view(0), game.view(0))
+
+
+def test_reset():
+    game = Game(2, Rules(), rng=4)
+    encoder = DeltaEncoder()
+    encoder.encode(game, 0)
+    assert not encoder.encode(game, 0)
+    encoder.reset(0)
+    assert apply(None, encoder.encode(game, 0)) == game.view(0)
+
+
+def test_invalid_deltas():
+    game = Game(3, Rules(), rng=5)
+    view = game.view(0)
+    with pytest.raises(ValueError):
+        apply(None, diff(view, view))
+    with pytest.raises(ValueError):
+        apply(game.view(1), diff(view, view))
+    with pytest.raises(ValueError):
+        ViewDelta.from_bytes(diff(None, view).to_bytes()[:-1])
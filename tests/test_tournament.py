@@ -0,0 +1,50 @@
+import pytest
+
+from oneEngine import Action, Game, Rules
+from oneEngine.tournament import TournamentResult, play_game, run_tournament
+
+
+def random_agent(game: Game) -> Action:
+    return game.rng.choice(game.legal_actions())
+
+
+def first_card_agent(game: Game) -> Action:
+    return game.legal_actions()[0]
+
+
+def test_play_game():
+    winner, step_count, drawn_card_count = play_game(Game(3, Rules(), rng=1), [random_agent] * 3)
+
+    assert winner in range(3)
+    assert step_count > 0
+    assert drawn_card_count >= 0
+
+
+def test_disallowed_move():
+    game = Game(2, Rules(mandatory_playing=True), rng=1)
+
+    with pytest.raises(ValueError):
+        play_game(game, [lambda game: Action(None) if game.open_card.filter_playable_cards(
+            game.current_player_deck, game.rules, game.color_selection) else Action(0)] * 2)
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_run_tournament(max_workers):
+    result = run_tournament([random_agent, first_card_agent], Rules(), 60, seed=3, max_workers=max_workers,
+                            chunk_size=25)
+
+    assert result.game_count == 60
+    assert sum(result.wins) + result.unfinished_count == 60
+    assert sum(result.seat_wins) == sum(result.wins)
+    assert result.mean_game_length > 0
+    assert result == run_tournament([random_agent, first_card_agent], Rules(), 60, seed=3, max_workers=2,
+                                    chunk_size=25)
+
+
+def test_merge():
+    result = TournamentResult(2, 1, 0, [1, 0], [0, 1], 10, 100, 4)
+    result.merge(TournamentResult(2, 1, 1, [0, 0], [0, 0], 20, 400, 6))
+
+    assert result == TournamentResult(2, 2, 1, [1, 0], [0, 1], 30, 500, 10)
+    assert result.mean_game_length == 15
+    assert result.game_length_variance == 25